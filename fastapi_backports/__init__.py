@@ -1,36 +1,113 @@
-from typing import TYPE_CHECKING, Any
+from importlib import import_module
+from typing import TYPE_CHECKING, Any, Dict
 
-from ._backporter import backport
-from ._backports.lifespan_decorator import LifespanDecoratorBackporter
-from ._backports.multiple_query_models import MultipleQueryModelsBackporter
-from ._backports.postponed_annotations import PostponedAnnotationsBackporter
-from ._backports.query_method import QueryMethodBackporter
-from ._backports.route_middleware import RouteMiddlewareBackporter
-from ._backports.type_alias_type import TypeAliasTypeBackporter
+from ._backporter import BACKPORTS_ENV_VAR, backport, backported, load_backporter, revert
 
 if TYPE_CHECKING:
+    from ._backports._streaming import JSONArrayStreamingResponse
+    from ._backports.json_response import JSONResponseBackporter
+    from ._backports.json_stream import JSONStreamBackporter
+    from ._backports.lifespan_decorator import LifespanDecoratorBackporter
+    from ._backports.multiple_query_models import MultipleQueryModelsBackporter
+    from ._backports.postponed_annotations import PostponedAnnotationsBackporter
+    from ._backports.query_method import QueryMethodBackporter
+    from ._backports.route_middleware import RouteMiddlewareBackporter
+    from ._backports.type_alias_type import TypeAliasTypeBackporter
+    from ._diagnostics import BackportDiagnostic, diagnose_backports
+    from ._frozen_routes import freeze_routes, frozen_routes_lifespan, unfreeze_routes
+    from ._lifespans import LifespanResource, LifespanTiming, TimedLifespan, get_lifespan_timings, lifespan_state
+    from ._overhead import (
+        BackportOverhead,
+        OverheadMeasurement,
+        ThroughputMeasurement,
+        measure_backport_overhead,
+        measure_threaded_throughput,
+    )
+    from ._patching import backports_enabled
     from ._retyped import APIRoute, APIRouter, APIWebSocketRoute, FastAPI
+    from ._warmup import WARMUP_ENV_VAR, RouteWarmup, warmup_routes, warmup_routes_lifespan
 else:
+    # attributes are imported on first access, so importing the package doesn't import every backport
+    _LAZY_ATTRIBUTES: Dict[str, str] = {
+        "APIRoute": "._retyped",
+        "APIRouter": "._retyped",
+        "APIWebSocketRoute": "._retyped",
+        "BackportDiagnostic": "._diagnostics",
+        "BackportOverhead": "._overhead",
+        "FastAPI": "._retyped",
+        "JSONArrayStreamingResponse": "._backports._streaming",
+        "JSONResponseBackporter": "._backports.json_response",
+        "JSONStreamBackporter": "._backports.json_stream",
+        "LifespanDecoratorBackporter": "._backports.lifespan_decorator",
+        "LifespanResource": "._lifespans",
+        "LifespanTiming": "._lifespans",
+        "MultipleQueryModelsBackporter": "._backports.multiple_query_models",
+        "OverheadMeasurement": "._overhead",
+        "PostponedAnnotationsBackporter": "._backports.postponed_annotations",
+        "QueryMethodBackporter": "._backports.query_method",
+        "RouteMiddlewareBackporter": "._backports.route_middleware",
+        "RouteWarmup": "._warmup",
+        "backports_enabled": "._patching",
+        "ThroughputMeasurement": "._overhead",
+        "TimedLifespan": "._lifespans",
+        "TypeAliasTypeBackporter": "._backports.type_alias_type",
+        "WARMUP_ENV_VAR": "._warmup",
+        "diagnose_backports": "._diagnostics",
+        "freeze_routes": "._frozen_routes",
+        "frozen_routes_lifespan": "._frozen_routes",
+        "get_lifespan_timings": "._lifespans",
+        "lifespan_state": "._lifespans",
+        "measure_backport_overhead": "._overhead",
+        "measure_threaded_throughput": "._overhead",
+        "unfreeze_routes": "._frozen_routes",
+        "warmup_routes": "._warmup",
+        "warmup_routes_lifespan": "._warmup",
+    }
 
     def __getattr__(name: str) -> Any:
-        from . import _retyped
-
-        if name in _retyped.__all__:
-            return getattr(_retyped, name)
+        if name in _LAZY_ATTRIBUTES:
+            return getattr(import_module(_LAZY_ATTRIBUTES[name], __name__), name)
 
         raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 __all__ = [
+    "BACKPORTS_ENV_VAR",
+    "WARMUP_ENV_VAR",
     "APIRoute",
     "APIRouter",
     "APIWebSocketRoute",
+    "BackportDiagnostic",
+    "BackportOverhead",
     "FastAPI",
+    "JSONArrayStreamingResponse",
+    "JSONResponseBackporter",
+    "JSONStreamBackporter",
     "LifespanDecoratorBackporter",
+    "LifespanResource",
+    "LifespanTiming",
     "MultipleQueryModelsBackporter",
+    "OverheadMeasurement",
     "PostponedAnnotationsBackporter",
     "QueryMethodBackporter",
     "RouteMiddlewareBackporter",
+    "RouteWarmup",
+    "ThroughputMeasurement",
+    "TimedLifespan",
     "TypeAliasTypeBackporter",
     "backport",
+    "backported",
+    "backports_enabled",
+    "diagnose_backports",
+    "freeze_routes",
+    "frozen_routes_lifespan",
+    "get_lifespan_timings",
+    "lifespan_state",
+    "load_backporter",
+    "measure_backport_overhead",
+    "measure_threaded_throughput",
+    "revert",
+    "unfreeze_routes",
+    "warmup_routes",
+    "warmup_routes_lifespan",
 ]
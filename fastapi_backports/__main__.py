@@ -0,0 +1,115 @@
+import argparse
+import sys
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from fastapi import __version__
+
+from ._diagnostics import diagnose_backports, load_app, measure_import_time, rebuilt_routes
+from ._overhead import BackportOverhead, measure_backport_overhead
+
+
+def _parse_args(argv: Optional[Sequence[str]]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m fastapi_backports",
+        description="Report which backports an application uses and what they cost.",
+    )
+    parser.add_argument("app", help="application import string, in format '<module>:<attribute>'")
+    parser.add_argument("--factory", action="store_true", help="treat the attribute as an application factory")
+    parser.add_argument("--no-measure", action="store_true", help="skip measuring import and startup time")
+    parser.add_argument("--verbose", "-v", action="store_true", help="list the routes each backport is used by")
+
+    return parser.parse_args(argv)
+
+
+def _format_time(value: Optional[float], *, signed: bool = False) -> str:
+    if value is None:
+        return "-"
+
+    return f"{value * 1000:{'+' if signed else ''}.1f}ms"
+
+
+def _format_memory(value: Optional[int]) -> str:
+    if value is None:
+        return "-"
+
+    return f"{value / 1024:+.1f}KiB"
+
+
+def _measure(args: argparse.Namespace, names: List[str]) -> Dict[str, Any]:
+    def app_factory() -> Any:
+        # modules building the application on import are imported again for every measurement
+        return load_app(args.app, factory=args.factory, reload=not args.factory)
+
+    # measured against the application with every other backport applied, since it may need several of them
+    overheads = measure_backport_overhead(app_factory, [], backports=names, iterations=0, isolated=False)
+    return {
+        "import": {name: measure_import_time(name) for name in names},
+        "overhead": dict(zip(names, overheads)),
+    }
+
+
+def _table(rows: List[List[str]]) -> List[str]:
+    widths = [max(len(row[column]) for row in rows) for column in range(len(rows[0]))]
+    return ["  ".join(cell.ljust(width) for cell, width in zip(row, widths)).rstrip() for row in rows]
+
+
+def _format_overhead(overhead: Optional[BackportOverhead], value: Callable[[BackportOverhead], str]) -> str:
+    if overhead is None:
+        return "-"
+    if overhead.backported.error:
+        return "error"
+    if overhead.baseline.error:
+        # the application does not start without this backport
+        return "required"
+
+    return value(overhead)
+
+
+def main(argv: Optional[Sequence[str]] = None, write: Callable[[str], Any] = sys.stdout.write) -> int:
+    args = _parse_args(argv)
+
+    app = load_app(args.app, factory=args.factory)
+    diagnostics = diagnose_backports(app)
+    rebuilt = rebuilt_routes(app)
+
+    needed = [diagnostic.name for diagnostic in diagnostics if diagnostic.needed]
+    measurements = {} if args.no_measure else _measure(args, needed)
+
+    rows = [["Backport", "Label", "Needed", "Applied", "Routes", "Import", "Startup", "Memory"]]
+    for diagnostic in diagnostics:
+        overhead: Optional[BackportOverhead] = measurements.get("overhead", {}).get(diagnostic.name)
+
+        rows.append(
+            [
+                diagnostic.name,
+                diagnostic.label,
+                "yes" if diagnostic.needed else "no",
+                "yes" if diagnostic.applied else "no",
+                "-" if diagnostic.routes is None else str(len(diagnostic.routes)),
+                _format_time(measurements.get("import", {}).get(diagnostic.name)),
+                _format_overhead(overhead, lambda overhead: _format_time(overhead.startup_delta, signed=True)),
+                _format_overhead(overhead, lambda overhead: _format_memory(overhead.memory_delta)),
+            ]
+        )
+
+    lines = [f"FastAPI {__version__}, application {args.app}", "", *_table(rows)]
+
+    if args.verbose:
+        for diagnostic in diagnostics:
+            if diagnostic.routes:
+                lines.extend(["", f"Routes using {diagnostic.name}:", *(f"  {route}" for route in diagnostic.routes)])
+
+    errors = {overhead.backported.error for overhead in measurements.get("overhead", {}).values()} - {None}
+    if errors:
+        lines.extend(
+            ["", "Application failed to start with all backports applied:", *(f"  {error}" for error in errors)]
+        )
+
+    lines.extend(["", "Routes rebuilt at startup:", *(f"  {route}" for route in rebuilt or ["none"])])
+
+    write("\n".join(lines) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,46 +1,114 @@
-from typing import Final, Iterable, Optional, Set, Type
+import os
+import threading
+from importlib import import_module
+from typing import Dict, Final, Iterable, List, Optional, Set, Type, Union
 
 from ._backports import (
     BaseBackporter,
 )
-from ._backports.lifespan_decorator import LifespanDecoratorBackporter
-from ._backports.multiple_query_models import MultipleQueryModelsBackporter
-from ._backports.postponed_annotations import PostponedAnnotationsBackporter
-from ._backports.query_method import QueryMethodBackporter
-from ._backports.route_middleware import RouteMiddlewareBackporter
-from ._backports.type_alias_type import TypeAliasTypeBackporter
+from ._patching import recording_patches, revert_all_patches, scoped_patching
+
+BACKPORTS_ENV_VAR: Final[str] = "FASTAPI_BACKPORTS"
+
+# name -> backporter class, in the order they are applied, modules are only imported when selected
+_BACKPORTERS: Final[Dict[str, str]] = {
+    "route_middleware": "RouteMiddlewareBackporter",
+    "multiple_query_models": "MultipleQueryModelsBackporter",
+    "type_alias_type": "TypeAliasTypeBackporter",
+    "json_stream": "JSONStreamBackporter",
+    "postponed_annotations": "PostponedAnnotationsBackporter",
+    "query_method": "QueryMethodBackporter",
+    "lifespan_decorator": "LifespanDecoratorBackporter",
+    "json_response": "JSONResponseBackporter",
+}
+
+# guards applying and reverting backports, which patch FastAPI globally
+_LOCK: Final = threading.RLock()
 
 _BACKPORTED: Final[Set[str]] = set()
+_APPLIED: Final[Dict[str, Type[BaseBackporter]]] = {}
+
+BackportSelection = Iterable[Union[str, Type[BaseBackporter]]]
+
+
+def _check_backport_names(names: Iterable[str]) -> None:
+    unknown = sorted(set(names) - _BACKPORTERS.keys())
+    if unknown:
+        msg = f"Unknown backports {', '.join(unknown)}, expected any of: {', '.join(_BACKPORTERS)}"
+        raise ValueError(msg)
+
+
+def load_backporter(name: str) -> Type[BaseBackporter]:
+    _check_backport_names([name])
+
+    module = import_module(f"{__package__}._backports.{name}")
+    return getattr(module, _BACKPORTERS[name])
+
+
+def _selected_backports() -> List[str]:
+    selection = os.environ.get(BACKPORTS_ENV_VAR)
+    if selection is None:
+        return list(_BACKPORTERS)
+
+    names = {name.strip() for name in selection.split(",") if name.strip()}
+    _check_backport_names(names)
+
+    return [name for name in _BACKPORTERS if name in names]
 
 
 def _run_backports(backports: Iterable[Type[BaseBackporter]]) -> None:
-    for _backport in backports:
-        if not _backport.needs_backport():
-            continue
+    with _LOCK:
+        for _backport in backports:
+            if not _backport.needs_backport():
+                continue
+
+            if _backport.label() in _BACKPORTED:
+                continue
 
-        if _backport.label() in _BACKPORTED:
-            continue
+            with recording_patches(_backport.label()):
+                _backport.backport()
 
-        _backport.backport()
-        _BACKPORTED.add(_backport.label())
+            _BACKPORTED.add(_backport.label())
+            _APPLIED[_backport.label()] = _backport
 
 
-def backport(backports: Optional[Iterable[Type[BaseBackporter]]] = None) -> None:
+def backport(backports: Optional[BackportSelection] = None, *, scoped: bool = False) -> None:
     if not backports:
-        _run_backports(
-            [
-                RouteMiddlewareBackporter,
-                MultipleQueryModelsBackporter,
-                TypeAliasTypeBackporter,
-                PostponedAnnotationsBackporter,
-                QueryMethodBackporter,
-                LifespanDecoratorBackporter,
-            ],
-        )
-    else:
-        _run_backports(backports)
+        backports = _selected_backports()
+
+    with _LOCK, scoped_patching(scoped=scoped):
+        _run_backports(load_backporter(item) if isinstance(item, str) else item for item in backports)
+
+
+def revert(backports: Optional[BackportSelection] = None) -> None:
+    labels = (
+        {(load_backporter(item) if isinstance(item, str) else item).label() for item in backports}
+        if backports is not None
+        else set(_APPLIED)
+    )
+
+    # reverted in reverse order, since later backports may patch on top of earlier ones
+    with _LOCK:
+        for label, _backport in reversed(list(_APPLIED.items())):
+            if label in labels:
+                _backport.revert()
+                _BACKPORTED.discard(label)
+                del _APPLIED[label]
+
+        # hooks installed for scoped mode and by middleware go with the last backport
+        if not _APPLIED:
+            revert_all_patches()
+
+
+def backported() -> List[Type[BaseBackporter]]:
+    with _LOCK:
+        return list(_APPLIED.values())
 
 
 __all__ = [
+    "BACKPORTS_ENV_VAR",
     "backport",
+    "backported",
+    "load_backporter",
+    "revert",
 ]
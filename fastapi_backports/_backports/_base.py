@@ -4,6 +4,8 @@ from typing import Optional, Tuple
 from fastapi import __version__
 from typing_extensions import Protocol
 
+from fastapi_backports._patching import revert_patches
+
 FASTAPI_VERSION = tuple(int(part) if part.isdigit() else 0 for part in __version__.split(".")[:3])
 
 
@@ -31,6 +33,10 @@ class BaseBackporter(Protocol):
     def backport(cls) -> None:
         pass
 
+    @classmethod
+    def revert(cls) -> None:
+        revert_patches(cls.label())
+
 
 __all__ = [
     "BaseBackporter",
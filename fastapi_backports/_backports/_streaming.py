@@ -0,0 +1,99 @@
+import collections.abc
+import json
+from typing import Any, AsyncIterable, AsyncIterator, Iterable, Iterator, Mapping, Optional, Union
+
+from fastapi.datastructures import DefaultPlaceholder
+from fastapi.encoders import jsonable_encoder
+from starlette.background import BackgroundTask
+from starlette.responses import StreamingResponse
+from typing_extensions import get_args, get_origin
+
+try:
+    # fastapi >= 0.134.0
+    from fastapi.dependencies.utils import get_stream_item_type
+except ImportError:
+    _STREAM_ORIGINS = {
+        collections.abc.AsyncIterable,
+        collections.abc.AsyncIterator,
+        collections.abc.AsyncGenerator,
+        collections.abc.Iterable,
+        collections.abc.Iterator,
+        collections.abc.Generator,
+    }
+
+    def get_stream_item_type(annotation: Any) -> Optional[Any]:
+        if get_origin(annotation) not in _STREAM_ORIGINS:
+            return None
+
+        args = get_args(annotation)
+        return args[0] if args else Any
+
+
+def encode_json(content: Any) -> bytes:
+    # same encoding as JSONResponse.render
+    return json.dumps(
+        content,
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def _encode_chunk(chunk: Any) -> bytes:
+    # items serialized by the json_stream backport are already bytes
+    if isinstance(chunk, bytes):
+        return chunk
+
+    return encode_json(jsonable_encoder(chunk))
+
+
+def _sync_json_array(content: Iterable[Any]) -> Iterator[bytes]:
+    separator = b"["
+    for chunk in content:
+        yield separator + _encode_chunk(chunk)
+        separator = b","
+
+    yield b"[]" if separator == b"[" else b"]"
+
+
+async def _async_json_array(content: AsyncIterable[Any]) -> AsyncIterator[bytes]:
+    separator = b"["
+    async for chunk in content:
+        yield separator + _encode_chunk(chunk)
+        separator = b","
+
+    yield b"[]" if separator == b"[" else b"]"
+
+
+class JSONArrayStreamingResponse(StreamingResponse):
+    media_type = "application/json"
+
+    def __init__(
+        self,
+        content: Union[Iterable[Any], AsyncIterable[Any]],
+        status_code: int = 200,
+        headers: Optional[Mapping[str, str]] = None,
+        media_type: Optional[str] = None,
+        background: Optional[BackgroundTask] = None,
+    ) -> None:
+        if isinstance(content, AsyncIterable):
+            framed: Any = _async_json_array(content)
+        else:
+            framed = _sync_json_array(content)
+
+        super().__init__(framed, status_code, headers, media_type, background)
+
+
+def is_json_stream(response_class: Any) -> bool:
+    # default response classes stream JSON Lines of validated items, like FastAPI does,
+    # custom ones, JSONArrayStreamingResponse included, get the items as they are
+    return isinstance(response_class, DefaultPlaceholder)
+
+
+__all__ = [
+    "JSONArrayStreamingResponse",
+    "encode_json",
+    "get_stream_item_type",
+    "is_json_stream",
+]
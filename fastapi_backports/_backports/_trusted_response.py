@@ -0,0 +1,136 @@
+import weakref
+from functools import wraps
+from typing import Any, Awaitable, Callable, Dict, NamedTuple, Optional, Tuple
+
+from fastapi._compat import ModelField, lenient_issubclass
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel
+from typing_extensions import get_args, get_origin
+
+
+class _TrustedModel(NamedTuple):
+    model: Any
+    many: bool
+
+
+class _TrustedFields:
+    # set on routes before their handler is created, so copies of the route share it
+    __slots__ = ("__weakref__",)
+
+
+# keyed by id, since the request handler only passes the field to serialize_response and fields of
+# pydantic v1 can't be weakly referenced, the fields are kept alive until their route is collected
+_TRUSTED: Dict[int, Tuple[Any, _TrustedModel]] = {}
+
+
+def init_trusted_response(route: Any, trust_response: bool) -> None:
+    route.trust_response = trust_response
+    route._trusted_fields = _TrustedFields()
+
+
+def _set_trusted(owner: _TrustedFields, field: Any, trusted: _TrustedModel) -> None:
+    _TRUSTED[id(field)] = (field, trusted)
+    weakref.finalize(owner, _TRUSTED.pop, id(field), None)
+
+
+def get_trusted_model(field: Any) -> Optional[_TrustedModel]:
+    if field is None:
+        return None
+
+    # json_response wraps the route's field to serialize it to JSON bytes
+    field = getattr(field, "field", field)
+    entry = _TRUSTED.get(id(field))
+    if entry is None or entry[0] is not field:
+        return None
+
+    return entry[1]
+
+
+def _trusted_model(response_model: Any) -> Optional[_TrustedModel]:
+    if lenient_issubclass(response_model, BaseModel):
+        return _TrustedModel(response_model, many=False)
+
+    args = get_args(response_model)
+    if get_origin(response_model) is list and len(args) == 1 and lenient_issubclass(args[0], BaseModel):
+        return _TrustedModel(args[0], many=True)
+
+    return None
+
+
+def mark_trusted_response(route: Any) -> None:
+    # the response fields are the ones the request handler serializes with, they are recreated with the route handler
+    owner = getattr(route, "_trusted_fields", None)
+    if owner is None or not route.trust_response:
+        return
+
+    trusted = _trusted_model(route.response_model)
+    for field in (route.response_field, getattr(route, "secure_cloned_response_field", None)):
+        if field is not None and trusted is not None:
+            _set_trusted(owner, field, trusted)
+
+    # items of streamed responses are validated one by one
+    stream_item_field = getattr(route, "stream_item_field", None)
+    stream_item_trusted = _trusted_model(getattr(route, "stream_item_type", None))
+    if stream_item_field is not None and stream_item_trusted is not None:
+        _set_trusted(owner, stream_item_field, stream_item_trusted)
+
+
+def _is_trusted(content: Any, trusted: _TrustedModel) -> bool:
+    # exact types only, instances of subclasses may have fields the declared model doesn't
+    if not trusted.many:
+        return type(content) is trusted.model
+
+    return type(content) is list and all(type(item) is trusted.model for item in content)
+
+
+def _serialize_trusted(
+    field: ModelField,
+    value: Any,
+    *,
+    include: Any = None,
+    exclude: Any = None,
+    by_alias: bool = True,
+    exclude_unset: bool = False,
+    exclude_defaults: bool = False,
+    exclude_none: bool = False,
+    dump_json: bool = False,
+    **_: Any,
+) -> Any:
+    options: Dict[str, Any] = {
+        "include": include,
+        "exclude": exclude,
+        "by_alias": by_alias,
+        "exclude_unset": exclude_unset,
+        "exclude_defaults": exclude_defaults,
+        "exclude_none": exclude_none,
+    }
+
+    if dump_json:
+        return field.serialize_json(value, **options)
+
+    if hasattr(field, "serialize"):
+        return field.serialize(value, **options)
+
+    # pydantic v1
+    return jsonable_encoder(value, **options)
+
+
+def add_trusted_response_to_serialize(serialize_func: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+    @wraps(serialize_func)
+    async def serialize_response(*, field: Optional[ModelField] = None, response_content: Any, **kwargs: Any) -> Any:
+        trusted = get_trusted_model(field)
+        if field is not None and trusted is not None and _is_trusted(response_content, trusted):
+            # already an instance of the declared model, only filtered and serialized
+            return _serialize_trusted(field, response_content, **kwargs)
+
+        return await serialize_func(field=field, response_content=response_content, **kwargs)
+
+    return serialize_response
+
+
+__all__ = [
+    "add_trusted_response_to_serialize",
+    "get_trusted_model",
+    "init_trusted_response",
+    "mark_trusted_response",
+]
@@ -0,0 +1,102 @@
+from functools import wraps
+from typing import Any, Callable, Dict, Literal, Optional, Tuple
+
+from fastapi import routing as _routing
+from fastapi._compat import ModelField
+from fastapi.datastructures import DefaultPlaceholder
+from starlette.responses import JSONResponse
+
+from fastapi_backports._patching import patch
+
+from ._base import BaseBackporter
+
+
+class _RawJSON(bytes):
+    pass
+
+
+class _RawJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, _RawJSON):
+            return content
+
+        return super().render(content)
+
+
+class _JSONSerializedField:
+    # serializes straight to JSON bytes with pydantic-core, instead of to a dict encoded again by JSONResponse
+    def __init__(self, field: ModelField) -> None:
+        self.field = field
+        self.type_adapter = field._type_adapter
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.field, name)
+
+    def serialize(
+        self,
+        value: Any,
+        *,
+        mode: Literal["json", "python"] = "json",
+        include: Any = None,
+        exclude: Any = None,
+        by_alias: bool = True,
+        exclude_unset: bool = False,
+        exclude_defaults: bool = False,
+        exclude_none: bool = False,
+    ) -> Any:
+        options: Dict[str, Any] = {
+            "include": include,
+            "exclude": exclude,
+            "by_alias": by_alias,
+            "exclude_unset": exclude_unset,
+            "exclude_defaults": exclude_defaults,
+            "exclude_none": exclude_none,
+        }
+
+        # only JSON output is short-circuited
+        if mode != "json":
+            return self.field.serialize(value, mode=mode, **options)
+
+        return _RawJSON(self.type_adapter.dump_json(value, **options))
+
+
+def _json_serialized(response_class: Any, response_field: Optional[ModelField]) -> Optional[Tuple[Any, Any]]:
+    # only the default response class is replaced, custom ones may encode content differently
+    if response_field is None or not hasattr(response_field, "_type_adapter"):
+        return None
+
+    if not isinstance(response_class, DefaultPlaceholder) or response_class.value is not JSONResponse:
+        return None
+
+    return DefaultPlaceholder(_RawJSONResponse), _JSONSerializedField(response_field)
+
+
+def _add_json_serialization_to_handler(get_request_handler: Callable[..., Any]) -> Callable[..., Any]:
+    @wraps(get_request_handler)
+    def _get_request_handler(*args: Any, **kwargs: Any) -> Any:
+        serialized = _json_serialized(kwargs.get("response_class"), kwargs.get("response_field"))
+        if serialized is not None:
+            kwargs["response_class"], kwargs["response_field"] = serialized
+
+        return get_request_handler(*args, **kwargs)
+
+    return _get_request_handler
+
+
+class JSONResponseBackporter(BaseBackporter):
+    @classmethod
+    def fixed_in_version(cls) -> Optional[Tuple[int, ...]]:
+        return 0, 130, 0
+
+    @classmethod
+    def label(cls) -> str:
+        return "releases/tag/0.130.0"
+
+    @classmethod
+    def backport(cls) -> None:
+        patch(_routing, "get_request_handler", _add_json_serialization_to_handler(_routing.get_request_handler))
+
+
+__all__ = [
+    "JSONResponseBackporter",
+]
@@ -0,0 +1,207 @@
+import inspect
+from copy import copy
+from dataclasses import replace
+from functools import wraps
+from typing import Any, AsyncIterable, AsyncIterator, Callable, Dict, Iterable, Iterator, Optional, Tuple, Type, cast
+
+import anyio
+import anyio.lowlevel
+from fastapi._compat import ModelField
+from fastapi.datastructures import Default, DefaultPlaceholder
+from fastapi.dependencies.utils import get_typed_return_annotation
+from fastapi.encoders import jsonable_encoder
+from fastapi.exceptions import ResponseValidationError
+from fastapi.routing import APIRoute as _APIRoute
+from fastapi.utils import create_model_field
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.routing import BaseRoute
+
+from fastapi_backports._patching import patch
+from fastapi_backports._retyped import APIRoute
+
+from ._base import BaseBackporter
+from ._streaming import JSONArrayStreamingResponse, encode_json, get_stream_item_type, is_json_stream
+from ._trusted_response import get_trusted_model
+
+try:
+    from fastapi._compat import _normalize_errors  # type: ignore[ty:unresolved-import]
+except ImportError:
+
+    def _normalize_errors(errors: Any) -> Any:
+        return errors
+
+
+_SUB_RESPONSE_PARAM = "__fastapi_backports_sub_response"
+_CHECKPOINT_INTERVAL = 64
+
+
+def _is_generator_endpoint(endpoint: Any) -> bool:
+    candidates = [endpoint, inspect.unwrap(endpoint)]
+    if not inspect.isclass(endpoint):
+        candidates.append(getattr(endpoint, "__call__", None))  # noqa: B004
+
+    return any(inspect.isgeneratorfunction(call) or inspect.isasyncgenfunction(call) for call in candidates)
+
+
+def is_stream_route(route: BaseRoute) -> bool:
+    return isinstance(route, APIRoute) and _is_generator_endpoint(route.endpoint)
+
+
+def _item_serializer(field: Optional[ModelField], options: Dict[str, Any]) -> Callable[[Any], bytes]:
+    if field is None:
+        return lambda item: encode_json(jsonable_encoder(item)) + b"\n"
+
+    trusted = get_trusted_model(field)
+    type_adapter = getattr(field, "_type_adapter", None)
+
+    def serialize(item: Any) -> bytes:
+        if trusted is not None and type(item) is trusted.model:
+            value = item
+        else:
+            value, errors = field.validate(item, {}, loc=("response",))
+            if errors:
+                errors = errors if isinstance(errors, list) else [errors]
+                raise ResponseValidationError(errors=_normalize_errors(errors), body=item)
+
+        if type_adapter is not None:
+            return type_adapter.dump_json(value, **options) + b"\n"
+
+        # pydantic v1
+        return encode_json(jsonable_encoder(value, **options)) + b"\n"
+
+    return serialize
+
+
+def _sync_stream(items: Iterable[Any], encode: Callable[[Any], bytes]) -> Iterator[bytes]:
+    for item in items:
+        yield encode(item)
+
+
+async def _async_stream(items: AsyncIterable[Any], encode: Optional[Callable[[Any], bytes]]) -> AsyncIterator[Any]:
+    count = 0
+    async for item in items:
+        yield item if encode is None else encode(item)
+
+        # lets cancellation reach endpoints that yield without awaiting anything,
+        # a checkpoint per item would cost an event loop iteration each
+        count += 1
+        if count % _CHECKPOINT_INTERVAL == 0:
+            await anyio.lowlevel.checkpoint()
+
+
+class _JSONLinesResponse(StreamingResponse):
+    media_type = "application/jsonl"
+
+
+def _stream_endpoint(route: APIRoute) -> Callable[..., Any]:
+    endpoint = route.dependant.call
+    assert endpoint is not None
+    response_param_name = route.dependant.response_param_name or _SUB_RESPONSE_PARAM
+
+    json_stream = is_json_stream(route.response_class)
+    response_class = _JSONLinesResponse if json_stream else cast("Type[Response]", route.response_class)
+
+    options = {
+        "include": route.response_model_include,
+        "exclude": route.response_model_exclude,
+        "by_alias": route.response_model_by_alias,
+        "exclude_unset": route.response_model_exclude_unset,
+        "exclude_defaults": route.response_model_exclude_defaults,
+        "exclude_none": route.response_model_exclude_none,
+    }
+
+    # returns the response itself, so the request handler only solves dependencies and adds background tasks
+    async def call(**values: Any) -> Response:
+        sub_response = values[response_param_name]
+        if response_param_name == _SUB_RESPONSE_PARAM:
+            del values[response_param_name]
+
+        items = endpoint(**values)
+        encode = _item_serializer(route.stream_item_field, options) if json_stream else None
+
+        if isinstance(items, AsyncIterable):
+            content: Any = _async_stream(items, encode)
+        else:
+            content = items if encode is None else _sync_stream(items, encode)
+
+        response = response_class(content=content, status_code=sub_response.status_code or route.status_code or 200)
+        response.headers.raw.extend(sub_response.headers.raw)
+        return response
+
+    return call
+
+
+def _create_overrides() -> Any:
+    _original_init = _APIRoute.__init__
+    _original_get_route_handler = _APIRoute.get_route_handler
+
+    class _APIRoutePatched(_APIRoute):
+        @wraps(_original_init)
+        def __init__(
+            self,
+            path: str,
+            endpoint: Callable[..., Any],
+            *,
+            response_model: Any = Default(None),
+            **kwargs: Any,
+        ) -> None:
+            self.stream_item_type: Optional[Any] = None
+            self.stream_item_field: Optional[ModelField] = None
+
+            if isinstance(response_model, DefaultPlaceholder):
+                stream_item = get_stream_item_type(get_typed_return_annotation(endpoint))
+                if stream_item is not None:
+                    response_model = None
+
+                    if is_json_stream(kwargs.get("response_class", Default(JSONResponse))):
+                        self.stream_item_type = stream_item
+
+            _original_init(self, path, endpoint, response_model=response_model, **kwargs)
+
+    @wraps(_original_get_route_handler)
+    def get_route_handler(self: APIRoute) -> Any:
+        if not is_stream_route(self):
+            return _original_get_route_handler(self)
+
+        if self.stream_item_type is not None and self.stream_item_field is None:
+            self.stream_item_field = create_model_field(
+                name="StreamItem_" + self.unique_id,
+                type_=self.stream_item_type,
+                mode="serialization",
+            )
+
+        # the sub response is always requested, for the headers and status code dependencies set on it,
+        # the handler is built for a copy of the route so the shared route is never modified
+        route = copy(self)
+        route.dependant = replace(
+            self.dependant,  # type: ignore[ty:invalid-argument-type]
+            call=_stream_endpoint(self),
+            response_param_name=self.dependant.response_param_name or _SUB_RESPONSE_PARAM,
+        )
+        return _original_get_route_handler(route)
+
+    return _APIRoutePatched, get_route_handler
+
+
+class JSONStreamBackporter(BaseBackporter):
+    @classmethod
+    def fixed_in_version(cls) -> Optional[Tuple[int, ...]]:
+        return 0, 134, 0
+
+    @classmethod
+    def label(cls) -> str:
+        return "releases/tag/0.134.0"
+
+    @classmethod
+    def backport(cls) -> None:
+        _APIRoutePatched, get_route_handler = _create_overrides()  # noqa: N806
+
+        patch(_APIRoute, "__init__", _APIRoutePatched.__init__)
+        patch(_APIRoute, "get_route_handler", get_route_handler)
+
+
+__all__ = [
+    "JSONArrayStreamingResponse",
+    "JSONStreamBackporter",
+    "is_stream_route",
+]
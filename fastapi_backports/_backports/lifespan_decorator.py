@@ -1,24 +1,188 @@
+from contextlib import AsyncExitStack, asynccontextmanager
+from functools import wraps
+from typing import Any, AsyncIterator, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import anyio
 from fastapi import APIRouter as _APIRouter
+from fastapi.exceptions import FastAPIError
 from fastapi.routing import _merge_lifespan_context
 from starlette.types import Lifespan
 
+from fastapi_backports._lifespans import TimedLifespan, register_lifespan
+from fastapi_backports._patching import patch
 from fastapi_backports._retyped import FastAPI as _FastAPI
 
 from ._base import BaseBackporter
 
 
+class _LifespanGraph:
+    # lifespans registered with `depends_on` are entered concurrently once their dependencies are entered,
+    # and exited only after all of their dependents are exited
+
+    def __init__(self) -> None:
+        self.keys: List[Lifespan] = []
+        self.lifespans: List[Lifespan] = []
+        self.dependencies: List[Tuple[int, ...]] = []
+
+    def add(self, key: Lifespan, lifespan: Lifespan, depends_on: Sequence[Lifespan]) -> None:
+        dependencies = []
+        for dependency in depends_on:
+            if dependency not in self.keys:
+                name = getattr(dependency, "__name__", repr(dependency))
+                msg = f"Lifespan {name!r} must be added with `depends_on` before lifespans depending on it"
+                raise FastAPIError(msg)
+
+            dependencies.append(self.keys.index(dependency))
+
+        self.keys.append(key)
+        self.lifespans.append(lifespan)
+        self.dependencies.append(tuple(dependencies))
+
+    @asynccontextmanager
+    async def __call__(self, app: Any) -> AsyncIterator[Optional[Mapping[str, Any]]]:
+        count = len(self.lifespans)
+        dependents: List[List[int]] = [[] for _ in range(count)]
+        for index, dependencies in enumerate(self.dependencies):
+            for dependency in dependencies:
+                dependents[dependency].append(index)
+
+        entered = [anyio.Event() for _ in range(count)]
+        exited = [anyio.Event() for _ in range(count)]
+        # lifespans still being entered are cancelled once another one fails to start
+        entering = [anyio.CancelScope() for _ in range(count)]
+        stop = anyio.Event()
+        states: Dict[int, Optional[Mapping[str, Any]]] = {}
+        errors: List[Exception] = []
+
+        async def run(index: int) -> None:
+            try:
+                async with AsyncExitStack() as stack:
+                    with entering[index]:
+                        for dependency in self.dependencies[index]:
+                            await entered[dependency].wait()
+
+                        if errors or any(dependency not in states for dependency in self.dependencies[index]):
+                            return
+
+                        states[index] = await stack.enter_async_context(self.lifespans[index](app))
+
+                    if index not in states:
+                        return
+
+                    entered[index].set()
+                    await stop.wait()
+
+                    for dependent in dependents[index]:
+                        await exited[dependent].wait()
+            except Exception as exc:  # noqa: BLE001
+                errors.append(exc)
+                for scope in entering:
+                    scope.cancel()
+            finally:
+                entered[index].set()
+                exited[index].set()
+
+        async with anyio.create_task_group() as tg:
+            for index in range(count):
+                tg.start_soon(run, index)
+
+            for event in entered:
+                await event.wait()
+
+            if errors:
+                stop.set()
+            else:
+                try:
+                    if all(state is None for state in states.values()):
+                        yield None
+                    else:
+                        yield {key: value for index in range(count) for key, value in (states[index] or {}).items()}
+                except Exception as exc:  # noqa: BLE001
+                    errors.insert(0, exc)
+                finally:
+                    stop.set()
+
+        if errors:
+            raise errors[0]
+
+
+def _add_timing_to_init(init_func: Callable[..., None]) -> Callable[..., None]:
+    @wraps(init_func)
+    def _new_init(self: Any, *args: Any, lifespan: Optional[Lifespan] = None, **kwargs: Any) -> None:
+        init_func(self, *args, lifespan=lifespan, **kwargs)
+
+        # lifespans passed to routers, and merged by include_router, are timed like the ones added with add_lifespan
+        if lifespan is not None and not isinstance(lifespan, TimedLifespan):
+            name = getattr(lifespan, "__qualname__", None)
+            self.lifespan_context = TimedLifespan(self.lifespan_context, name=name)
+
+    return _new_init
+
+
 class _APIRouterWithLifespan(_APIRouter):
-    def add_lifespan(self, lifespan: Lifespan) -> Lifespan:
-        self.lifespan_context = _merge_lifespan_context(
-            self.lifespan_context,
-            lifespan,
-        )
+    _lifespan_graph: Optional[_LifespanGraph]
+
+    def add_lifespan(
+        self,
+        lifespan: Optional[Lifespan] = None,
+        *,
+        depends_on: Optional[Sequence[Lifespan]] = None,
+        startup_timeout: Optional[float] = None,
+        shutdown_timeout: Optional[float] = None,
+        lazy: bool = False,
+        request_state: bool = True,
+    ) -> Any:
+        if lifespan is None:
+            return lambda lifespan: self.add_lifespan(
+                lifespan,
+                depends_on=depends_on,
+                startup_timeout=startup_timeout,
+                shutdown_timeout=shutdown_timeout,
+                lazy=lazy,
+                request_state=request_state,
+            )
+
+        if lazy and depends_on is not None:
+            msg = "Lazy lifespans can't be part of the lifespan dependency graph"
+            raise FastAPIError(msg)
+
+        timed = TimedLifespan(lifespan, startup_timeout=startup_timeout, shutdown_timeout=shutdown_timeout)
+        registered = register_lifespan(lifespan, timed, lazy=lazy, request_state=request_state)
+
+        if depends_on is None:
+            self.lifespan_context = _merge_lifespan_context(self.lifespan_context, registered)
+            return lifespan
+
+        if self._lifespan_graph is None:
+            self._lifespan_graph = _LifespanGraph()
+            self.lifespan_context = _merge_lifespan_context(
+                self.lifespan_context,
+                self._lifespan_graph,  # type: ignore[ty:invalid-argument-type]
+            )
+
+        self._lifespan_graph.add(lifespan, registered, depends_on)
         return lifespan
 
 
 class _FastAPIWithLifespan(_FastAPI):
-    def add_lifespan(self, lifespan: Lifespan) -> Lifespan:
-        return self.router.add_lifespan(lifespan)
+    def add_lifespan(
+        self,
+        lifespan: Optional[Lifespan] = None,
+        *,
+        depends_on: Optional[Sequence[Lifespan]] = None,
+        startup_timeout: Optional[float] = None,
+        shutdown_timeout: Optional[float] = None,
+        lazy: bool = False,
+        request_state: bool = True,
+    ) -> Any:
+        return self.router.add_lifespan(
+            lifespan,  # type: ignore[ty:invalid-argument-type]
+            depends_on=depends_on,
+            startup_timeout=startup_timeout,
+            shutdown_timeout=shutdown_timeout,
+            lazy=lazy,
+            request_state=request_state,
+        )
 
 
 class LifespanDecoratorBackporter(BaseBackporter):
@@ -28,8 +192,10 @@ class LifespanDecoratorBackporter(BaseBackporter):
 
     @classmethod
     def backport(cls) -> None:
-        _APIRouter.add_lifespan = _APIRouterWithLifespan.add_lifespan  # type: ignore[ty:unresolved-attribute]
-        _FastAPI.add_lifespan = _FastAPIWithLifespan.add_lifespan  # type: ignore[ty:invalid-assignment]
+        patch(_APIRouter, "__init__", _add_timing_to_init(_APIRouter.__init__))
+        patch(_APIRouter, "_lifespan_graph", None)
+        patch(_APIRouter, "add_lifespan", _APIRouterWithLifespan.add_lifespan)
+        patch(_FastAPI, "add_lifespan", _FastAPIWithLifespan.add_lifespan)
 
 
 __all__ = [
@@ -10,6 +10,7 @@ from fastapi.dependencies.utils import (
 from pydantic import BaseModel
 from starlette.datastructures import Headers, QueryParams
 
+from fastapi_backports._patching import patch
 from fastapi_backports._utils import check_field_is_subclass, get_field_type
 
 from ._base import BaseBackporter
@@ -102,10 +103,10 @@ class MultipleQueryModelsBackporter(BaseBackporter):
         from fastapi.dependencies import utils as _deps_utils
         from fastapi.openapi import utils as _openapi_utils
 
-        _deps_utils.request_params_to_args = request_params_to_args  # type: ignore[ty:invalid-assignment]
-        _deps_utils._get_flat_fields_from_params = _get_flat_fields_from_params  # type: ignore[ty:invalid-assignment]
+        patch(_deps_utils, "request_params_to_args", request_params_to_args)
+        patch(_deps_utils, "_get_flat_fields_from_params", _get_flat_fields_from_params)
 
-        _openapi_utils._get_flat_fields_from_params = _get_flat_fields_from_params  # type: ignore[ty:invalid-assignment]
+        patch(_openapi_utils, "_get_flat_fields_from_params", _get_flat_fields_from_params)
 
 
 __all__ = [
@@ -1,3 +1,4 @@
+import threading
 from contextlib import asynccontextmanager
 from functools import wraps
 from typing import Any, AsyncIterator, Iterable, List, Optional, Union
@@ -49,10 +50,13 @@ from starlette.routing import BaseRoute
 from typing_extensions import ForwardRef as _TypingExt_ForwardRef
 from typing_extensions import TypeAlias, TypeIs
 
+from fastapi_backports._patching import patch
 from fastapi_backports._retyped import APIRoute, APIWebSocketRoute
 from fastapi_backports._utils import check_field_is_instance, create_cloned_field
+from fastapi_backports._warmup import run_warmup, warmup_enabled
 
 from ._base import BaseBackporter
+from ._streaming import get_stream_item_type, is_json_stream
 
 try:
     from fastapi.routing import request_response
@@ -87,6 +91,9 @@ def _all_model_fields(route: _APIRouteType) -> Iterable[ModelField]:
     if isinstance(route, APIRoute) and route.response_field:
         yield route.response_field
 
+    if isinstance(route, APIRoute) and getattr(route, "stream_item_field", None):
+        yield route.stream_item_field
+
     try:
         dependant = route._flat_dependant  # type: ignore[ty:unresolved-attribute]
     except AttributeError:
@@ -133,8 +140,13 @@ def _recreate_route_dependant(route: _APIRouteType) -> _APIRouteType:
     if isinstance(route, APIRoute):
         if not getattr(route, "_custom_response_model", False):
             return_annotation = get_typed_return_annotation(route.endpoint)
+            stream_item = get_stream_item_type(return_annotation)
             if lenient_issubclass(return_annotation, Response):
                 route.response_model = None
+            elif stream_item is not None:
+                route.response_model = None
+                if is_json_stream(route.response_class):
+                    route.stream_item_type = stream_item
             else:
                 route.response_model = return_annotation
 
@@ -148,6 +160,13 @@ def _recreate_route_dependant(route: _APIRouteType) -> _APIRouteType:
         else:
             route.response_field = None
 
+        if getattr(route, "stream_item_type", None):
+            route.stream_item_field = create_model_field(
+                name="StreamItem_" + route.unique_id,
+                type_=route.stream_item_type,
+                mode="serialization",
+            )
+
         if _get_body_field is None:
             # fastapi < 0.141.0 keeps a securely cloned copy of the response field
             if route.response_field is not None:
@@ -187,15 +206,25 @@ def _recreate_route_dependant(route: _APIRouteType) -> _APIRouteType:
     return route
 
 
+# applications shared between threads may be started by several of them at once
+_RESOLVE_LOCK = threading.Lock()
+
+
 def _update_postponed_routes(app: FastAPI) -> None:
-    for i, route in enumerate(app.router.routes):
-        if _is_postponed_route_declaration(route):
-            app.router.routes[i] = _recreate_route_dependant(route)
+    with _RESOLVE_LOCK:
+        for i, route in enumerate(app.router.routes):
+            if _is_postponed_route_declaration(route):
+                app.router.routes[i] = _recreate_route_dependant(route)
 
 
 @asynccontextmanager
 async def _validate_postponed_routes(app: FastAPI) -> AsyncIterator[None]:
     _update_postponed_routes(app)
+
+    # warmed up once the routes are final, before any other lifespan or request runs
+    if warmup_enabled():
+        await run_warmup(app)
+
     yield
 
 
@@ -259,11 +288,11 @@ class PostponedAnnotationsBackporter(BaseBackporter):
     def backport(cls) -> None:
         _APIRoutePatched, _APIWebSocketRoutePatched, _FastAPIPatched = _create_overrides()  # noqa: N806
 
-        _FastAPI.__init__ = _FastAPIPatched.__init__
-        _APIRoute.__init__ = _APIRoutePatched.__init__
-        _APIWebSocketRoute.__init__ = _APIWebSocketRoutePatched.__init__
+        patch(_FastAPI, "__init__", _FastAPIPatched.__init__)
+        patch(_APIRoute, "__init__", _APIRoutePatched.__init__)
+        patch(_APIWebSocketRoute, "__init__", _APIWebSocketRoutePatched.__init__)
 
-        _dependencies_utils.evaluate_forwardref = evaluate_forwardref  # type: ignore[ty:invalid-assignment]
+        patch(_dependencies_utils, "evaluate_forwardref", evaluate_forwardref)
 
 
 __all__ = [
@@ -1,9 +1,10 @@
 from typing import Callable
 
 from fastapi import APIRouter as _APIRouter
-from fastapi.openapi.constants import METHODS_WITH_BODY
+from fastapi.openapi import utils as _openapi_utils
 from fastapi.types import DecoratedCallable
 
+from fastapi_backports._patching import patch
 from fastapi_backports._retyped import FastAPI as _FastAPI
 
 from ._base import BaseBackporter
@@ -28,10 +29,9 @@ class QueryMethodBackporter(BaseBackporter):
 
     @classmethod
     def backport(cls) -> None:
-        _FastAPI.query = _FastAPIWithQueryMethod.query  # type: ignore[ty:invalid-assignment]
-        _APIRouter.query = _APIRouterWithQueryMethod.query  # type: ignore[ty:unresolved-attribute]
-
-        METHODS_WITH_BODY.add("QUERY")
+        patch(_FastAPI, "query", _FastAPIWithQueryMethod.query)
+        patch(_APIRouter, "query", _APIRouterWithQueryMethod.query)
+        patch(_openapi_utils, "METHODS_WITH_BODY", _openapi_utils.METHODS_WITH_BODY | {"QUERY"})
 
 
 __all__ = [
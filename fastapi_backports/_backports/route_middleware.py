@@ -8,6 +8,7 @@ from typing import Any, Callable, Dict, List, Literal, Optional, Sequence, Set,
 
 from fastapi import FastAPI as _FastAPI
 from fastapi import params
+from fastapi import routing as _routing
 from fastapi.datastructures import Default, DefaultPlaceholder
 from fastapi.exceptions import FastAPIError
 from fastapi.routing import APIRoute as _APIRoute
@@ -22,17 +23,16 @@ from starlette.responses import JSONResponse, Response
 from starlette.routing import BaseRoute
 from typing_extensions import TypeIs, override
 
+from fastapi_backports._patching import patch
 from fastapi_backports._retyped import APIRoute, APIRouter, APIWebSocketRoute, FastAPI
 
 from ._base import BaseBackporter
-
-_APIRoute_init = _APIRoute.__init__
-_APIWebSocketRoute_init = _APIWebSocketRoute.__init__
-_APIRouter_init = _APIRouter.__init__
+from ._trusted_response import add_trusted_response_to_serialize, init_trusted_response, mark_trusted_response
 
 
 class _PatchedAPIRouter(_APIRouter):
     middleware: Optional[Sequence[Middleware]] = None
+    trust_response: bool = False
 
     @override
     def get(self, *args, **kwargs) -> Callable[[DecoratedCallable], DecoratedCallable]:
@@ -97,6 +97,7 @@ class _PatchedAPIRouter(_APIRouter):
         openapi_extra: Optional[Dict[str, Any]] = None,
         generate_unique_id_function: Union[Callable[[APIRoute], str], DefaultPlaceholder] = Default(generate_unique_id),
         middleware: Optional[Sequence[Middleware]] = None,
+        trust_response: bool = False,
     ) -> None:
         route_class = route_class_override or self.route_class
         responses = responses or {}
@@ -143,6 +144,7 @@ class _PatchedAPIRouter(_APIRouter):
             openapi_extra=openapi_extra,
             generate_unique_id_function=current_generate_unique_id,  # type: ignore[ty:invalid-argument-type]
             middleware=current_middleware,  # type: ignore[ty:unknown-argument]
+            trust_response=trust_response or self.trust_response,  # type: ignore[ty:unknown-argument]
         )
         self.routes.append(route)
 
@@ -211,6 +213,7 @@ class _PatchedAPIRouter(_APIRouter):
         include_in_schema: bool = True,
         generate_unique_id_function: Callable[[APIRoute], str] = Default(generate_unique_id),
         middleware: Optional[Sequence[Middleware]] = None,
+        trust_response: bool = False,
     ) -> None:
         if prefix:
             assert prefix.startswith("/"), "A path prefix must start with '/'"
@@ -261,7 +264,8 @@ class _PatchedAPIRouter(_APIRouter):
                 self.add_api_route(
                     prefix + route.path,
                     route.endpoint,
-                    response_model=route.response_model,
+                    # streamed item types are derived from the endpoint again
+                    response_model=Default(None) if getattr(route, "stream_item_type", None) else route.response_model,
                     status_code=route.status_code,
                     tags=current_tags,
                     dependencies=current_dependencies,
@@ -286,6 +290,7 @@ class _PatchedAPIRouter(_APIRouter):
                     openapi_extra=route.openapi_extra,
                     generate_unique_id_function=current_generate_unique_id,
                     middleware=current_middleware,
+                    trust_response=trust_response or route.trust_response,
                 )
             elif isinstance(route, routing.Route):
                 methods = list(route.methods or [])
@@ -357,6 +362,25 @@ def _add_middleware_to_init(
     return _new_init
 
 
+def _add_trust_response_to_init(init_func: Callable[..., None]) -> Callable[..., None]:
+    @wraps(init_func)
+    def _new_init(self: Any, *args: Any, trust_response: bool = False, **kwargs: Any) -> None:
+        # set before the original init, which already creates the route handler
+        init_trusted_response(self, trust_response)
+        init_func(self, *args, **kwargs)
+
+    return _new_init
+
+
+def _add_trusted_response_to_route_handler(get_route_handler: Callable[[Any], Any]) -> Callable[[Any], Any]:
+    @wraps(get_route_handler)
+    def _get_route_handler(self: APIRoute) -> Any:
+        mark_trusted_response(self)
+        return get_route_handler(self)
+
+    return _get_route_handler
+
+
 def _is_override(func: Any) -> TypeIs[types.FunctionType]:
     return getattr(func, "__override__", False)
 
@@ -375,14 +399,23 @@ class RouteMiddlewareBackporter(BaseBackporter):
 
     @classmethod
     def backport(cls) -> None:
-        _APIRoute.middleware = None  # type: ignore[ty:unresolved-attribute]
-        _APIRoute.__init__ = _add_middleware_to_init(_APIRoute_init, "app")  # type: ignore[ty:invalid-assignment]
-
-        _APIWebSocketRoute.middleware = None  # type: ignore[ty:unresolved-attribute]
-        _APIWebSocketRoute.__init__ = _add_middleware_to_init(_APIWebSocketRoute_init, "app")  # type: ignore[ty:invalid-assignment]
-
-        _APIRouter.middleware = None  # type: ignore[ty:unresolved-attribute]
-        _APIRouter.__init__ = _add_middleware_to_init(_APIRouter_init, "middleware_stack", wrap=False)  # type: ignore[ty:invalid-assignment]
+        # the originals are resolved now, they may have been patched or reverted since this module was imported
+        route_init = _add_trust_response_to_init(_add_middleware_to_init(_APIRoute.__init__, "app"))
+        patch(_APIRoute, "middleware", None)
+        patch(_APIRoute, "trust_response", False)
+        patch(_APIRoute, "__init__", route_init)
+        patch(_APIRoute, "get_route_handler", _add_trusted_response_to_route_handler(_APIRoute.get_route_handler))
+        patch(_routing, "serialize_response", add_trusted_response_to_serialize(_routing.serialize_response))
+
+        patch(_APIWebSocketRoute, "middleware", None)
+        patch(_APIWebSocketRoute, "__init__", _add_middleware_to_init(_APIWebSocketRoute.__init__, "app"))
+
+        router_init = _add_trust_response_to_init(
+            _add_middleware_to_init(_APIRouter.__init__, "middleware_stack", wrap=False)
+        )
+        patch(_APIRouter, "middleware", None)
+        patch(_APIRouter, "trust_response", False)
+        patch(_APIRouter, "__init__", router_init)
 
         # copy all overridden methods from _PatchedAPIRouter to original APIRouter and FastAPI
         for name, method in _PatchedAPIRouter.__dict__.items():
@@ -390,12 +423,17 @@ class RouteMiddlewareBackporter(BaseBackporter):
                 original_method = cast("Callable[..., Any]", getattr(_APIRouter, name))
 
                 wrapped = wraps(original_method)(method)
-                setattr(_APIRouter, name, wrapped)
+                patch(_APIRouter, name, wrapped)
 
                 original_method = getattr(_FastAPI, name)
                 wrapped_app_method = wraps(original_method)(_create_delegate_method(name))
 
-                setattr(_FastAPI, name, wrapped_app_method)
+                patch(_FastAPI, name, wrapped_app_method)
+
+        # lets ThreadPoolMiddleware run sync functions of its routes in its own pool
+        from fastapi_backports.middleware._threads import install_threadpool_hook
+
+        install_threadpool_hook()
 
 
 __all__ = [
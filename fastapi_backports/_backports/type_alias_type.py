@@ -1,9 +1,13 @@
-from typing import Any
+import threading
+import types
+from functools import lru_cache
+from typing import Any, Union
 
 from fastapi.dependencies import utils as _deps_utils
-from typing_extensions import Protocol, TypeIs
+from typing_extensions import Annotated, Protocol, TypeIs, get_args, get_origin
 
 from fastapi_backports._backports import BaseBackporter
+from fastapi_backports._patching import patch, patched_original
 
 try:
     from typing_extensions import TypeAliasType as _TETypeAliasType
@@ -21,7 +25,13 @@ except ImportError:
         __value__: Any
 
 
-_original_analyze_param = _deps_utils.analyze_param
+_UNION_ORIGINS = (Union, getattr(types, "UnionType", Union))
+
+# aliases are usually module level, the bound only matters for aliases created on the fly
+_UNWRAPPED_ALIASES_SIZE = 1024
+
+# aliases being resolved by the current thread, other threads only ever see fully resolved aliases in the cache
+_RESOLVING = threading.local()
 
 
 class _HasValue(Protocol):
@@ -32,6 +42,67 @@ def _is_type_alias_type(annotation: Any) -> TypeIs[_HasValue]:
     return isinstance(annotation, (_TETypeAliasType, _BuiltinTypeAliasType))
 
 
+def _resolve_type_alias(alias: Any) -> Any:
+    origin = get_origin(alias)
+    if origin is None:
+        return unwrap_type_alias(alias.__value__)
+
+    # generic alias subscripted at the use site, e.g. `Alias[int]`
+    value = origin.__value__
+    parameters = getattr(value, "__parameters__", ())
+    if parameters:
+        arguments = dict(zip(getattr(origin, "__type_params__", ()), get_args(alias)))
+        value = value[tuple(arguments.get(parameter, parameter) for parameter in parameters)]
+
+    return unwrap_type_alias(value)
+
+
+@lru_cache(maxsize=_UNWRAPPED_ALIASES_SIZE)
+def _resolve_type_alias_cached(alias: Any) -> Any:
+    return _resolve_type_alias(alias)
+
+
+def _unwrap_alias(alias: Any) -> Any:
+    # guards against recursive aliases while resolving
+    resolving = _RESOLVING.__dict__.setdefault("aliases", set())
+    try:
+        if alias in resolving:
+            return alias
+    except TypeError:
+        return _resolve_type_alias(alias)
+
+    resolving.add(alias)
+    try:
+        return _resolve_type_alias_cached(alias)
+    finally:
+        resolving.discard(alias)
+
+
+def _unwrap_args(annotation: Any, origin: Any) -> Any:
+    args = get_args(annotation)
+    if origin is Annotated:
+        unwrapped = unwrap_type_alias(args[0])
+        return annotation if unwrapped is args[0] else Annotated[(unwrapped, *args[1:])]
+
+    unwrapped_args = tuple(unwrap_type_alias(arg) for arg in args)
+    if all(unwrapped is arg for unwrapped, arg in zip(unwrapped_args, args)):
+        return annotation
+
+    return Union[unwrapped_args]
+
+
+def unwrap_type_alias(annotation: Any) -> Any:
+    # generic aliases forward attribute access to their origin, so they have to be checked first
+    origin = get_origin(annotation)
+    if _is_type_alias_type(origin) or (origin is None and _is_type_alias_type(annotation)):
+        return _unwrap_alias(annotation)
+
+    if origin is Annotated or origin in _UNION_ORIGINS:
+        return _unwrap_args(annotation, origin)
+
+    return annotation
+
+
 def analyze_param(
     *,
     param_name: str,
@@ -39,12 +110,10 @@ def analyze_param(
     value: Any,
     is_path_param: bool,
 ) -> _deps_utils.ParamDetails:
-    if _is_type_alias_type(annotation):
-        annotation = annotation.__value__
-
-    return _original_analyze_param(
+    original_analyze_param = patched_original(_deps_utils, "analyze_param", analyze_param)
+    return original_analyze_param(
         param_name=param_name,
-        annotation=annotation,
+        annotation=unwrap_type_alias(annotation),
         value=value,
         is_path_param=is_path_param,
     )
@@ -57,7 +126,7 @@ class TypeAliasTypeBackporter(BaseBackporter):
 
     @classmethod
     def backport(cls) -> None:
-        _deps_utils.analyze_param = analyze_param  # type: ignore[ty:invalid-assignment]
+        patch(_deps_utils, "analyze_param", analyze_param)
 
 
 __all__ = [
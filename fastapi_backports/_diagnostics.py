@@ -0,0 +1,177 @@
+import subprocess
+import sys
+from dataclasses import dataclass
+from importlib import import_module
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from fastapi.datastructures import DefaultPlaceholder
+from fastapi.dependencies.models import Dependant
+from fastapi.dependencies.utils import get_typed_signature
+from fastapi.routing import APIRoute, APIWebSocketRoute
+from pydantic import BaseModel
+from starlette.routing import BaseRoute
+
+from ._backporter import _BACKPORTERS, backported, load_backporter
+from ._utils import check_field_is_subclass
+
+_IMPORT_TIME_SCRIPT = """
+import sys
+from time import perf_counter
+
+import fastapi.routing
+import fastapi_backports._backports._base
+
+started_at = perf_counter()
+import fastapi_backports._backports.{name}
+sys.stdout.write(repr(perf_counter() - started_at))
+"""
+
+
+@dataclass(frozen=True)
+class BackportDiagnostic:
+    name: str
+    label: str
+    needed: bool
+    applied: bool
+    routes: Optional[List[str]]
+
+
+def _route_name(route: BaseRoute) -> str:
+    methods = ",".join(sorted(getattr(route, "methods", None) or ())) or "WEBSOCKET"
+    return f"{methods} {getattr(route, 'path', route)}"
+
+
+def _dependants(dependant: Dependant) -> Iterable[Dependant]:
+    yield dependant
+
+    for sub_dependant in dependant.dependencies:
+        yield from _dependants(sub_dependant)
+
+
+def _has_multiple_query_models(route: BaseRoute) -> bool:
+    if not isinstance(route, APIRoute):
+        return False
+
+    query_params = [field for dependant in _dependants(route.dependant) for field in dependant.query_params]
+    return len(query_params) > 1 and any(check_field_is_subclass(field, BaseModel) for field in query_params)
+
+
+def _has_type_aliases(route: BaseRoute) -> bool:
+    from ._backports.type_alias_type import unwrap_type_alias
+
+    if not isinstance(route, (APIRoute, APIWebSocketRoute)):
+        return False
+
+    for dependant in _dependants(route.dependant):
+        try:
+            parameters = get_typed_signature(dependant.call).parameters.values() if dependant.call else ()
+        except (NameError, TypeError, ValueError):
+            continue
+
+        if any(unwrap_type_alias(parameter.annotation) is not parameter.annotation for parameter in parameters):
+            return True
+
+    return False
+
+
+def _has_postponed_annotations(route: BaseRoute) -> bool:
+    from ._backports.postponed_annotations import _is_postponed_route_declaration
+
+    return _is_postponed_route_declaration(route)
+
+
+def _has_middleware(route: BaseRoute) -> bool:
+    return bool(getattr(route, "middleware", None))
+
+
+def _has_query_method(route: BaseRoute) -> bool:
+    return "QUERY" in (getattr(route, "methods", None) or ())
+
+
+def _has_json_stream(route: BaseRoute) -> bool:
+    from ._backports.json_stream import is_stream_route
+
+    return is_stream_route(route)
+
+
+def _has_json_response(route: BaseRoute) -> bool:
+    return (
+        isinstance(route, APIRoute)
+        and route.response_field is not None
+        and isinstance(route.response_class, DefaultPlaceholder)
+    )
+
+
+# name -> predicate for the routes the backport is used by, lifespans are not tied to routes
+_ROUTE_CHECKS: Dict[str, Optional[Callable[[BaseRoute], bool]]] = {
+    "route_middleware": _has_middleware,
+    "multiple_query_models": _has_multiple_query_models,
+    "type_alias_type": _has_type_aliases,
+    "json_stream": _has_json_stream,
+    "postponed_annotations": _has_postponed_annotations,
+    "query_method": _has_query_method,
+    "lifespan_decorator": None,
+    "json_response": _has_json_response,
+}
+
+
+def rebuilt_routes(app: Any) -> List[str]:
+    # routes with unresolved annotations are rebuilt when the application starts
+    return [_route_name(route) for route in app.router.routes if _has_postponed_annotations(route)]
+
+
+def diagnose_backports(app: Any) -> List[BackportDiagnostic]:
+    applied = {backporter.label() for backporter in backported()}
+    results = []
+
+    for name in _BACKPORTERS:
+        backporter = load_backporter(name)
+        check = _ROUTE_CHECKS[name]
+
+        results.append(
+            BackportDiagnostic(
+                name=name,
+                label=backporter.label(),
+                needed=backporter.needs_backport(),
+                applied=backporter.label() in applied,
+                routes=None if check is None else [_route_name(route) for route in app.router.routes if check(route)],
+            )
+        )
+
+    return results
+
+
+def measure_import_time(name: str) -> float:
+    # measured in a fresh interpreter, since the backport is usually already imported in this one
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", _IMPORT_TIME_SCRIPT.format(name=name)],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return float(result.stdout)
+
+
+def load_app(import_string: str, *, factory: bool = False, reload: bool = False) -> Any:
+    module_name, _, attr = import_string.partition(":")
+    if not module_name or not attr:
+        msg = f"Import string {import_string!r} must be in format '<module>:<attribute>'"
+        raise ValueError(msg)
+
+    if reload:
+        sys.modules.pop(module_name, None)
+
+    instance: Any = import_module(module_name)
+    for part in attr.split("."):
+        instance = getattr(instance, part)
+
+    return instance() if factory else instance
+
+
+__all__ = [
+    "BackportDiagnostic",
+    "diagnose_backports",
+    "load_app",
+    "measure_import_time",
+    "rebuilt_routes",
+]
@@ -0,0 +1,233 @@
+from contextlib import asynccontextmanager
+from copy import copy
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple, Union
+
+from starlette._utils import get_route_path
+from starlette.routing import BaseRoute, Mount, Route, Router, WebSocketRoute
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+_ANY_KEY = "*"
+_WEBSOCKET_KEY = "websocket"
+
+
+def _scope_key(scope: Scope) -> str:
+    if scope["type"] == "http":
+        return scope["method"]
+
+    return _WEBSOCKET_KEY
+
+
+def _first_segment(path: str) -> str:
+    return path[1:].partition("/")[0]
+
+
+def _route_keys(route: BaseRoute) -> Set[str]:
+    # keys for which the route is able to produce a full match
+    if isinstance(route, Route):
+        return set(route.methods) if route.methods else {_ANY_KEY}
+    if isinstance(route, WebSocketRoute):
+        return {_WEBSOCKET_KEY}
+
+    return {_ANY_KEY}
+
+
+def _route_static_path(route: BaseRoute) -> Optional[str]:
+    if isinstance(route, (Route, WebSocketRoute)) and not route.param_convertors:
+        return route.path
+
+    return None
+
+
+def _route_prefix_segment(route: BaseRoute) -> Optional[str]:
+    if not isinstance(route, (Route, WebSocketRoute, Mount)):
+        return None
+
+    path = route.path
+    if not path.startswith("/"):
+        return None
+
+    segment, sep, _ = path[1:].partition("/")
+    if "{" in segment or not (sep or isinstance(route, Mount)):
+        return None
+
+    return segment
+
+
+def _redirect_path(path: str) -> Optional[str]:
+    # the path redirect_slashes retries when nothing matches
+    if path == "/":
+        return None
+
+    return path[:-1] if path.endswith("/") else path + "/"
+
+
+_Entry = Tuple[BaseRoute, Set[str], Optional[str], Optional[str]]
+
+
+class _FrozenRoutes:
+    def __init__(self, router: Router) -> None:
+        self.router = router
+        self.app = router.app
+
+        self._views: Dict[Tuple[int, ...], Router] = {}
+        self._static: Dict[Tuple[str, str], Router] = {}
+        self._prefixed: Dict[Tuple[str, str], Router] = {}
+        self._wildcard: Dict[str, Router] = {}
+
+        self._build()
+
+    def _view(self, routes: List[BaseRoute]) -> Router:
+        ids = tuple(id(route) for route in routes)
+
+        try:
+            return self._views[ids]
+        except KeyError:
+            pass
+
+        view = copy(self.router)
+        view.routes = routes
+
+        self._views[ids] = view
+        return view
+
+    def _build(self) -> None:
+        entries: List[_Entry] = [
+            (route, _route_keys(route), _route_static_path(route), _route_prefix_segment(route))
+            for route in self.router.routes
+        ]
+
+        keys = {key for _, route_keys, _, _ in entries for key in route_keys} - {_ANY_KEY}
+
+        for key in keys:
+            applicable = [entry for entry in entries if not entry[1].isdisjoint((key, _ANY_KEY))]
+            # routes of other methods can only match partially, they are kept after the applicable ones
+            # so a view answers 405 like the original router without slowing down full matches
+            others = [
+                entry
+                for entry in entries
+                if key != _WEBSOCKET_KEY and isinstance(entry[0], Route) and entry[1].isdisjoint((key, _ANY_KEY))
+            ]
+            self._build_key(key, applicable, others)
+
+    def _build_key(self, key: str, applicable: List[_Entry], others: List[_Entry]) -> None:
+        static_paths = {static for _, _, static, _ in applicable + others if static is not None}
+        # requests redirect_slashes would send to a static route are indexed as well
+        static_paths |= {redirect for redirect in map(_redirect_path, static_paths) if redirect is not None}
+        segments = {segment for _, _, static, segment in applicable + others if static is None and segment is not None}
+
+        for path in static_paths:
+            segment = _first_segment(path)
+            candidates = {path, _redirect_path(path)}
+            self._static[key, path] = self._view(
+                [
+                    route
+                    for route, _, static, route_segment in applicable
+                    if static in candidates or (static is None and route_segment in (segment, None))
+                ]
+                + [
+                    route
+                    for route, _, static, route_segment in others
+                    if static == path or (static is None and route_segment in (segment, None))
+                ]
+            )
+
+        for segment in segments:
+            self._prefixed[key, segment] = self._view(
+                [
+                    route
+                    for route, _, static, route_segment in applicable + others
+                    if static is None and route_segment in (segment, None)
+                ]
+            )
+
+        self._wildcard[key] = self._view(
+            [
+                route
+                for route, _, static, route_segment in applicable + others
+                if static is None and route_segment is None
+            ]
+        )
+
+    def _lookup(self, scope: Scope) -> Optional[Router]:
+        key = _scope_key(scope)
+        path = get_route_path(scope)
+
+        view = self._static.get((key, path))
+        if view is None:
+            view = self._prefixed.get((key, _first_segment(path)))
+        if view is None:
+            view = self._wildcard.get(key)
+
+        return view
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "lifespan":
+            await self.app(scope, receive, send)
+            return
+
+        view = self._lookup(scope)
+        if view is None:
+            await self.app(scope, receive, send)
+            return
+
+        if "router" not in scope:
+            scope["router"] = self.router
+
+        # routes outside the view can neither match nor redirect, so a miss goes straight to view.default
+        await view.app(scope, receive, send)
+
+
+def _get_router(app: Any) -> Router:
+    return getattr(app, "router", app)
+
+
+def _replace_stack_app(stack: ASGIApp, old: ASGIApp, new: ASGIApp) -> ASGIApp:
+    if stack == old:
+        return new
+
+    node: Any = stack
+    while getattr(node, "app", None) is not None:
+        if node.app == old:
+            node.app = new
+            return stack
+
+        node = node.app
+
+    raise RuntimeError("Unable to locate router app inside of router middleware stack")
+
+
+def freeze_routes(app: Union[Router, Any]) -> None:
+    router = _get_router(app)
+
+    unfreeze_routes(router)
+
+    frozen = _FrozenRoutes(router)
+    router.middleware_stack = _replace_stack_app(router.middleware_stack, frozen.app, frozen)
+    router._frozen_routes = frozen  # type: ignore[ty:unresolved-attribute]
+
+
+def unfreeze_routes(app: Union[Router, Any]) -> None:
+    router = _get_router(app)
+
+    frozen: Optional[_FrozenRoutes] = getattr(router, "_frozen_routes", None)
+    if frozen is None:
+        return
+
+    router.middleware_stack = _replace_stack_app(router.middleware_stack, frozen, frozen.app)
+    router._frozen_routes = None  # type: ignore[ty:unresolved-attribute]
+
+
+@asynccontextmanager
+async def frozen_routes_lifespan(app: Any) -> AsyncIterator[None]:
+    freeze_routes(app)
+    try:
+        yield
+    finally:
+        unfreeze_routes(app)
+
+
+__all__ = [
+    "freeze_routes",
+    "frozen_routes_lifespan",
+    "unfreeze_routes",
+]
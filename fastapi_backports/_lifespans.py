@@ -0,0 +1,306 @@
+import logging
+import threading
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Mapping, Optional, Tuple
+from weakref import WeakKeyDictionary
+
+import anyio
+from anyio.abc import TaskGroup, TaskStatus
+from fastapi import params
+from fastapi.exceptions import FastAPIError
+from starlette.requests import HTTPConnection
+from starlette.types import Lifespan
+
+logger = logging.getLogger("fastapi_backports")
+
+
+@dataclass
+class LifespanTiming:
+    name: str
+    startup: Optional[float] = None
+    shutdown: Optional[float] = None
+    timed_out: bool = False
+
+
+_TIMINGS: "WeakKeyDictionary[Any, Dict[TimedLifespan, LifespanTiming]]" = WeakKeyDictionary()
+# applications may be started from several threads, each with its own event loop
+_TIMINGS_LOCK = threading.Lock()
+
+
+def get_lifespan_timings(app: Any) -> List[LifespanTiming]:
+    with _TIMINGS_LOCK:
+        return list(_TIMINGS.get(app, {}).values())
+
+
+class TimedLifespan:
+    def __init__(
+        self,
+        lifespan: Lifespan,
+        *,
+        startup_timeout: Optional[float] = None,
+        shutdown_timeout: Optional[float] = None,
+        name: Optional[str] = None,
+    ) -> None:
+        self.lifespan = lifespan
+        self.startup_timeout = startup_timeout
+        self.shutdown_timeout = shutdown_timeout
+        self.name = name or getattr(lifespan, "__qualname__", None) or repr(lifespan)
+
+    def _timing(self, app: Any) -> LifespanTiming:
+        timing = LifespanTiming(self.name)
+        with _TIMINGS_LOCK:
+            _TIMINGS.setdefault(app, {})[self] = timing
+        return timing
+
+    def _started(self, timing: LifespanTiming, started_at: float) -> None:
+        timing.startup = perf_counter() - started_at
+        logger.info("Lifespan %s started in %.3fs", self.name, timing.startup)
+
+    def _stopped(self, timing: LifespanTiming, stopped_at: float) -> None:
+        timing.shutdown = perf_counter() - stopped_at
+        if timing.timed_out:
+            logger.warning("Lifespan %s did not shut down within %ss, abandoned", self.name, self.shutdown_timeout)
+        else:
+            logger.info("Lifespan %s shut down in %.3fs", self.name, timing.shutdown)
+
+    def __call__(self, app: Any) -> Any:
+        if self.startup_timeout is None and self.shutdown_timeout is None:
+            return self._run(app)
+
+        return self._run_with_timeouts(app)
+
+    @asynccontextmanager
+    async def _run(self, app: Any) -> AsyncIterator[Optional[Mapping[str, Any]]]:
+        timing = self._timing(app)
+
+        started_at = perf_counter()
+        async with self.lifespan(app) as state:
+            self._started(timing, started_at)
+            try:
+                yield state
+            finally:
+                stopped_at = perf_counter()
+
+        self._stopped(timing, stopped_at)
+
+    @asynccontextmanager
+    async def _run_with_timeouts(self, app: Any) -> AsyncIterator[Optional[Mapping[str, Any]]]:
+        # the lifespan runs in its own task so it can be cancelled without breaking cancel scopes it opens
+        timing = self._timing(app)
+
+        entered = anyio.Event()
+        exited = anyio.Event()
+        stop = anyio.Event()
+        states: List[Optional[Mapping[str, Any]]] = []
+        errors: List[Exception] = []
+
+        async def run() -> None:
+            try:
+                async with self.lifespan(app) as state:
+                    states.append(state)
+                    entered.set()
+                    await stop.wait()
+            except Exception as exc:  # noqa: BLE001
+                errors.append(exc)
+            finally:
+                entered.set()
+                exited.set()
+
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(run)
+
+            started_at = perf_counter()
+            with anyio.move_on_after(self.startup_timeout):
+                await entered.wait()
+
+            if not entered.is_set():
+                timing.timed_out = True
+                tg.cancel_scope.cancel()
+            elif states:
+                self._started(timing, started_at)
+                try:
+                    yield states[0]
+                except Exception as exc:  # noqa: BLE001
+                    # re-raised outside of the task group, so it doesn't get wrapped in an exception group
+                    errors.insert(0, exc)
+                finally:
+                    stopped_at = perf_counter()
+                    stop.set()
+                    with anyio.move_on_after(self.shutdown_timeout):
+                        await exited.wait()
+
+                    if not exited.is_set():
+                        timing.timed_out = True
+                        tg.cancel_scope.cancel()
+
+                    self._stopped(timing, stopped_at)
+
+        if errors:
+            raise errors[0]
+
+        if not states:
+            msg = f"Lifespan {self.name} did not start within {self.startup_timeout}s"
+            raise TimeoutError(msg)
+
+
+class LifespanCell:
+    def __init__(self, lifespan: Lifespan, app: Any) -> None:
+        self.lifespan = lifespan
+        self.app = app
+        self.name = getattr(lifespan, "name", None) or repr(lifespan)
+
+        self.entered = False
+        self.state: Mapping[str, Any] = {}
+
+        self._task_group: Optional[TaskGroup] = None
+        self._lock: Optional[anyio.Lock] = None
+        self._stop: Optional[anyio.Event] = None
+
+    @asynccontextmanager
+    async def enter(self) -> AsyncIterator[Optional[Mapping[str, Any]]]:
+        async with self.lifespan(self.app) as state:
+            self.state = state or {}
+            self.entered = True
+            try:
+                yield state
+            finally:
+                self.entered = False
+                self.state = {}
+
+    @asynccontextmanager
+    async def guard(self) -> AsyncIterator[None]:
+        # owns the task group lazily entered lifespans run in, so they are still exited on shutdown
+        error: Optional[Exception] = None
+
+        async with anyio.create_task_group() as tg:
+            self._task_group = tg
+            self._lock = anyio.Lock()
+            self._stop = anyio.Event()
+            try:
+                yield None
+            except Exception as exc:  # noqa: BLE001
+                error = exc
+            finally:
+                self._task_group = None
+                self._stop.set()
+
+        if error is not None:
+            raise error
+
+    async def _run(self, stop: anyio.Event, *, task_status: TaskStatus) -> None:
+        async with self.enter():
+            task_status.started()
+            await stop.wait()
+
+    async def get(self) -> Mapping[str, Any]:
+        if self.entered:
+            return self.state
+
+        if self._task_group is None or self._lock is None or self._stop is None:
+            msg = f"Lifespan {self.name} is not running"
+            raise RuntimeError(msg)
+
+        async with self._lock:
+            if not self.entered:
+                await self._task_group.start(self._run, self._stop)
+
+        return self.state
+
+
+# cells are kept in the state of the application they run for, so applications sharing a lifespan,
+# e.g. through a router included in each of them, get their own resources
+_CELLS_STATE_KEY = "fastapi_backports_lifespan_cells"
+_CELLS_LOCK = threading.Lock()
+
+
+def _app_cells(app: Any) -> Dict[Lifespan, LifespanCell]:
+    cells = getattr(app.state, _CELLS_STATE_KEY, None)
+    if cells is None:
+        with _CELLS_LOCK:
+            cells = getattr(app.state, _CELLS_STATE_KEY, None)
+            if cells is None:
+                cells = {}
+                setattr(app.state, _CELLS_STATE_KEY, cells)
+
+    return cells
+
+
+def register_lifespan(
+    lifespan: Lifespan,
+    timed: Lifespan,
+    *,
+    lazy: bool = False,
+    request_state: bool = True,
+) -> Lifespan:
+    # the returned lifespan creates the cell of the application it is entered for
+    @asynccontextmanager
+    async def run(app: Any) -> AsyncIterator[Any]:
+        cell = LifespanCell(timed, app)
+        _app_cells(app)[lifespan] = cell
+
+        async with cell.guard() if lazy else cell.enter() as state:
+            # without request state, starlette doesn't copy the values into the state of every request
+            yield state if request_state else None
+
+    return run
+
+
+def lifespan_cell(app: Any, lifespan: Lifespan) -> LifespanCell:
+    cell = _app_cells(app).get(lifespan)
+    if cell is None:
+        name = getattr(lifespan, "__qualname__", None) or repr(lifespan)
+        msg = f"Lifespan {name} was not added with `add_lifespan` or the application is not running"
+        raise FastAPIError(msg)
+
+    return cell
+
+
+def lifespan_state(lifespan: Lifespan) -> Callable[..., Awaitable[Mapping[str, Any]]]:
+    async def dependency(connection: HTTPConnection) -> Mapping[str, Any]:
+        return await lifespan_cell(connection.app, lifespan).get()
+
+    return dependency
+
+
+def _resource(cell: LifespanCell, state: Mapping[str, Any], key: Optional[str]) -> Any:
+    if key is not None:
+        return state[key]
+
+    if len(state) != 1:
+        msg = f"Lifespan {cell.name} yields {len(state)} values, a key is required to select one"
+        raise FastAPIError(msg)
+
+    return next(iter(state.values()))
+
+
+def LifespanResource(lifespan: Lifespan, key: Optional[str] = None, *, use_cache: bool = True) -> Any:
+    # the value is resolved once for the running application, later requests only check it is still running
+    bound: Tuple[Any, Optional[LifespanCell], Any] = (None, None, None)
+
+    async def dependency(connection: HTTPConnection) -> Any:
+        nonlocal bound
+
+        app, cell, value = bound
+        if connection.app is app and cell is not None and cell.entered:
+            return value
+
+        cell = lifespan_cell(connection.app, lifespan)
+        value = _resource(cell, cell.state if cell.entered else await cell.get(), key)
+        bound = (connection.app, cell, value)
+        return value
+
+    return params.Depends(dependency, use_cache=use_cache)
+
+
+__all__ = [
+    "LifespanCell",
+    "LifespanResource",
+    "LifespanTiming",
+    "TimedLifespan",
+    "get_lifespan_timings",
+    "lifespan_cell",
+    "lifespan_state",
+    "register_lifespan",
+]
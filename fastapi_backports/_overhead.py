@@ -0,0 +1,322 @@
+import threading
+import tracemalloc
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from time import perf_counter
+from typing import TYPE_CHECKING, Any, AsyncIterator, Callable, Dict, List, Optional, Sequence, Tuple, Type
+
+import anyio
+import anyio.to_thread
+from starlette.types import Message
+
+from ._backporter import _BACKPORTERS, _LOCK, _run_backports, backported, load_backporter, revert
+from ._patching import scoped_mode, scoped_patching
+
+if TYPE_CHECKING:
+    from ._backports import BaseBackporter
+
+BenchmarkRequest = Tuple[str, str, bytes]
+
+
+@dataclass(frozen=True)
+class OverheadMeasurement:
+    startup: float
+    request_latency: float
+    memory: int
+    error: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class BackportOverhead:
+    label: str
+    baseline: OverheadMeasurement
+    backported: OverheadMeasurement
+
+    @property
+    def startup_delta(self) -> float:
+        return self.backported.startup - self.baseline.startup
+
+    @property
+    def request_latency_delta(self) -> float:
+        return self.backported.request_latency - self.baseline.request_latency
+
+    @property
+    def memory_delta(self) -> int:
+        return self.backported.memory - self.baseline.memory
+
+
+async def _request(app: Any, state: Dict[str, Any], method: str, url: str, body: bytes) -> None:
+    path, _, query = url.partition("?")
+    headers = [(b"host", b"testserver"), (b"content-length", str(len(body)).encode())]
+    if body:
+        headers.append((b"content-type", b"application/json"))
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query.encode(),
+        "root_path": "",
+        "headers": headers,
+        "client": ("testclient", 50000),
+        "server": ("testserver", 80),
+        "state": state.copy(),
+    }
+
+    async def receive() -> Message:
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(_: Message) -> None:
+        pass
+
+    await app(scope, receive, send)
+
+
+@asynccontextmanager
+async def _lifespan(app: Any) -> AsyncIterator[Dict[str, Any]]:
+    # driven through the ASGI lifespan protocol like servers do, so middleware and lifespan state take part
+    state: Dict[str, Any] = {}
+    started, stopping, stopped = anyio.Event(), anyio.Event(), anyio.Event()
+    errors: List[BaseException] = []
+    failures: List[str] = []
+
+    async def receive() -> Message:
+        if not started.is_set():
+            return {"type": "lifespan.startup"}
+
+        await stopping.wait()
+        return {"type": "lifespan.shutdown"}
+
+    async def send(message: Message) -> None:
+        if message["type"].endswith(".failed"):
+            failures.append(message.get("message", ""))
+
+        (started if message["type"].startswith("lifespan.startup") else stopped).set()
+
+    async def run() -> None:
+        try:
+            await app(
+                {"type": "lifespan", "asgi": {"version": "3.0", "spec_version": "2.0"}, "state": state}, receive, send
+            )
+        except Exception as exc:  # noqa: BLE001
+            errors.append(exc)
+        finally:
+            started.set()
+            stopped.set()
+
+    async with anyio.create_task_group() as task_group:
+        task_group.start_soon(run)
+        await started.wait()
+
+        if not errors and not failures:
+            try:
+                yield state
+            except Exception as exc:  # noqa: BLE001
+                # raised once the application is shut down, instead of from the task group
+                errors.append(exc)
+            finally:
+                stopping.set()
+                await stopped.wait()
+
+    if errors:
+        raise errors[0]
+    if failures:
+        raise RuntimeError(failures[0])
+
+
+async def _measure(
+    app_factory: Callable[[], Any],
+    requests: Sequence[BenchmarkRequest],
+    iterations: int,
+) -> OverheadMeasurement:
+    started_at = perf_counter()
+    app = app_factory()
+
+    async with _lifespan(app) as state:
+        startup = perf_counter() - started_at
+
+        # traced separately, tracing slows down both startup and requests
+        tracemalloc.start()
+        try:
+            app_factory()
+            memory, _ = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        started_at = perf_counter()
+        for _ in range(iterations):
+            for method, url, body in requests:
+                await _request(app, state, method, url, body)
+
+        total = iterations * len(requests)
+        latency = (perf_counter() - started_at) / total if total else 0.0
+
+    return OverheadMeasurement(startup=startup, request_latency=latency, memory=memory)
+
+
+def _measure_safely(
+    app_factory: Callable[[], Any],
+    requests: Sequence[BenchmarkRequest],
+    iterations: int,
+) -> OverheadMeasurement:
+    try:
+        return anyio.run(_measure, app_factory, requests, iterations)
+    except Exception as exc:  # noqa: BLE001
+        return OverheadMeasurement(startup=0.0, request_latency=0.0, memory=0, error=repr(exc))
+
+
+def measure_backport_overhead(
+    app_factory: Callable[[], Any],
+    requests: Sequence[BenchmarkRequest],
+    *,
+    backports: Optional[Sequence[str]] = None,
+    iterations: int = 100,
+    isolated: bool = True,
+) -> List[BackportOverhead]:
+    def measure(selected: Sequence[Type["BaseBackporter"]]) -> OverheadMeasurement:
+        _run_backports(selected)
+        try:
+            return _measure_safely(app_factory, requests, iterations)
+        finally:
+            revert(selected)
+
+    # isolated backports are measured on their own against the application built without any backport,
+    # otherwise every backport is measured against the application built with all the others
+    with _LOCK:
+        applied, scoped = backported(), scoped_mode()
+        candidates: List[Type["BaseBackporter"]] = [
+            backporter
+            for backporter in map(load_backporter, _BACKPORTERS if backports is None else backports)
+            if backporter.needs_backport()
+        ]
+
+        results = []
+        try:
+            revert()
+            common = measure([] if isolated else candidates)
+
+            for backporter in candidates:
+                if isolated:
+                    baseline, measurement = common, measure([backporter])
+                else:
+                    baseline, measurement = measure([other for other in candidates if other is not backporter]), common
+
+                results.append(BackportOverhead(label=backporter.label(), baseline=baseline, backported=measurement))
+        finally:
+            # reverting every backport also removed the scoped mode hook
+            with scoped_patching(scoped=scoped):
+                _run_backports(applied)
+
+    return results
+
+
+@dataclass(frozen=True)
+class ThroughputMeasurement:
+    threads: int
+    requests: int
+    duration: float
+
+    @property
+    def requests_per_second(self) -> float:
+        return self.requests / self.duration if self.duration else 0.0
+
+
+def _serve(
+    app: Any,
+    state: Dict[str, Any],
+    started: threading.Event,
+    stop: threading.Event,
+    errors: List[Exception],
+) -> None:
+    async def serve() -> None:
+        async with _lifespan(app) as lifespan_state:
+            state.update(lifespan_state)
+            started.set()
+            await anyio.to_thread.run_sync(stop.wait)
+
+    try:
+        anyio.run(serve)
+    except Exception as exc:  # noqa: BLE001
+        errors.append(exc)
+    finally:
+        started.set()
+
+
+def _run_requests(
+    app: Any,
+    state: Dict[str, Any],
+    requests: Sequence[BenchmarkRequest],
+    iterations: int,
+    barrier: threading.Barrier,
+) -> None:
+    async def run() -> None:
+        for _ in range(iterations):
+            for method, url, body in requests:
+                await _request(app, state, method, url, body)
+
+    barrier.wait()
+    anyio.run(run)
+
+
+def measure_threaded_throughput(
+    app: Any,
+    requests: Sequence[BenchmarkRequest],
+    *,
+    threads: Sequence[int] = (1, 2, 4, 8),
+    iterations: int = 1000,
+) -> List[ThroughputMeasurement]:
+    # the application is started once and shared by every thread, each one running its own event loop,
+    # the way threaded servers run it, throughput only grows with threads on free-threaded Python
+    started, stop = threading.Event(), threading.Event()
+    state: Dict[str, Any] = {}
+    errors: List[Exception] = []
+    server = threading.Thread(target=_serve, args=(app, state, started, stop, errors), daemon=True)
+    server.start()
+    started.wait()
+
+    if errors:
+        server.join()
+        raise errors[0]
+
+    results = []
+    try:
+        for count in threads:
+            barrier = threading.Barrier(count + 1)
+            workers = [
+                threading.Thread(target=_run_requests, args=(app, state, requests, iterations, barrier))
+                for _ in range(count)
+            ]
+            for worker in workers:
+                worker.start()
+
+            barrier.wait()
+            started_at = perf_counter()
+            for worker in workers:
+                worker.join()
+
+            results.append(
+                ThroughputMeasurement(
+                    threads=count,
+                    requests=count * iterations * len(requests),
+                    duration=perf_counter() - started_at,
+                )
+            )
+    finally:
+        stop.set()
+        server.join()
+
+    return results
+
+
+__all__ = [
+    "BackportOverhead",
+    "BenchmarkRequest",
+    "OverheadMeasurement",
+    "ThroughputMeasurement",
+    "measure_backport_overhead",
+    "measure_threaded_throughput",
+]
@@ -0,0 +1,187 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from types import FunctionType
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+_MISSING = object()
+
+_ENABLED: ContextVar[bool] = ContextVar("fastapi_backports_enabled", default=False)
+
+_scoped = False
+
+_APP_HOOK_LABEL = "scoped_patching"
+
+
+class _Patch(NamedTuple):
+    target: Any
+    name: str
+    previous: Any
+    installed: Any
+
+
+_PATCHES: Dict[str, List[_Patch]] = {}
+_recording: Optional[List[_Patch]] = None
+
+
+def _dispatch(patched: Callable[..., Any], original: Callable[..., Any]) -> Callable[..., Any]:
+    @wraps(patched)
+    def dispatcher(*args: Any, **kwargs: Any) -> Any:
+        if _ENABLED.get():
+            return patched(*args, **kwargs)
+
+        return original(*args, **kwargs)
+
+    return dispatcher
+
+
+def _unavailable(name: str) -> Callable[..., Any]:
+    def unavailable(*_: Any, **__: Any) -> Any:
+        msg = f"{name} is only available while backports are enabled"
+        raise AttributeError(msg)
+
+    return unavailable
+
+
+def patch(target: Any, name: str, value: Any) -> None:
+    # in scoped mode, functions are only replaced while backports are enabled
+    original = getattr(target, name, _MISSING)
+    if _scoped and isinstance(value, FunctionType):
+        if isinstance(original, FunctionType):
+            value = _dispatch(value, original)
+        elif original is _MISSING:
+            value = _dispatch(value, _unavailable(name))
+
+    if _recording is not None:
+        _recording.append(_Patch(target, name, vars(target).get(name, _MISSING), value))
+
+    setattr(target, name, value)
+
+
+@contextmanager
+def recording_patches(label: str) -> Iterator[None]:
+    global _recording  # noqa: PLW0603
+
+    patches: List[_Patch] = []
+    previous, _recording = _recording, patches
+    try:
+        yield
+    finally:
+        _recording = previous
+        _PATCHES.setdefault(label, []).extend(patches)
+
+
+def revert_patches(label: str) -> None:
+    patches = _PATCHES.get(label, [])
+
+    for target, name, _, installed in patches:
+        if vars(target).get(name, _MISSING) is not installed:
+            msg = f"{target.__name__}.{name} was patched again after {label!r}, revert that backport first"
+            raise RuntimeError(msg)
+
+    for target, name, previous, _ in reversed(patches):
+        if previous is _MISSING:
+            delattr(target, name)
+        else:
+            setattr(target, name, previous)
+
+    _PATCHES.pop(label, None)
+
+
+def patched_original(target: Any, name: str, installed: Any) -> Any:
+    # the value replaced by `installed`, resolved when called so reverted and re-applied patches are followed
+    for patches in _PATCHES.values():
+        for patched in patches:
+            if (
+                patched.target is target
+                and patched.name == name
+                and installed in (patched.installed, getattr(patched.installed, "__wrapped__", None))
+                and patched.previous is not _MISSING
+            ):
+                return patched.previous
+
+    return getattr(target, name)
+
+
+def has_patches(label: str) -> bool:
+    return label in _PATCHES
+
+
+def revert_all_patches() -> None:
+    for label in reversed(list(_PATCHES)):
+        revert_patches(label)
+
+
+class _BackportsEnabledMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        token = _ENABLED.set(True)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _ENABLED.reset(token)
+
+
+def _install_app_hook() -> None:
+    if _APP_HOOK_LABEL in _PATCHES:
+        return
+
+    from fastapi import FastAPI
+
+    original_init = FastAPI.__init__
+
+    @wraps(original_init)
+    def __init__(self: FastAPI, *args: Any, **kwargs: Any) -> None:  # noqa: N807
+        original_init(self, *args, **kwargs)
+
+        # applications created with backports enabled also handle their requests with backports enabled
+        if _ENABLED.get():
+            self.add_middleware(_BackportsEnabledMiddleware)
+
+    with recording_patches(_APP_HOOK_LABEL):
+        patch(FastAPI, "__init__", __init__)
+
+
+def scoped_mode() -> bool:
+    # scoped mode stays in effect once a scoped backport installed the application hook
+    return has_patches(_APP_HOOK_LABEL)
+
+
+@contextmanager
+def scoped_patching(*, scoped: bool) -> Iterator[None]:
+    global _scoped  # noqa: PLW0603
+
+    if scoped:
+        _install_app_hook()
+
+    previous, _scoped = _scoped, scoped
+    try:
+        yield
+    finally:
+        _scoped = previous
+
+
+@contextmanager
+def backports_enabled() -> Iterator[None]:
+    token = _ENABLED.set(True)
+    try:
+        yield
+    finally:
+        _ENABLED.reset(token)
+
+
+__all__ = [
+    "backports_enabled",
+    "has_patches",
+    "patch",
+    "patched_original",
+    "recording_patches",
+    "revert_all_patches",
+    "revert_patches",
+    "scoped_mode",
+    "scoped_patching",
+]
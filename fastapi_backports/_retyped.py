@@ -1,9 +1,10 @@
 from __future__ import annotations
 
 from enum import Enum
-from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Sequence, Set, Type, TypeVar, Union
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Sequence, Set, Type, TypeVar, Union, overload
 
 from fastapi import params
+from fastapi._compat import ModelField
 from fastapi.applications import FastAPI as _FastAPI
 from fastapi.datastructures import Default, DefaultPlaceholder
 from fastapi.routing import APIRoute as _APIRoute
@@ -47,6 +48,7 @@ if TYPE_CHECKING:
             openapi_extra: Optional[Dict[str, Any]] = None,
             generate_unique_id_function: Callable[[APIRoute], str] = Default(generate_unique_id),
             middleware: Optional[Sequence[Middleware]] = None,
+            trust_response: bool = False,
         ) -> Callable[[DecoratedCallable], DecoratedCallable]:
             pass
 
@@ -77,6 +79,7 @@ if TYPE_CHECKING:
             openapi_extra: Optional[Dict[str, Any]] = None,
             generate_unique_id_function: Callable[[APIRoute], str] = Default(generate_unique_id),
             middleware: Optional[Sequence[Middleware]] = None,
+            trust_response: bool = False,
         ) -> Callable[[DecoratedCallable], DecoratedCallable]:
             pass
 
@@ -107,6 +110,7 @@ if TYPE_CHECKING:
             openapi_extra: Optional[Dict[str, Any]] = None,
             generate_unique_id_function: Callable[[APIRoute], str] = Default(generate_unique_id),
             middleware: Optional[Sequence[Middleware]] = None,
+            trust_response: bool = False,
         ) -> Callable[[DecoratedCallable], DecoratedCallable]:
             pass
 
@@ -137,6 +141,7 @@ if TYPE_CHECKING:
             openapi_extra: Optional[Dict[str, Any]] = None,
             generate_unique_id_function: Callable[[APIRoute], str] = Default(generate_unique_id),
             middleware: Optional[Sequence[Middleware]] = None,
+            trust_response: bool = False,
         ) -> Callable[[DecoratedCallable], DecoratedCallable]:
             pass
 
@@ -167,6 +172,7 @@ if TYPE_CHECKING:
             openapi_extra: Optional[Dict[str, Any]] = None,
             generate_unique_id_function: Callable[[APIRoute], str] = Default(generate_unique_id),
             middleware: Optional[Sequence[Middleware]] = None,
+            trust_response: bool = False,
         ) -> Callable[[DecoratedCallable], DecoratedCallable]:
             pass
 
@@ -197,6 +203,7 @@ if TYPE_CHECKING:
             openapi_extra: Optional[Dict[str, Any]] = None,
             generate_unique_id_function: Callable[[APIRoute], str] = Default(generate_unique_id),
             middleware: Optional[Sequence[Middleware]] = None,
+            trust_response: bool = False,
         ) -> Callable[[DecoratedCallable], DecoratedCallable]:
             pass
 
@@ -227,6 +234,7 @@ if TYPE_CHECKING:
             openapi_extra: Optional[Dict[str, Any]] = None,
             generate_unique_id_function: Callable[[APIRoute], str] = Default(generate_unique_id),
             middleware: Optional[Sequence[Middleware]] = None,
+            trust_response: bool = False,
         ) -> Callable[[DecoratedCallable], DecoratedCallable]:
             pass
 
@@ -257,6 +265,7 @@ if TYPE_CHECKING:
             openapi_extra: Optional[Dict[str, Any]] = None,
             generate_unique_id_function: Callable[[APIRoute], str] = Default(generate_unique_id),
             middleware: Optional[Sequence[Middleware]] = None,
+            trust_response: bool = False,
         ) -> Callable[[DecoratedCallable], DecoratedCallable]:
             pass
 
@@ -287,6 +296,7 @@ if TYPE_CHECKING:
             openapi_extra: Optional[Dict[str, Any]] = None,
             generate_unique_id_function: Callable[[APIRoute], str] = Default(generate_unique_id),
             middleware: Optional[Sequence[Middleware]] = None,
+            trust_response: bool = False,
         ) -> Callable[[DecoratedCallable], DecoratedCallable]:
             pass
 
@@ -304,6 +314,7 @@ if TYPE_CHECKING:
             include_in_schema: bool = True,
             generate_unique_id_function: Callable[[APIRoute], str] = Default(generate_unique_id),
             middleware: Optional[Sequence[Middleware]] = None,
+            trust_response: bool = False,
         ) -> None:
             pass
 
@@ -339,6 +350,7 @@ if TYPE_CHECKING:
                 generate_unique_id
             ),
             middleware: Optional[Sequence[Middleware]] = None,
+            trust_response: bool = False,
         ) -> None:
             pass
 
@@ -370,6 +382,7 @@ if TYPE_CHECKING:
             openapi_extra: Optional[Dict[str, Any]] = None,
             generate_unique_id_function: Callable[[APIRoute], str] = Default(generate_unique_id),
             middleware: Optional[Sequence[Middleware]] = None,
+            trust_response: bool = False,
         ) -> Callable[[DecoratedCallable], DecoratedCallable]:
             pass
 
@@ -396,11 +409,48 @@ if TYPE_CHECKING:
 
         _TLifespan = TypeVar("_TLifespan", bound=Lifespan)
 
-        def add_lifespan(self, lifespan: _TLifespan) -> _TLifespan:
+        @overload
+        def add_lifespan(
+            self,
+            lifespan: _TLifespan,
+            *,
+            depends_on: Optional[Sequence[Lifespan]] = None,
+            startup_timeout: Optional[float] = None,
+            shutdown_timeout: Optional[float] = None,
+            lazy: bool = False,
+            request_state: bool = True,
+        ) -> _TLifespan:
+            pass
+
+        @overload
+        def add_lifespan(
+            self,
+            *,
+            depends_on: Optional[Sequence[Lifespan]] = None,
+            startup_timeout: Optional[float] = None,
+            shutdown_timeout: Optional[float] = None,
+            lazy: bool = False,
+            request_state: bool = True,
+        ) -> Callable[[_TLifespan], _TLifespan]:
+            pass
+
+        def add_lifespan(
+            self,
+            lifespan: Optional[_TLifespan] = None,
+            *,
+            depends_on: Optional[Sequence[Lifespan]] = None,
+            startup_timeout: Optional[float] = None,
+            shutdown_timeout: Optional[float] = None,
+            lazy: bool = False,
+            request_state: bool = True,
+        ) -> Union[_TLifespan, Callable[[_TLifespan], _TLifespan]]:
             pass
 
     class APIRoute(_APIRoute):
         middleware: Optional[Sequence[Middleware]]
+        trust_response: bool
+        stream_item_type: Optional[Any]
+        stream_item_field: Optional[ModelField]
 
         @override
         def __init__(
@@ -435,6 +485,7 @@ if TYPE_CHECKING:
                 generate_unique_id
             ),
             middleware: Optional[Sequence[Middleware]] = None,
+            trust_response: bool = False,
         ) -> None:
             pass
 
@@ -457,6 +508,7 @@ if TYPE_CHECKING:
 
     class APIRouter(_CommonRouterMethodsMixin, _APIRouter):  # type: ignore[ty:invalid-method-override]
         middleware: Optional[Sequence[Middleware]]
+        trust_response: bool
 
         @override
         def __init__(
@@ -482,6 +534,7 @@ if TYPE_CHECKING:
             include_in_schema: bool = True,
             generate_unique_id_function: Callable[[APIRoute], str] = Default(generate_unique_id),
             middleware: Optional[Sequence[Middleware]] = None,
+            trust_response: bool = False,
         ) -> None:
             pass
 
@@ -0,0 +1,225 @@
+import enum
+import logging
+import os
+import uuid
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from time import perf_counter
+from typing import Any, AsyncIterator, Dict, Final, FrozenSet, Iterable, List, Tuple, Union
+
+import anyio.to_thread
+from fastapi._compat import ModelField, lenient_issubclass
+from fastapi.dependencies.models import Dependant
+from fastapi.dependencies.utils import get_cached_model_fields
+from fastapi.encoders import jsonable_encoder
+from fastapi.routing import APIRoute
+from pydantic import BaseModel
+from starlette.routing import BaseRoute, Host, Mount
+from typing_extensions import Annotated, Literal, get_args, get_origin
+
+WARMUP_ENV_VAR: Final[str] = "FASTAPI_BACKPORTS_WARMUP"
+
+logger = logging.getLogger("fastapi_backports")
+
+_MAX_SAMPLE_DEPTH = 8
+
+_SCALAR_SAMPLES: Dict[Any, Any] = {
+    bool: False,
+    int: 0,
+    float: 0.0,
+    Decimal: "0",
+    str: "",
+    bytes: b"",
+    uuid.UUID: "00000000-0000-0000-0000-000000000000",
+    datetime: "2000-01-01T00:00:00",
+    date: "2000-01-01",
+    time: "00:00:00",
+    timedelta: 0,
+}
+
+_SEQUENCE_ORIGINS = frozenset({list, set, frozenset, tuple})
+
+# pydantic v1 shapes, the fields of cloned models only keep the item type
+_V1_SHAPE_SINGLETON = 1
+_V1_MAPPING_SHAPES = frozenset({4, 12, 13, 14})
+
+
+@dataclass(frozen=True)
+class RouteWarmup:
+    path: str
+    methods: FrozenSet[str]
+    fields: int
+    errors: int
+    duration: float
+
+
+def _field_annotation(field: ModelField) -> Any:
+    try:
+        return field.field_info.annotation
+    except AttributeError:
+        # pydantic v1, type_ is the item type of sequences
+        return field.outer_type_  # type: ignore[ty:unresolved-attribute]
+
+
+def _is_required(field: ModelField) -> bool:
+    try:
+        return field.field_info.is_required()
+    except AttributeError:
+        return field.required  # type: ignore[ty:unresolved-attribute]
+
+
+def _sample(annotation: Any, depth: int = 0) -> Any:  # noqa: PLR0911
+    # a minimal input, validation errors are fine since they still exercise the validator
+    if depth > _MAX_SAMPLE_DEPTH or annotation is None or annotation is type(None):
+        return None
+
+    if annotation in _SCALAR_SAMPLES:
+        return _SCALAR_SAMPLES[annotation]
+
+    origin = get_origin(annotation)
+    if origin is Annotated:
+        return _sample(get_args(annotation)[0], depth + 1)
+    if origin is Union:
+        return _sample(next((arg for arg in get_args(annotation) if arg is not type(None)), None), depth + 1)
+    if origin is Literal:
+        return get_args(annotation)[0]
+    if origin in _SEQUENCE_ORIGINS or lenient_issubclass(annotation, (list, set, frozenset, tuple)):
+        return []
+    if origin is dict or lenient_issubclass(annotation, dict):
+        return {}
+
+    if lenient_issubclass(annotation, enum.Enum):
+        return next(iter(annotation)).value
+    if lenient_issubclass(annotation, BaseModel):
+        return {
+            field.alias: _field_sample(field, depth + 1)
+            for field in get_cached_model_fields(annotation)
+            if _is_required(field)
+        }
+
+    return None
+
+
+def _field_sample(field: ModelField, depth: int = 0) -> Any:
+    shape = getattr(field, "shape", _V1_SHAPE_SINGLETON)
+    if shape in _V1_MAPPING_SHAPES:
+        return {}
+    if shape != _V1_SHAPE_SINGLETON:
+        return []
+
+    return _sample(_field_annotation(field), depth)
+
+
+def _dependant_fields(dependant: Dependant) -> Iterable[ModelField]:
+    yield from dependant.path_params
+    yield from dependant.query_params
+    yield from dependant.header_params
+    yield from dependant.cookie_params
+
+    for sub_dependant in dependant.dependencies:
+        yield from _dependant_fields(sub_dependant)
+
+
+def _route_fields(route: APIRoute) -> Iterable[Tuple[ModelField, bool]]:
+    for field in _dependant_fields(route.dependant):
+        yield field, False
+
+    if route.body_field is not None:
+        yield route.body_field, False
+
+    # the request handler serializes with the cloned field on fastapi versions that keep one
+    response_field = getattr(route, "secure_cloned_response_field", None) or route.response_field
+    if response_field is not None:
+        yield response_field, True
+
+
+def _serialize(field: ModelField, value: Any) -> Any:
+    try:
+        serialize = field.serialize
+    except AttributeError:
+        # pydantic v1 fields are serialized by fastapi's encoder
+        return jsonable_encoder(value)
+
+    return serialize(value, mode="json")
+
+
+def _warmup_field(field: ModelField, *, serialize: bool) -> bool:
+    # a failing field is counted as an error, warmup never aborts startup
+    try:
+        value, errors = field.validate(_field_sample(field), {}, loc=("warmup",))
+        if errors:
+            return False
+
+        if serialize:
+            _serialize(field, value)
+    except Exception:
+        logger.debug("Warmup of field %s failed", field.name, exc_info=True)
+        return False
+
+    return True
+
+
+def _api_routes(routes: Iterable[BaseRoute], prefix: str = "") -> Iterable[Tuple[str, APIRoute]]:
+    for route in routes:
+        if isinstance(route, APIRoute):
+            yield prefix + route.path_format, route
+        elif isinstance(route, Mount):
+            yield from _api_routes(route.routes, prefix + route.path)
+        elif isinstance(route, Host):
+            yield from _api_routes(route.routes, prefix)
+
+
+def warmup_routes(app: Any) -> List[RouteWarmup]:
+    results = []
+
+    for path, route in _api_routes(app.router.routes):
+        fields = errors = 0
+        started_at = perf_counter()
+        for field, serialize in _route_fields(route):
+            fields += 1
+            if not _warmup_field(field, serialize=serialize):
+                errors += 1
+
+        results.append(
+            RouteWarmup(
+                path=path,
+                methods=frozenset(route.methods or ()),
+                fields=fields,
+                errors=errors,
+                duration=perf_counter() - started_at,
+            )
+        )
+
+    return results
+
+
+def warmup_enabled() -> bool:
+    return os.environ.get(WARMUP_ENV_VAR, "").strip().lower() in {"1", "true", "yes"}
+
+
+async def run_warmup(app: Any) -> None:
+    # validators are built and run synchronously, the event loop keeps serving other applications meanwhile
+    started_at = perf_counter()
+    results = await anyio.to_thread.run_sync(warmup_routes, app)
+
+    for result in results:
+        logger.debug("Warmed up %s %s in %.3fs", ",".join(sorted(result.methods)), result.path, result.duration)
+    logger.info("Warmed up %d routes in %.3fs", len(results), perf_counter() - started_at)
+
+
+@asynccontextmanager
+async def warmup_routes_lifespan(app: Any) -> AsyncIterator[None]:
+    await run_warmup(app)
+    yield
+
+
+__all__ = [
+    "WARMUP_ENV_VAR",
+    "RouteWarmup",
+    "run_warmup",
+    "warmup_enabled",
+    "warmup_routes",
+    "warmup_routes_lifespan",
+]
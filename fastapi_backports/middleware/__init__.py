@@ -0,0 +1,40 @@
+from ._body_limit import BodyLimitMiddleware
+from ._compression import DEFAULT_COMPRESSIBLE_TYPES, CompressionMiddleware
+from ._concurrency import ConcurrencyLimiter, ConcurrencyLimitMiddleware
+from ._deadline import DEADLINE_SCOPE_KEY, DeadlineMiddleware, deadline_remaining
+from ._etag import ETagMiddleware, ETagVersion, make_etag
+from ._metrics import (
+    DEFAULT_LATENCY_BUCKETS,
+    UNMATCHED_PATH,
+    RouteLatencySnapshot,
+    RouteMetrics,
+    RouteMetricsMiddleware,
+)
+from ._query_cache import QueryCache, QueryCacheMiddleware
+from ._single_flight import SingleFlightMiddleware
+from ._threads import ThreadPool, ThreadPoolMiddleware, ThreadPoolSnapshot
+
+__all__ = [
+    "DEADLINE_SCOPE_KEY",
+    "DEFAULT_COMPRESSIBLE_TYPES",
+    "DEFAULT_LATENCY_BUCKETS",
+    "UNMATCHED_PATH",
+    "BodyLimitMiddleware",
+    "CompressionMiddleware",
+    "ConcurrencyLimitMiddleware",
+    "ConcurrencyLimiter",
+    "DeadlineMiddleware",
+    "ETagMiddleware",
+    "ETagVersion",
+    "QueryCache",
+    "QueryCacheMiddleware",
+    "RouteLatencySnapshot",
+    "RouteMetrics",
+    "RouteMetricsMiddleware",
+    "SingleFlightMiddleware",
+    "ThreadPool",
+    "ThreadPoolMiddleware",
+    "ThreadPoolSnapshot",
+    "deadline_remaining",
+    "make_etag",
+]
@@ -0,0 +1,150 @@
+import re
+from typing import Optional
+
+from starlette.datastructures import Headers
+from starlette.exceptions import HTTPException
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+_JSON_TOKENS = re.compile(rb'[\[\]{}"\\]')
+_JSON_VALUE_START = frozenset(b'{["-0123456789tfn')
+_JSON_WHITESPACE = b" \t\r\n"
+_JSON_PAIRS = {ord("]"): ord("["), ord("}"): ord("{")}
+
+_BACKSLASH = ord("\\")
+_QUOTE = ord('"')
+
+
+class _InvalidBodyError(HTTPException):
+    # raised while the application reads the body, FastAPI passes HTTP exceptions from receive through
+    pass
+
+
+class _JSONStructureScanner:
+    # tracks only structural tokens, so the actual parsing is still done by FastAPI
+
+    def __init__(self, max_depth: Optional[int]) -> None:
+        self.max_depth = max_depth
+
+        self._started = False
+        self._stack = bytearray()
+        self._in_string = False
+        self._escaped = False
+
+    def feed(self, chunk: bytes) -> None:
+        if not self._started:
+            stripped = chunk.lstrip(_JSON_WHITESPACE)
+            if not stripped:
+                return
+            if stripped[0] not in _JSON_VALUE_START:
+                raise _InvalidBodyError(400, "Request body is not valid JSON")
+
+            self._started = True
+
+        if self.max_depth is None:
+            return
+
+        skip_until = 0
+        if self._escaped:
+            skip_until = 1
+            self._escaped = False
+
+        for match in _JSON_TOKENS.finditer(chunk, skip_until):
+            position = match.start()
+            if position < skip_until:
+                continue
+
+            token = chunk[position]
+            if self._in_string:
+                if token == _BACKSLASH:
+                    skip_until = position + 2
+                    self._escaped = skip_until > len(chunk)
+                elif token == _QUOTE:
+                    self._in_string = False
+            elif token == _QUOTE:
+                self._in_string = True
+            elif token in _JSON_PAIRS:
+                if not self._stack or self._stack.pop() != _JSON_PAIRS[token]:
+                    raise _InvalidBodyError(400, "Request body is not valid JSON")
+            elif token != _BACKSLASH:
+                self._stack.append(token)
+                if len(self._stack) > self.max_depth:
+                    raise _InvalidBodyError(400, "Request body JSON is nested too deeply")
+
+
+async def _reject(exc: _InvalidBodyError, scope: Scope, receive: Receive, send: Send) -> None:
+    response = JSONResponse({"detail": exc.detail}, status_code=exc.status_code)
+    await response(scope, receive, send)
+
+
+class BodyLimitMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        max_body_size: int,
+        *,
+        max_depth: Optional[int] = None,
+    ) -> None:
+        self.app = app
+        self.max_body_size = max_body_size
+        self.max_depth = max_depth
+
+    def _too_large(self) -> _InvalidBodyError:
+        return _InvalidBodyError(413, f"Request body exceeds {self.max_body_size} bytes")
+
+    def _limited_receive(self, headers: Headers, receive: Receive) -> Receive:
+        scanner = _JSONStructureScanner(self.max_depth) if "json" in headers.get("content-type", "") else None
+        size = 0
+
+        async def _receive() -> Message:
+            nonlocal size
+
+            message = await receive()
+            if message["type"] != "http.request":
+                return message
+
+            # checked chunk by chunk as the application reads, so the body is never buffered here
+            chunk = message.get("body", b"")
+            size += len(chunk)
+            if size > self.max_body_size:
+                raise self._too_large()
+
+            if scanner is not None:
+                scanner.feed(chunk)
+
+            return message
+
+        return _receive
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        content_length = headers.get("content-length")
+        if content_length is not None and content_length.isdigit() and int(content_length) > self.max_body_size:
+            await _reject(self._too_large(), scope, receive, send)
+            return
+
+        response_started = False
+
+        async def _send(message: Message) -> None:
+            nonlocal response_started
+
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, self._limited_receive(headers, receive), _send)
+        except _InvalidBodyError as exc:
+            if response_started:
+                raise
+
+            await _reject(exc, scope, receive, send)
+
+
+__all__ = [
+    "BodyLimitMiddleware",
+]
@@ -0,0 +1,207 @@
+import gzip
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli  # type: ignore[ty:unresolved-import]
+except ImportError:
+    brotli = None
+
+try:
+    # zstd is part of stdlib since 3.14
+    from compression.zstd import compress as _zstd_compress  # type: ignore[ty:unresolved-import]
+except ImportError:
+    try:
+        import zstandard  # type: ignore[ty:unresolved-import]
+    except ImportError:
+        _zstd_compress = None
+    else:
+
+        def _zstd_compress(data: bytes, level: int) -> bytes:
+            return zstandard.ZstdCompressor(level=level).compress(data)
+
+
+_Compressor = Callable[[bytes, int], bytes]
+
+DEFAULT_COMPRESSIBLE_TYPES: Tuple[str, ...] = (
+    "text/",
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+)
+
+
+def _compress_gzip(data: bytes, level: int) -> bytes:
+    return gzip.compress(data, compresslevel=level, mtime=0)
+
+
+def _compress_brotli(data: bytes, level: int) -> bytes:
+    assert brotli is not None
+    return brotli.compress(data, quality=level)
+
+
+def _available_compressors() -> Dict[str, Tuple[_Compressor, int]]:
+    compressors: Dict[str, Tuple[_Compressor, int]] = {}
+
+    if brotli is not None:
+        compressors["br"] = (_compress_brotli, 4)
+    if _zstd_compress is not None:
+        compressors["zstd"] = (_zstd_compress, 3)
+
+    compressors["gzip"] = (_compress_gzip, 6)
+    return compressors
+
+
+_COMPRESSORS = _available_compressors()
+
+
+def _accepted_encodings(header: str) -> Dict[str, float]:
+    accepted: Dict[str, float] = {}
+
+    for item in header.split(","):
+        encoding, *params = (part.strip() for part in item.split(";"))
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+
+        if encoding:
+            accepted[encoding.lower()] = quality
+
+    return accepted
+
+
+class CompressionMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        *,
+        minimum_size: int = 500,
+        encodings: Optional[Sequence[str]] = None,
+        content_types: Sequence[str] = DEFAULT_COMPRESSIBLE_TYPES,
+        compresslevel: Optional[int] = None,
+        cache_size: int = 0,
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.content_types = tuple(content_types)
+        self.compresslevel = compresslevel
+        self.cache_size = cache_size
+
+        self.encodings = tuple(encoding for encoding in (encodings or _COMPRESSORS) if encoding in _COMPRESSORS)
+        if not self.encodings:
+            raise ValueError(f"None of requested encodings are available, available: {', '.join(_COMPRESSORS)}")
+
+        self._cache: "OrderedDict[Tuple[str, bytes], bytes]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+    def _select_encoding(self, scope: Scope) -> Optional[str]:
+        header = Headers(scope=scope).get("accept-encoding")
+        if not header:
+            return None
+
+        accepted = _accepted_encodings(header)
+        wildcard = accepted.get("*", 0.0)
+
+        for encoding in self.encodings:
+            if accepted.get(encoding, wildcard) > 0:
+                return encoding
+
+        return None
+
+    def _is_compressible(self, headers: Headers, body: bytes) -> bool:
+        if len(body) < self.minimum_size or "content-encoding" in headers:
+            return False
+
+        content_type = headers.get("content-type", "").lower()
+        return content_type.startswith(self.content_types)
+
+    def _compress(self, encoding: str, body: bytes) -> bytes:
+        if not self.cache_size:
+            return self._compress_uncached(encoding, body)
+
+        key = (encoding, body)
+        with self._cache_lock:
+            try:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+            except KeyError:
+                pass
+
+        # compressed outside of the lock, so threads compressing different bodies don't wait for each other
+        compressed = self._compress_uncached(encoding, body)
+
+        with self._cache_lock:
+            self._cache[key] = compressed
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+        return compressed
+
+    def _compress_uncached(self, encoding: str, body: bytes) -> bytes:
+        compressor, default_level = _COMPRESSORS[encoding]
+        return compressor(body, self.compresslevel if self.compresslevel is not None else default_level)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = self._select_encoding(scope)
+        start_message: Optional[Message] = None
+
+        async def _send(message: Message) -> None:
+            nonlocal start_message
+
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+
+            if start_message is None or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            start, start_message = start_message, None
+            body = message.get("body", b"")
+
+            # streaming responses are passed through untouched
+            if message.get("more_body", False) or not self._is_compressible(
+                Headers(raw=start.get("headers", [])), body
+            ):
+                await send(start)
+                await send(message)
+                return
+
+            # the response depends on accept-encoding even when it is sent uncompressed,
+            # so shared caches don't serve an uncompressed variant to clients accepting compression
+            headers = MutableHeaders(raw=list(start.get("headers", [])))
+            headers.add_vary_header("Accept-Encoding")
+
+            compressed = self._compress(encoding, body) if encoding is not None else body
+            if encoding is None or len(compressed) >= len(body):
+                await send({**start, "headers": headers.raw})
+                await send(message)
+                return
+
+            headers["content-encoding"] = encoding
+            headers["content-length"] = str(len(compressed))
+
+            await send({**start, "headers": headers.raw})
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, _send)
+
+
+__all__ = [
+    "DEFAULT_COMPRESSIBLE_TYPES",
+    "CompressionMiddleware",
+]
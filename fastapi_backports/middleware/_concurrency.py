@@ -0,0 +1,155 @@
+import threading
+from collections import deque
+from http import HTTPStatus
+from typing import Any, Deque, Optional
+
+import anyio
+import anyio.lowlevel
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+
+class _Waiter:
+    __slots__ = ("event", "granted", "token")
+
+    def __init__(self) -> None:
+        self.event = anyio.Event()
+        self.token = anyio.lowlevel.current_token()
+        self.granted = False
+
+    def wake(self) -> None:
+        if self.token == anyio.lowlevel.current_token():
+            self.event.set()
+            return
+
+        # waiting in another event loop, only its own thread may set its events,
+        # tokens hold the asyncio loop or trio token (wrapped since anyio 4.11)
+        native: Any = getattr(self.token, "native_token", self.token)
+        call_soon = getattr(native, "call_soon_threadsafe", None) or native.run_sync_soon
+        call_soon(self.event.set)
+
+
+class ConcurrencyLimiter:
+    def __init__(
+        self,
+        max_concurrency: int,
+        *,
+        queue_size: int = 0,
+        queue_timeout: Optional[float] = None,
+    ) -> None:
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be greater than 0")
+
+        self.max_concurrency = max_concurrency
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+
+        # shared by the event loops of threaded servers
+        self._active = 0
+        self._waiters: Deque[_Waiter] = deque()
+        self._lock = threading.Lock()
+
+    @property
+    def active(self) -> int:
+        return self._active
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiters)
+
+    def _withdraw(self, waiter: _Waiter) -> bool:
+        # False if a slot was handed over to the waiter in the meantime
+        with self._lock:
+            if waiter.granted:
+                return False
+
+            self._waiters.remove(waiter)
+            return True
+
+    async def acquire(self) -> bool:
+        with self._lock:
+            if self._active < self.max_concurrency and not self._waiters:
+                self._active += 1
+                return True
+
+            if len(self._waiters) >= self.queue_size:
+                return False
+
+            waiter = _Waiter()
+            self._waiters.append(waiter)
+
+        try:
+            with anyio.move_on_after(self.queue_timeout):
+                await waiter.event.wait()
+        except BaseException:
+            if not self._withdraw(waiter):
+                self.release()
+            raise
+
+        return not self._withdraw(waiter)
+
+    def release(self) -> None:
+        with self._lock:
+            if not self._waiters:
+                self._active -= 1
+                return
+
+            # hand the slot over to the next waiter instead of decrementing active
+            waiter = self._waiters.popleft()
+            waiter.granted = True
+
+        waiter.wake()
+
+
+class ConcurrencyLimitMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        max_concurrency: Optional[int] = None,
+        *,
+        queue_size: int = 0,
+        queue_timeout: Optional[float] = None,
+        limiter: Optional[ConcurrencyLimiter] = None,
+        status_code: int = 503,
+        retry_after: Optional[int] = None,
+    ) -> None:
+        if (max_concurrency is None) == (limiter is None):
+            raise ValueError("Exactly one of max_concurrency or limiter must be provided")
+
+        if limiter is None:
+            assert max_concurrency is not None
+
+            limiter = ConcurrencyLimiter(
+                max_concurrency,
+                queue_size=queue_size,
+                queue_timeout=queue_timeout,
+            )
+
+        self.app = app
+        self.limiter = limiter
+
+        self._shed_response = JSONResponse(
+            {"detail": HTTPStatus(status_code).phrase},
+            status_code=status_code,
+            headers={"Retry-After": str(retry_after)} if retry_after is not None else None,
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        if not await self.limiter.acquire():
+            await self._shed_response(scope, receive, send)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.limiter.release()
+
+
+__all__ = [
+    "ConcurrencyLimitMiddleware",
+    "ConcurrencyLimiter",
+]
@@ -0,0 +1,65 @@
+from http import HTTPStatus
+from typing import Optional
+
+import anyio
+from starlette.requests import HTTPConnection
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+DEADLINE_SCOPE_KEY = "fastapi_backports.deadline"
+
+
+class DeadlineMiddleware:
+    def __init__(self, app: ASGIApp, timeout: float, *, status_code: int = 504) -> None:
+        self.app = app
+        self.timeout = timeout
+
+        self._timeout_response = JSONResponse(
+            {"detail": HTTPStatus(status_code).phrase},
+            status_code=status_code,
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        deadline = anyio.current_time() + self.timeout
+
+        # nested deadlines (router + route) can only shrink the budget
+        outer_deadline = scope.get(DEADLINE_SCOPE_KEY)
+        if outer_deadline is not None and outer_deadline < deadline:
+            deadline = outer_deadline
+
+        scope[DEADLINE_SCOPE_KEY] = deadline
+
+        response_started = False
+
+        async def _send(message: Message) -> None:
+            nonlocal response_started
+
+            if message["type"] == "http.response.start":
+                response_started = True
+
+            await send(message)
+
+        with anyio.CancelScope(deadline=deadline) as cancel_scope:
+            await self.app(scope, receive, _send)
+
+        if cancel_scope.cancelled_caught and not response_started:
+            await self._timeout_response(scope, receive, send)
+
+
+async def deadline_remaining(connection: HTTPConnection) -> Optional[float]:
+    deadline = connection.scope.get(DEADLINE_SCOPE_KEY)
+    if deadline is None:
+        return None
+
+    return max(deadline - anyio.current_time(), 0.0)
+
+
+__all__ = [
+    "DEADLINE_SCOPE_KEY",
+    "DeadlineMiddleware",
+    "deadline_remaining",
+]
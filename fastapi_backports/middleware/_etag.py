@@ -0,0 +1,153 @@
+import hashlib
+import inspect
+from typing import Awaitable, Callable, List, Optional, Tuple, Union
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ._utils import SAFE_METHODS, body_digest, read_body, replay_receive, send_response
+
+ETagVersion = Callable[[Request], Union[str, Awaitable[str]]]
+
+_NOT_MODIFIED_HEADERS = frozenset({b"cache-control", b"content-location", b"date", b"expires", b"vary"})
+
+
+def make_etag(data: bytes) -> str:
+    return f'"{hashlib.sha256(data).hexdigest()[:32]}"'
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+
+    if if_none_match.strip() == "*":
+        return True
+
+    # If-None-Match uses weak comparison
+    for candidate in if_none_match.split(","):
+        tag = candidate.strip()
+        if tag.startswith("W/"):
+            tag = tag[2:]
+
+        if tag == etag:
+            return True
+
+    return False
+
+
+def _select_not_modified_headers(raw_headers: List[Tuple[bytes, bytes]]) -> List[Tuple[bytes, bytes]]:
+    return [(name, value) for name, value in raw_headers if name.lower() in _NOT_MODIFIED_HEADERS]
+
+
+async def _send_not_modified(send: Send, etag: str, raw_headers: List[Tuple[bytes, bytes]]) -> None:
+    await send_response(send, 304, [*_select_not_modified_headers(raw_headers), (b"etag", etag.encode())], b"")
+
+
+async def _send_with_etag(send: Send, headers: Headers, start: Message, body: bytes) -> None:
+    raw_headers = list(start.get("headers", []))
+    etag = make_etag(body)
+
+    if _etag_matches(headers.get("if-none-match"), etag):
+        await _send_not_modified(send, etag, raw_headers)
+        return
+
+    await send_response(send, start["status"], [*raw_headers, (b"etag", etag.encode())], body)
+
+
+class ETagMiddleware:
+    def __init__(self, app: ASGIApp, version: Optional[ETagVersion] = None) -> None:
+        self.app = app
+        self.version = version
+
+        # headers of the latest 200 response, sent again with a 304 answered without running the handler
+        self._not_modified_headers: Optional[List[Tuple[bytes, bytes]]] = None
+
+    async def _versioned_etag(self, scope: Scope, headers: Headers, body: bytes, receive: Receive) -> str:
+        assert self.version is not None
+
+        version = self.version(Request(scope, replay_receive(body, receive)))
+        if inspect.isawaitable(version):
+            version = await version
+
+        return make_etag(version.encode() + body_digest(body, headers.get("content-type")))
+
+    async def _versioned(self, scope: Scope, headers: Headers, body: bytes, receive: Receive, send: Send) -> None:
+        etag = await self._versioned_etag(scope, headers, body, receive)
+        matches = _etag_matches(headers.get("if-none-match"), etag)
+        if matches and self._not_modified_headers is not None:
+            await _send_not_modified(send, etag, self._not_modified_headers)
+            return
+
+        not_modified = False
+
+        async def _send(message: Message) -> None:
+            nonlocal not_modified
+
+            if message["type"] == "http.response.start" and message["status"] == 200:  # noqa: PLR2004
+                response_headers = MutableHeaders(raw=list(message.get("headers", [])))
+                self._not_modified_headers = _select_not_modified_headers(response_headers.raw)
+
+                # the headers of the route are not known yet, the response is turned into a 304
+                if matches:
+                    not_modified = True
+                    await _send_not_modified(send, etag, response_headers.raw)
+                    return
+
+                response_headers.setdefault("etag", etag)
+                message = {**message, "headers": response_headers.raw}
+            elif message["type"] == "http.response.body" and not_modified:
+                return
+
+            await send(message)
+
+        await self.app(scope, replay_receive(body, receive), _send)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] not in SAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        body = await read_body(receive)
+
+        if self.version is not None:
+            await self._versioned(scope, headers, body, receive, send)
+            return
+
+        start: Optional[Message] = None
+        chunks: List[bytes] = []
+
+        async def _send(message: Message) -> None:
+            nonlocal start
+
+            if message["type"] == "http.response.start":
+                response_headers = Headers(raw=message.get("headers", []))
+                # streamed bodies and bodies of unknown length are passed through without an ETag
+                if (
+                    message["status"] == 200  # noqa: PLR2004
+                    and "etag" not in response_headers
+                    and "content-length" in response_headers
+                ):
+                    start = message
+                    return
+            elif message["type"] == "http.response.body" and start is not None:
+                chunks.append(message.get("body", b""))
+                if not message.get("more_body", False):
+                    await _send_with_etag(send, headers, start, b"".join(chunks))
+                    start = None
+                return
+
+            await send(message)
+
+        await self.app(scope, replay_receive(body, receive), _send)
+
+        if start is not None:
+            raise RuntimeError("Response body was not completed")
+
+
+__all__ = [
+    "ETagMiddleware",
+    "ETagVersion",
+    "make_etag",
+]
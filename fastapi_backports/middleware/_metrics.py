@@ -0,0 +1,151 @@
+import threading
+from bisect import bisect_left
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+DEFAULT_LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+# requests no route matched share one histogram, raw paths would create one per requested path
+UNMATCHED_PATH = "<unmatched>"
+
+
+@dataclass(frozen=True)
+class RouteLatencySnapshot:
+    path: str
+    methods: Tuple[str, ...]
+    buckets: Tuple[float, ...]
+    # counts[i] is the number of observations <= buckets[i] and > buckets[i - 1],
+    # counts[-1] is the number of observations above the last bucket
+    counts: Tuple[int, ...]
+    count: int
+    total: float
+    in_flight: int
+
+
+class _RouteHistogram:
+    __slots__ = ("_lock", "buckets", "count", "counts", "in_flight", "methods", "path", "total")
+
+    def __init__(self, path: str, methods: Tuple[str, ...], buckets: Tuple[float, ...]) -> None:
+        self.path = path
+        self.methods = methods
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.in_flight = 0
+
+        # requests may be handled by several threads, e.g. on free-threaded Python
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        with self._lock:
+            self.in_flight += 1
+
+    def observe(self, value: float) -> None:
+        with self._lock:
+            self.counts[bisect_left(self.buckets, value)] += 1
+            self.count += 1
+            self.total += value
+            self.in_flight -= 1
+
+    def snapshot(self) -> RouteLatencySnapshot:
+        with self._lock:
+            return RouteLatencySnapshot(
+                path=self.path,
+                methods=self.methods,
+                buckets=self.buckets,
+                counts=tuple(self.counts),
+                count=self.count,
+                total=self.total,
+                in_flight=self.in_flight,
+            )
+
+
+class RouteMetrics:
+    def __init__(self, buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS) -> None:
+        self.buckets = tuple(sorted(buckets))
+        self._histograms: Dict[Tuple[str, Tuple[str, ...]], _RouteHistogram] = {}
+
+        # bumped on reset, so middleware resolves its histogram again instead of writing to a dropped one
+        self._generation = 0
+
+    def _histogram(self, path: str, methods: Tuple[str, ...]) -> _RouteHistogram:
+        key = (path, methods)
+
+        try:
+            return self._histograms[key]
+        except KeyError:
+            # a histogram created concurrently by another thread wins
+            return self._histograms.setdefault(key, _RouteHistogram(path, methods, self.buckets))
+
+    def snapshot(self) -> List[RouteLatencySnapshot]:
+        return [histogram.snapshot() for histogram in list(self._histograms.values())]
+
+    def reset(self) -> None:
+        # cleared first, a histogram resolved in between is kept by the next resolution
+        self._histograms.clear()
+        self._generation += 1
+
+
+class RouteMetricsMiddleware:
+    def __init__(self, app: ASGIApp, metrics: RouteMetrics) -> None:
+        self.app = app
+        self.metrics = metrics
+
+        # route and its histogram are replaced together, so concurrent threads never see a mismatched pair
+        self._resolved: Optional[Tuple[Any, int, _RouteHistogram]] = None
+
+    def _histogram(self, scope: Scope) -> _RouteHistogram:
+        route = scope.get("route")
+
+        # route middleware is created per route, so the histogram is resolved only once
+        resolved = self._resolved
+        if resolved is not None and route is resolved[0] and resolved[1] == self.metrics._generation:
+            return resolved[2]
+
+        path = getattr(route, "path_format", None) or UNMATCHED_PATH
+        methods = tuple(sorted(getattr(route, "methods", None) or ()))
+
+        generation = self.metrics._generation
+        histogram = self.metrics._histogram(path, methods)
+        self._resolved = (route, generation, histogram)
+
+        return histogram
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        histogram = self._histogram(scope)
+        histogram.start()
+
+        start = perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            histogram.observe(perf_counter() - start)
+
+
+__all__ = [
+    "DEFAULT_LATENCY_BUCKETS",
+    "UNMATCHED_PATH",
+    "RouteLatencySnapshot",
+    "RouteMetrics",
+    "RouteMetricsMiddleware",
+]
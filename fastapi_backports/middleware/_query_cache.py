@@ -0,0 +1,172 @@
+import threading
+from collections import OrderedDict
+from time import monotonic
+from typing import List, NamedTuple, Optional, Sequence, Tuple
+
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from ._utils import (
+    SAFE_METHODS,
+    RequestKey,
+    ResponseRecorder,
+    parse_cache_control,
+    read_body,
+    replay_receive,
+    request_key,
+    send_response,
+    vary_headers,
+)
+
+_CACHEABLE_STATUS_CODES = frozenset({200, 203, 204})
+
+
+class _CachedResponse(NamedTuple):
+    status_code: int
+    raw_headers: List[Tuple[bytes, bytes]]
+    body: bytes
+    created_at: float
+    expires_at: Optional[float]
+    # values of the request headers listed in the response's Vary header
+    variant: Tuple[Tuple[str, Optional[str]], ...] = ()
+
+
+class QueryCache:
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = 60.0) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+
+        self._entries: "OrderedDict[RequestKey, _CachedResponse]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: RequestKey) -> Optional[_CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            if entry.expires_at is not None and entry.expires_at <= monotonic():
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return entry
+
+    def set(
+        self,
+        key: RequestKey,
+        status_code: int,
+        raw_headers: List[Tuple[bytes, bytes]],
+        body: bytes,
+        ttl: Optional[float] = None,
+        *,
+        variant: Tuple[Tuple[str, Optional[str]], ...] = (),
+    ) -> None:
+        if ttl is None:
+            ttl = self.ttl
+
+        now = monotonic()
+        entry = _CachedResponse(
+            status_code=status_code,
+            raw_headers=raw_headers,
+            body=body,
+            created_at=now,
+            expires_at=now + ttl if ttl is not None else None,
+            variant=variant,
+        )
+
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+def _response_vary(headers: Headers) -> List[str]:
+    return [name.strip().lower() for value in headers.getlist("vary") for name in value.split(",") if name.strip()]
+
+
+def _variant(headers: Headers, vary: Sequence[str]) -> Tuple[Tuple[str, Optional[str]], ...]:
+    return tuple((name, headers.get(name)) for name in vary)
+
+
+def _response_ttl(headers: Headers) -> Tuple[bool, Optional[float]]:
+    directives = parse_cache_control(headers.get("cache-control"))
+
+    if {"no-store", "no-cache", "private"} & directives.keys():
+        return False, None
+
+    # responses meant for a single client
+    if "set-cookie" in headers or "*" in _response_vary(headers):
+        return False, None
+
+    max_age = directives.get("s-maxage") or directives.get("max-age")
+    if max_age is not None:
+        try:
+            return True, float(max_age)
+        except ValueError:
+            return False, None
+
+    return True, None
+
+
+class QueryCacheMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        cache: Optional[QueryCache] = None,
+        *,
+        maxsize: int = 1024,
+        ttl: Optional[float] = 60.0,
+        vary: Sequence[str] = (),
+    ) -> None:
+        self.app = app
+        self.cache = cache if cache is not None else QueryCache(maxsize=maxsize, ttl=ttl)
+        self.vary = vary_headers(vary)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] not in SAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        request_directives = parse_cache_control(headers.get("cache-control"))
+        if "no-store" in request_directives:
+            await self.app(scope, receive, send)
+            return
+
+        body = await read_body(receive)
+        key = request_key(scope, headers, body, self.vary)
+
+        if "no-cache" not in request_directives and request_directives.get("max-age") != "0":
+            cached = self.cache.get(key)
+            # a single variant is kept per key, a request with other values of the Vary headers is a miss
+            if cached is not None and _variant(headers, [name for name, _ in cached.variant]) == cached.variant:
+                age = str(int(monotonic() - cached.created_at)).encode()
+                await send_response(send, cached.status_code, [*cached.raw_headers, (b"age", age)], cached.body)
+                return
+
+        recorder = ResponseRecorder(send)
+        await self.app(scope, replay_receive(body, receive), recorder)
+
+        if not recorder.completed or recorder.status_code not in _CACHEABLE_STATUS_CODES:
+            return
+
+        cacheable, ttl = _response_ttl(recorder.headers)
+        if cacheable:
+            variant = _variant(headers, _response_vary(recorder.headers))
+            self.cache.set(key, recorder.status_code, recorder.headers.raw, recorder.body, ttl, variant=variant)
+
+
+__all__ = [
+    "QueryCache",
+    "QueryCacheMiddleware",
+]
@@ -0,0 +1,83 @@
+from typing import Any, Dict, Optional, Sequence
+
+import anyio
+import anyio.lowlevel
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from ._utils import (
+    SAFE_METHODS,
+    RequestKey,
+    ResponseRecorder,
+    read_body,
+    replay_receive,
+    request_key,
+    send_response,
+    vary_headers,
+    without_set_cookie,
+)
+
+
+class _Flight:
+    __slots__ = ("done", "recorder")
+
+    def __init__(self, recorder: ResponseRecorder) -> None:
+        self.done = anyio.Event()
+        self.recorder = recorder
+
+
+class SingleFlightMiddleware:
+    def __init__(self, app: ASGIApp, *, vary: Sequence[str] = ()) -> None:
+        self.app = app
+        self.vary = vary_headers(vary)
+
+        # flights are per event loop, a request can only wait for an event of its own loop,
+        # the flights of a loop are dropped once it has none left
+        self._flights: Dict[Any, Dict[RequestKey, _Flight]] = {}
+
+    @property
+    def in_flight(self) -> int:
+        return sum(len(flights) for flights in list(self._flights.values()))
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] not in SAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        body = await read_body(receive)
+        key = request_key(scope, headers, body, self.vary)
+
+        token = anyio.lowlevel.current_token()
+
+        while True:
+            flight: Optional[_Flight] = self._flights.get(token, {}).get(key)
+            if flight is None:
+                break
+
+            await flight.done.wait()
+
+            recorder = flight.recorder
+            if recorder.completed:
+                # cookies set for the leader are not handed to other clients
+                raw_headers = without_set_cookie(recorder.headers.raw)
+                await send_response(send, recorder.status_code, raw_headers, recorder.body)
+                return
+
+            # leader failed before completing a response, next request in line takes over
+
+        flight = self._flights.setdefault(token, {})[key] = _Flight(ResponseRecorder(send))
+
+        try:
+            await self.app(scope, replay_receive(body, receive), flight.recorder)
+        finally:
+            flights = self._flights[token]
+            del flights[key]
+            if not flights:
+                del self._flights[token]
+            flight.done.set()
+
+
+__all__ = [
+    "SingleFlightMiddleware",
+]
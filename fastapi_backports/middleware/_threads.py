@@ -0,0 +1,281 @@
+import asyncio
+import functools
+import importlib
+import itertools
+import sys
+import threading
+from bisect import bisect_left
+from concurrent.futures import Executor
+from contextvars import ContextVar, copy_context
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Any, AsyncIterator, Callable, Iterable, Optional, Sequence, Tuple, TypeVar
+
+import anyio.lowlevel
+import anyio.to_thread
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from fastapi_backports._backports.route_middleware import RouteMiddlewareBackporter
+from fastapi_backports._patching import has_patches, patch
+
+from ._concurrency import ConcurrencyLimiter
+from ._metrics import DEFAULT_LATENCY_BUCKETS
+
+T = TypeVar("T")
+
+# modules running sync endpoints, dependencies and background tasks with starlette's run_in_threadpool
+_THREADPOOL_MODULES = (
+    "fastapi.routing",
+    "fastapi.dependencies.utils",
+    "fastapi.concurrency",
+    "starlette.background",
+)
+
+# modules iterating sync iterators with starlette's iterate_in_threadpool, e.g. the content of streaming responses
+_ITERATE_MODULES = (
+    "fastapi.routing",
+    "fastapi.concurrency",
+    "starlette.responses",
+)
+
+_current_pool: ContextVar[Optional["ThreadPool"]] = ContextVar("fastapi_backports_thread_pool", default=None)
+
+# returned instead of running functions whose caller was cancelled before a thread picked them up
+_ABANDONED: Any = object()
+_EXHAUSTED = object()
+
+# run variables are looked up by name on older anyio versions
+_pool_ids = itertools.count()
+
+
+@dataclass(frozen=True)
+class ThreadPoolSnapshot:
+    name: Optional[str]
+    capacity: Optional[int]
+    # wait times are the time between calling a sync function and a thread starting to run it,
+    # counts[i] is the number of waits <= buckets[i] and > buckets[i - 1],
+    # counts[-1] is the number of waits above the last bucket
+    buckets: Tuple[float, ...]
+    counts: Tuple[int, ...]
+    count: int
+    wait_total: float
+    wait_max: float
+    active: int
+    waiting: int
+
+
+class _Call:
+    __slots__ = ("abandoned", "started")
+
+    def __init__(self) -> None:
+        self.started = False
+        self.abandoned = False
+
+
+class ThreadPool:
+    def __init__(
+        self,
+        total_tokens: Optional[int] = None,
+        *,
+        executor: Optional[Executor] = None,
+        name: Optional[str] = None,
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+    ) -> None:
+        if (total_tokens is None) == (executor is None):
+            raise ValueError("Exactly one of total_tokens or executor must be provided")
+
+        if total_tokens is not None and total_tokens < 1:
+            raise ValueError("total_tokens must be greater than 0")
+
+        self.name = name
+        self.executor = executor
+        self.total_tokens = total_tokens
+        # shared by the event loops of threaded servers, anyio's limiters are bound to a single one
+        self.limiter = ConcurrencyLimiter(total_tokens, queue_size=sys.maxsize) if total_tokens is not None else None
+        self._thread_limiter: anyio.lowlevel.RunVar[Optional[anyio.CapacityLimiter]] = anyio.lowlevel.RunVar(
+            f"fastapi_backports_thread_pool_{next(_pool_ids)}", default=None
+        )
+        self.buckets = tuple(sorted(buckets))
+
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._count = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._active = 0
+        self._waiting = 0
+
+        # functions start and finish in worker threads
+        self._lock = threading.Lock()
+
+    @property
+    def active(self) -> int:
+        return self._active
+
+    @property
+    def waiting(self) -> int:
+        return self._waiting
+
+    def _loop_limiter(self, total_tokens: int) -> anyio.CapacityLimiter:
+        # keeps the pool's threads out of anyio's default limiter, the slots are taken from self.limiter
+        limiter = self._thread_limiter.get()
+        if limiter is None:
+            limiter = anyio.CapacityLimiter(total_tokens)
+            self._thread_limiter.set(limiter)
+
+        return limiter
+
+    def _start(self, call: _Call, wait: float) -> bool:
+        with self._lock:
+            if call.abandoned:
+                return False
+
+            call.started = True
+            self._waiting -= 1
+            self._active += 1
+
+            self._counts[bisect_left(self.buckets, wait)] += 1
+            self._count += 1
+            self._wait_total += wait
+            self._wait_max = max(self._wait_max, wait)
+
+        return True
+
+    def _finish(self) -> None:
+        with self._lock:
+            self._active -= 1
+
+    def _abandon(self, call: _Call) -> None:
+        # cancelled before a thread picked the function up
+        with self._lock:
+            if not call.started:
+                call.abandoned = True
+                self._waiting -= 1
+
+    async def run_sync(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        call = _Call()
+        queued_at = perf_counter()
+
+        def run() -> T:
+            if not self._start(call, perf_counter() - queued_at):
+                return _ABANDONED
+
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self._finish()
+
+        with self._lock:
+            self._waiting += 1
+
+        try:
+            if self.limiter is not None:
+                await self.limiter.acquire()
+                try:
+                    return await anyio.to_thread.run_sync(run, limiter=self._loop_limiter(self.limiter.max_concurrency))
+                finally:
+                    self.limiter.release()
+
+            # executors only work with asyncio, contextvars are copied like anyio does
+            assert self.executor is not None
+            future = self.executor.submit(functools.partial(copy_context().run, run))
+            return await asyncio.wrap_future(future)
+        finally:
+            self._abandon(call)
+
+    def snapshot(self) -> ThreadPoolSnapshot:
+        with self._lock:
+            return ThreadPoolSnapshot(
+                name=self.name,
+                capacity=self.total_tokens,
+                buckets=self.buckets,
+                counts=tuple(self._counts),
+                count=self._count,
+                wait_total=self._wait_total,
+                wait_max=self._wait_max,
+                active=self._active,
+                waiting=self._waiting,
+            )
+
+
+def _dispatching(original: Callable[..., Any]) -> Callable[..., Any]:
+    @functools.wraps(original)
+    async def run_in_threadpool(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        pool = _current_pool.get()
+        if pool is None:
+            return await original(func, *args, **kwargs)
+
+        return await pool.run_sync(func, *args, **kwargs)
+
+    return run_in_threadpool
+
+
+def _iterating(original: Callable[..., AsyncIterator[Any]]) -> Callable[..., AsyncIterator[Any]]:
+    @functools.wraps(original)
+    async def iterate_in_threadpool(iterator: Iterable[T]) -> AsyncIterator[T]:
+        pool = _current_pool.get()
+        if pool is None:
+            async for item in original(iterator):
+                yield item
+            return
+
+        as_iterator = iter(iterator)
+        while True:
+            item = await pool.run_sync(next, as_iterator, _EXHAUSTED)
+            if item is _EXHAUSTED:
+                break
+            yield item
+
+    return iterate_in_threadpool
+
+
+def install_threadpool_hook() -> None:
+    # installed and reverted with the route_middleware backport, so creating middleware never patches anything
+    for module_name in _THREADPOOL_MODULES:
+        module = importlib.import_module(module_name)
+        patch(module, "run_in_threadpool", _dispatching(module.run_in_threadpool))
+
+    for module_name in _ITERATE_MODULES:
+        module = importlib.import_module(module_name)
+        if hasattr(module, "iterate_in_threadpool"):
+            patch(module, "iterate_in_threadpool", _iterating(module.iterate_in_threadpool))
+
+
+class ThreadPoolMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        total_tokens: Optional[int] = None,
+        *,
+        executor: Optional[Executor] = None,
+        pool: Optional[ThreadPool] = None,
+    ) -> None:
+        if sum(option is not None for option in (total_tokens, executor, pool)) != 1:
+            raise ValueError("Exactly one of total_tokens, executor or pool must be provided")
+
+        if not has_patches(RouteMiddlewareBackporter.label()):
+            raise RuntimeError("ThreadPoolMiddleware requires the route_middleware backport")
+
+        if pool is None:
+            pool = ThreadPool(total_tokens, executor=executor)
+
+        self.app = app
+        self.pool = pool
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        # the innermost middleware wins, so route pools take precedence over router pools
+        token = _current_pool.set(self.pool)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _current_pool.reset(token)
+
+
+__all__ = [
+    "ThreadPool",
+    "ThreadPoolMiddleware",
+    "ThreadPoolSnapshot",
+]
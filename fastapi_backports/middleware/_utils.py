@@ -0,0 +1,140 @@
+import hashlib
+import json
+from contextlib import suppress
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from starlette.datastructures import Headers
+from starlette.types import Message, Receive, Scope, Send
+
+SAFE_METHODS = frozenset({"GET", "QUERY"})
+
+# always part of request keys, so responses are never shared between users
+CREDENTIAL_HEADERS = ("authorization", "cookie")
+
+RequestKey = Tuple[Any, ...]
+
+
+async def read_body(receive: Receive) -> bytes:
+    chunks: List[bytes] = []
+
+    while True:
+        message = await receive()
+        if message["type"] != "http.request":
+            break
+
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body", False):
+            break
+
+    return b"".join(chunks)
+
+
+def replay_receive(body: bytes, receive: Receive) -> Receive:
+    consumed = False
+
+    async def _receive() -> Message:
+        nonlocal consumed
+
+        if consumed:
+            return await receive()
+
+        consumed = True
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    return _receive
+
+
+def body_digest(body: bytes, content_type: Optional[str]) -> bytes:
+    if body and content_type and "json" in content_type:
+        # normalize json so semantically equal queries share the same digest
+        with suppress(ValueError):
+            body = json.dumps(json.loads(body), sort_keys=True, separators=(",", ":")).encode()
+
+    return hashlib.sha256(body).digest()
+
+
+def request_key(scope: Scope, headers: Headers, body: bytes, vary: Sequence[str]) -> RequestKey:
+    return (
+        scope["method"],
+        scope["path"],
+        scope.get("query_string", b""),
+        body_digest(body, headers.get("content-type")),
+        *(headers.get(name) for name in vary),
+    )
+
+
+def vary_headers(vary: Sequence[str]) -> Tuple[str, ...]:
+    return tuple(dict.fromkeys((*CREDENTIAL_HEADERS, *(name.lower() for name in vary))))
+
+
+def without_set_cookie(raw_headers: List[Tuple[bytes, bytes]]) -> List[Tuple[bytes, bytes]]:
+    return [(name, value) for name, value in raw_headers if name.lower() != b"set-cookie"]
+
+
+def parse_cache_control(value: Optional[str]) -> Dict[str, Optional[str]]:
+    directives: Dict[str, Optional[str]] = {}
+
+    for item in (value or "").split(","):
+        name, sep, arg = item.strip().partition("=")
+        if name:
+            directives[name.lower()] = arg.strip('"') if sep else None
+
+    return directives
+
+
+class ResponseRecorder:
+    def __init__(self, send: Optional[Send] = None) -> None:
+        self.send = send
+        self.start: Optional[Message] = None
+        self.chunks: List[bytes] = []
+        self.completed = False
+
+    @property
+    def status_code(self) -> int:
+        assert self.start is not None
+        return self.start["status"]
+
+    @property
+    def headers(self) -> Headers:
+        assert self.start is not None
+        return Headers(raw=self.start.get("headers", []))
+
+    @property
+    def body(self) -> bytes:
+        return b"".join(self.chunks)
+
+    async def __call__(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.start = message
+        elif message["type"] == "http.response.body":
+            self.chunks.append(message.get("body", b""))
+            self.completed = not message.get("more_body", False)
+
+        if self.send is not None:
+            await self.send(message)
+
+
+async def send_response(
+    send: Send,
+    status_code: int,
+    raw_headers: List[Tuple[bytes, bytes]],
+    body: bytes,
+) -> None:
+    await send({"type": "http.response.start", "status": status_code, "headers": raw_headers})
+    await send({"type": "http.response.body", "body": body})
+
+
+__all__ = [
+    "CREDENTIAL_HEADERS",
+    "SAFE_METHODS",
+    "RequestKey",
+    "ResponseRecorder",
+    "body_digest",
+    "parse_cache_control",
+    "read_body",
+    "replay_receive",
+    "request_key",
+    "send_response",
+    "vary_headers",
+    "without_set_cookie",
+]
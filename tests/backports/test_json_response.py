@@ -0,0 +1,102 @@
+from typing import Any, List, Optional
+
+import pytest
+from fastapi import status
+from fastapi.responses import PlainTextResponse
+from pydantic import BaseModel, Field
+from starlette.testclient import TestClient
+
+from fastapi_backports import FastAPI
+from fastapi_backports._backports.json_response import (
+    JSONResponseBackporter,
+    _JSONSerializedField,
+    _RawJSON,
+    _RawJSONResponse,
+)
+from tests.backports.utils import require_pydantic_v2, skip_if_backport_not_needed
+
+
+class Item(BaseModel):
+    item_id: int = Field(alias="itemId")
+    name: str
+    description: Optional[str] = None
+
+
+@skip_if_backport_not_needed(JSONResponseBackporter)
+class TestJSONResponse:
+    @pytest.fixture
+    def app(self) -> FastAPI:
+        return FastAPI()
+
+    @pytest.fixture
+    def client(self, app) -> TestClient:
+        return TestClient(app)
+
+    @require_pydantic_v2
+    def test_serialized_to_json_bytes(self, app, client, monkeypatch):
+        serialized: List[Any] = []
+
+        @app.get("/items", response_model_exclude_none=True)
+        async def get_items() -> List[Item]:
+            return [Item(itemId=1, name="potato"), Item(itemId=2, name="tomato", description="red")]
+
+        def render(self: _RawJSONResponse, content: Any) -> bytes:
+            serialized.append(content)
+            return original_render(self, content)
+
+        original_render = _RawJSONResponse.render
+        monkeypatch.setattr(_RawJSONResponse, "render", render)
+
+        response = client.get("/items")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"] == "application/json"
+        assert response.content == b'[{"itemId":1,"name":"potato"},{"itemId":2,"name":"tomato","description":"red"}]'
+        assert [type(content) for content in serialized] == [_RawJSON]
+
+    @require_pydantic_v2
+    def test_python_mode(self, app):
+        @app.get("/item")
+        async def get_item() -> Item:
+            return Item(itemId=1, name="potato")
+
+        (route,) = [route for route in app.routes if getattr(route, "path", None) == "/item"]
+        field = _JSONSerializedField(route.response_field)
+
+        assert field.serialize(Item(itemId=1, name="potato"), mode="python", exclude_none=True) == {
+            "itemId": 1,
+            "name": "potato",
+        }
+        assert field.serialize(Item(itemId=1, name="potato"), exclude_none=True) == b'{"itemId":1,"name":"potato"}'
+
+    def test_sync_endpoint(self, app, client):
+        @app.get("/item")
+        def get_item() -> Item:
+            return {"itemId": 1, "name": "potato", "extra": True}  # type: ignore[ty:invalid-return-type]
+
+        assert client.get("/item").json() == {"itemId": 1, "name": "potato", "description": None}
+
+    def test_response_validation_error(self, app, client):
+        @app.get("/item")
+        async def get_item() -> Item:
+            return {"name": "potato"}  # type: ignore[ty:invalid-return-type]
+
+        with pytest.raises(Exception, match="validation error"):
+            client.get("/item")
+
+    def test_custom_response_class(self, app, client):
+        @app.get("/text", response_class=PlainTextResponse, response_model=str)
+        async def get_text() -> Any:
+            return "potato"
+
+        response = client.get("/text")
+
+        assert response.headers["content-type"].startswith("text/plain")
+        assert response.text == "potato"
+
+    def test_without_response_model(self, app, client):
+        @app.get("/raw")
+        async def get_raw():
+            return {"name": "potato"}
+
+        assert client.get("/raw").json() == {"name": "potato"}
@@ -0,0 +1,187 @@
+import gc
+import json
+from typing import Any, AsyncIterator, Iterator, List
+
+import pytest
+from fastapi import Depends, Response, status
+from fastapi.exceptions import ResponseValidationError
+from fastapi.responses import StreamingResponse
+from starlette.testclient import TestClient
+
+from fastapi_backports import APIRouter, FastAPI, JSONArrayStreamingResponse
+from fastapi_backports._backports.json_stream import JSONStreamBackporter
+from tests.backports.utils import PYDANTIC_V1, create_tracked_item, skip_if_backport_not_needed
+
+validated: List[str] = []
+
+
+Item = create_tracked_item(validated)
+
+
+def _lines(response: Any) -> List[Any]:
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        pytest.param([{"name": "potato"}, b'{"name":"tomato"}'], id="sync"),
+        pytest.param(None, id="async"),
+    ],
+)
+def test_json_array_streaming_response(content):
+    async def items() -> AsyncIterator[Any]:
+        yield {"name": "potato"}
+        yield b'{"name":"tomato"}'
+
+    app = FastAPI()
+
+    @app.get("/items")
+    async def get_items() -> Response:
+        return JSONArrayStreamingResponse(items() if content is None else content)
+
+    @app.get("/empty")
+    async def get_empty() -> Response:
+        return JSONArrayStreamingResponse([])
+
+    client = TestClient(app)
+    response = client.get("/items")
+
+    assert response.headers["content-type"] == "application/json"
+    assert response.json() == [{"name": "potato"}, {"name": "tomato"}]
+    assert client.get("/empty").content == b"[]"
+
+
+def test_json_array_response_class():
+    app = FastAPI()
+
+    @app.get("/items", response_class=JSONArrayStreamingResponse)
+    async def get_items() -> AsyncIterator[Item]:
+        yield Item(name="potato")
+        yield {"name": "tomato"}  # type: ignore[ty:invalid-yield]
+
+    response = TestClient(app).get("/items")
+
+    # items are not validated, like with FastAPI 0.134.0 or newer
+    assert response.headers["content-type"] == "application/json"
+    assert response.json() == [{"name": "potato", "color": "red"}, {"name": "tomato"}]
+
+
+@skip_if_backport_not_needed(JSONStreamBackporter)
+class TestJSONStream:
+    @pytest.fixture
+    def app(self) -> FastAPI:
+        return FastAPI()
+
+    @pytest.fixture
+    def client(self, app) -> TestClient:
+        return TestClient(app)
+
+    @pytest.fixture(autouse=True)
+    def _clear_validated(self):
+        validated.clear()
+
+    def test_async_generator(self, app, client):
+        @app.get("/items", response_model_exclude={"color"})
+        async def get_items() -> AsyncIterator[Item]:
+            yield {"name": "potato", "extra": True}  # type: ignore[ty:invalid-yield]
+            yield Item(name="tomato")
+
+        response = client.get("/items")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"] == "application/jsonl"
+        assert response.content == b'{"name":"potato"}\n{"name":"tomato"}\n'
+        # the instance is validated when created, and again by pydantic v2
+        assert validated == ["potato", "tomato"] + ([] if PYDANTIC_V1 else ["tomato"])
+
+    def test_sync_generator(self, app, client):
+        @app.get("/items", status_code=status.HTTP_201_CREATED)
+        def get_items() -> Iterator[Item]:
+            for name in ("potato", "tomato"):
+                yield Item(name=name)
+
+        response = client.get("/items")
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert _lines(response) == [{"name": "potato", "color": "red"}, {"name": "tomato", "color": "red"}]
+
+    def test_without_item_type(self, app, client):
+        @app.get("/items")
+        async def get_items():
+            yield {"name": "potato"}
+            yield [1, 2]
+
+        assert _lines(client.get("/items")) == [{"name": "potato"}, [1, 2]]
+
+    def test_response_validation_error(self, app, client):
+        @app.get("/items")
+        async def get_items() -> AsyncIterator[Item]:
+            yield {"color": "blue"}  # type: ignore[ty:invalid-yield]
+
+        # raised while streaming, so it may be grouped with the task group's errors
+        with pytest.raises(Exception) as exc_info:  # noqa: PT011
+            client.get("/items")
+
+        errors = getattr(exc_info.value, "exceptions", [exc_info.value])
+        assert any(isinstance(error, ResponseValidationError) for error in errors)
+
+    def test_sub_response_and_dependencies(self, app, client):
+        def prefix(response: Response) -> str:
+            response.headers["x-stream"] = "1"
+            response.status_code = status.HTTP_202_ACCEPTED
+            return "fresh "
+
+        @app.get("/items")
+        async def get_items(value: str = Depends(prefix)) -> AsyncIterator[Item]:
+            yield Item(name=value + "potato")
+
+        response = client.get("/items")
+
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        assert response.headers["x-stream"] == "1"
+        assert _lines(response) == [{"name": "fresh potato", "color": "red"}]
+
+    def test_custom_response_class(self, app, client):
+        class TextStreamingResponse(StreamingResponse):
+            media_type = "text/plain"
+
+        @app.get("/text", response_class=TextStreamingResponse)
+        async def get_text() -> AsyncIterator[str]:
+            yield "pot"
+            yield "ato"
+
+        response = client.get("/text")
+
+        # custom response classes get the generator itself, as in FastAPI
+        assert response.headers["content-type"].startswith("text/plain")
+        assert response.text == "potato"
+        assert app.router.routes[-1].stream_item_type is None
+
+    def test_include_router(self, app, client):
+        router = APIRouter(prefix="/router")
+
+        @router.get("/items")
+        async def get_items() -> AsyncIterator[Item]:
+            yield {"name": "potato", "extra": True}  # type: ignore[ty:invalid-yield]
+
+        app.include_router(router)
+
+        assert client.get("/router/items").content == b'{"name":"potato","color":"red"}\n'
+        assert validated == ["potato"]
+
+    def test_trusted_items(self, app, client):
+        instances = [Item(name="potato"), Item(name="tomato")]
+        validated.clear()
+
+        @app.get("/items", trust_response=True)
+        async def get_items() -> AsyncIterator[Item]:
+            for item in instances:
+                yield item
+
+            yield {"name": "cucumber"}  # type: ignore[ty:invalid-yield]
+
+        # the route handler is created for a copy of the route, which is gone by now
+        gc.collect()
+        assert [item["name"] for item in _lines(client.get("/items"))] == ["potato", "tomato", "cucumber"]
+        assert validated == ["cucumber"]
@@ -1,9 +1,28 @@
+import gc
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
+from time import perf_counter
+from typing import Any, List, Mapping
 
+import anyio
+import anyio.lowlevel
+import pytest
+from fastapi import Depends, Request
+from fastapi.exceptions import FastAPIError
 from fastapi.testclient import TestClient
+from typing_extensions import Annotated
 
-from fastapi_backports import APIRouter, FastAPI
+from fastapi_backports import (
+    APIRouter,
+    FastAPI,
+    LifespanResource,
+    TimedLifespan,
+    get_lifespan_timings,
+    lifespan_state,
+)
 from fastapi_backports._backports.lifespan_decorator import LifespanDecoratorBackporter
+from fastapi_backports._lifespans import lifespan_cell
 from tests.backports.utils import skip_if_backport_not_needed
 
 
@@ -32,3 +51,440 @@ class TestLifespanDecorator:
 
         with TestClient(app) as client:
             assert client.app_state == {"base": True, "additional": True, "router": True}
+
+
+@skip_if_backport_not_needed(LifespanDecoratorBackporter)
+class TestLifespanDependencies:
+    def test_independent_lifespans_start_concurrently(self):
+        app = FastAPI()
+        started: List[str] = []
+
+        async def wait_for(name: str) -> None:
+            with anyio.fail_after(1):
+                while name not in started:
+                    await anyio.lowlevel.checkpoint()
+
+        @app.add_lifespan(depends_on=[])
+        @asynccontextmanager
+        async def first(_: FastAPI):
+            started.append("first")
+            await wait_for("second")
+            yield {"first": True}
+
+        @app.add_lifespan(depends_on=[])
+        @asynccontextmanager
+        async def second(_: FastAPI):
+            started.append("second")
+            await wait_for("first")
+            yield {"second": True}
+
+        with TestClient(app) as client:
+            assert client.app_state == {"first": True, "second": True}
+
+    def test_dependency_order(self):
+        app = FastAPI()
+        events: List[str] = []
+
+        def recording(name: str):
+            @asynccontextmanager
+            async def lifespan(_: FastAPI):
+                events.append(f"enter {name}")
+                yield
+                await anyio.lowlevel.checkpoint()
+                events.append(f"exit {name}")
+
+            return lifespan
+
+        db = app.add_lifespan(recording("db"), depends_on=[])
+        cache = app.add_lifespan(recording("cache"), depends_on=[])
+        app.add_lifespan(recording("service"), depends_on=[db, cache])
+
+        with TestClient(app):
+            assert events[-1] == "enter service"
+
+        assert events[3] == "exit service"
+        assert set(events[4:]) == {"exit db", "exit cache"}
+
+    def test_startup_error_rolls_back(self):
+        app = FastAPI()
+        events: List[str] = []
+
+        @app.add_lifespan(depends_on=[])
+        @asynccontextmanager
+        async def healthy(_: FastAPI):
+            events.append("enter healthy")
+            yield
+            events.append("exit healthy")
+
+        @app.add_lifespan(depends_on=[])
+        @asynccontextmanager
+        async def broken(_: FastAPI):
+            await anyio.lowlevel.checkpoint()
+            msg = "broken"
+            raise RuntimeError(msg)
+            yield
+
+        @app.add_lifespan(depends_on=[broken])
+        @asynccontextmanager
+        async def dependent(_: FastAPI):
+            events.append("enter dependent")
+            yield
+
+        with pytest.raises(RuntimeError, match="broken"), TestClient(app):
+            pass
+
+        assert events == ["enter healthy", "exit healthy"]
+
+    def test_startup_error_cancels_slow_siblings(self):
+        app = FastAPI()
+        events: List[str] = []
+
+        @app.add_lifespan(depends_on=[])
+        @asynccontextmanager
+        async def slow(_: FastAPI):
+            try:
+                await anyio.sleep(5)
+            finally:
+                events.append("cancel slow")
+            yield
+
+        @app.add_lifespan(depends_on=[])
+        @asynccontextmanager
+        async def broken(_: FastAPI):
+            await anyio.lowlevel.checkpoint()
+            msg = "broken"
+            raise RuntimeError(msg)
+            yield
+
+        started_at = perf_counter()
+        with pytest.raises(RuntimeError, match="broken"), TestClient(app):
+            pass
+
+        assert perf_counter() - started_at < 1
+        assert events == ["cancel slow"]
+
+    def test_unknown_dependency(self):
+        app = FastAPI()
+
+        @asynccontextmanager
+        async def unregistered(_: FastAPI):
+            yield
+
+        with pytest.raises(FastAPIError, match="unregistered"):
+            app.add_lifespan(unregistered, depends_on=[unregistered])
+
+
+@skip_if_backport_not_needed(LifespanDecoratorBackporter)
+class TestLifespanTimings:
+    def test_timings(self):
+        app = FastAPI()
+
+        @app.add_lifespan
+        @asynccontextmanager
+        async def app_lifespan(_: FastAPI):
+            yield
+
+        router = APIRouter()
+
+        @router.add_lifespan(shutdown_timeout=1)
+        @asynccontextmanager
+        async def router_lifespan(_: FastAPI):
+            async with anyio.create_task_group():
+                yield {"router": True}
+
+        app.include_router(router)
+
+        with TestClient(app) as client:
+            assert client.app_state == {"router": True}
+
+            timings = get_lifespan_timings(app)
+            assert [timing.name.rsplit(".", 1)[-1] for timing in timings] == ["app_lifespan", "router_lifespan"]
+            assert all(timing.startup is not None and timing.shutdown is None for timing in timings)
+
+        assert all(timing.shutdown is not None and not timing.timed_out for timing in get_lifespan_timings(app))
+
+    def test_router_lifespans(self):
+        @asynccontextmanager
+        async def app_lifespan(_: FastAPI):
+            yield
+
+        @asynccontextmanager
+        async def router_lifespan(_: FastAPI):
+            yield {"router": True}
+
+        @asynccontextmanager
+        async def hanging(_: FastAPI):
+            yield
+            await anyio.sleep_forever()
+
+        app = FastAPI(lifespan=app_lifespan)
+        app.include_router(APIRouter(lifespan=router_lifespan))
+        app.include_router(APIRouter(lifespan=TimedLifespan(hanging, shutdown_timeout=0.01)))
+
+        with TestClient(app) as client:
+            assert client.app_state == {"router": True}
+
+        timings = get_lifespan_timings(app)
+        assert [timing.name.rsplit(".", 1)[-1] for timing in timings] == ["app_lifespan", "router_lifespan", "hanging"]
+        assert [timing.timed_out for timing in timings] == [False, False, True]
+        assert all(timing.startup is not None and timing.shutdown is not None for timing in timings)
+
+    def test_startup_timeout(self):
+        app = FastAPI()
+
+        @app.add_lifespan(startup_timeout=0.01)
+        @asynccontextmanager
+        async def hanging(_: FastAPI):
+            await anyio.sleep_forever()
+            yield
+
+        with pytest.raises(TimeoutError, match="hanging"), TestClient(app):
+            pass
+
+        (timing,) = get_lifespan_timings(app)
+        assert timing.timed_out
+        assert timing.startup is None
+
+    def test_shutdown_timeout(self):
+        app = FastAPI()
+        events: List[str] = []
+
+        @app.add_lifespan
+        @asynccontextmanager
+        async def healthy(_: FastAPI):
+            yield
+            events.append("exit healthy")
+
+        @app.add_lifespan(shutdown_timeout=0.01)
+        @asynccontextmanager
+        async def hanging(_: FastAPI):
+            yield
+            await anyio.sleep_forever()
+
+        with TestClient(app):
+            pass
+
+        assert events == ["exit healthy"]
+        assert [timing.timed_out for timing in get_lifespan_timings(app)] == [False, True]
+
+    def test_startup_error_with_timeout(self):
+        app = FastAPI()
+
+        @app.add_lifespan(startup_timeout=1)
+        @asynccontextmanager
+        async def broken(_: FastAPI):
+            msg = "broken"
+            raise RuntimeError(msg)
+            yield
+
+        with pytest.raises(RuntimeError, match="broken"), TestClient(app):
+            pass
+
+
+@skip_if_backport_not_needed(LifespanDecoratorBackporter)
+class TestLazyLifespan:
+    def test_lifespan_state(self):
+        app = FastAPI()
+
+        @app.add_lifespan
+        @asynccontextmanager
+        async def eager(_: FastAPI):
+            yield {"eager": True}
+
+        @app.get("/")
+        async def endpoint(state: Annotated[Mapping[str, Any], Depends(lifespan_state(eager))]) -> Any:
+            return state
+
+        with TestClient(app) as client:
+            assert client.get("/").json() == {"eager": True}
+
+    def test_entered_on_first_use(self):
+        app = FastAPI()
+        events: List[str] = []
+
+        @app.add_lifespan(lazy=True)
+        @asynccontextmanager
+        async def reports(_: FastAPI):
+            events.append("enter")
+            await anyio.sleep(0.01)
+            yield {"reports": len(events)}
+            events.append("exit")
+
+        @app.get("/")
+        async def endpoint(state: Annotated[Mapping[str, Any], Depends(lifespan_state(reports))]) -> Any:
+            return state
+
+        with TestClient(app) as client:
+            assert events == []
+
+            with ThreadPoolExecutor(5) as executor:
+                responses = list(executor.map(lambda _: client.get("/").json(), range(5)))
+
+            assert responses == [{"reports": 1}] * 5
+            assert events == ["enter"]
+
+        assert events == ["enter", "exit"]
+
+    def test_not_running(self):
+        app = FastAPI()
+
+        @app.add_lifespan(lazy=True)
+        @asynccontextmanager
+        async def reports(_: FastAPI):
+            yield
+
+        @app.get("/")
+        async def endpoint(state: Annotated[Mapping[str, Any], Depends(lifespan_state(reports))]) -> Any:
+            return state
+
+        with pytest.raises(RuntimeError, match="not running"):
+            TestClient(app).get("/")
+
+    @pytest.mark.parametrize("lazy", [False, True])
+    def test_applications_sharing_a_lifespan(self, lazy):
+        router = APIRouter()
+
+        @router.add_lifespan(lazy=lazy)
+        @asynccontextmanager
+        async def reports(app: FastAPI):
+            yield {"app": app.title}
+
+        @router.get("/")
+        async def endpoint(state: Annotated[Mapping[str, Any], Depends(lifespan_state(reports))]) -> Any:
+            return state
+
+        def create_app(title: str) -> FastAPI:
+            app = FastAPI(title=title)
+            app.include_router(router)
+            return app
+
+        with TestClient(create_app("first")) as first, TestClient(create_app("second")) as second:
+            assert first.get("/").json() == {"app": "first"}
+            assert second.get("/").json() == {"app": "second"}
+
+    def test_applications_not_kept_alive(self):
+        app = FastAPI()
+
+        @app.add_lifespan(lazy=True)
+        @asynccontextmanager
+        async def reports(_: FastAPI):
+            yield {"reports": True}
+
+        @app.get("/")
+        async def endpoint(state: Annotated[Mapping[str, Any], Depends(lifespan_state(reports))]) -> Any:
+            return state
+
+        with TestClient(app) as client:
+            assert client.get("/").json() == {"reports": True}
+
+        app_ref = weakref.ref(app)
+        del app, client
+        gc.collect()
+
+        assert app_ref() is None
+
+
+class Pool:
+    pass
+
+
+@skip_if_backport_not_needed(LifespanDecoratorBackporter)
+class TestLifespanResource:
+    def test_resources(self):
+        app = FastAPI()
+        pools: List[Pool] = []
+
+        @app.add_lifespan
+        @asynccontextmanager
+        async def database(_: FastAPI):
+            pools.append(Pool())
+            yield {"pool": pools[-1]}
+
+        @app.add_lifespan(lazy=True)
+        @asynccontextmanager
+        async def reports(_: FastAPI):
+            yield {"generator": "reports", "format": "pdf"}
+
+        @app.get("/")
+        async def endpoint(
+            pool: Annotated[Pool, LifespanResource(database)],
+            report_format: Annotated[str, LifespanResource(reports, "format")],
+        ) -> Any:
+            return {"pool": pool is pools[-1], "format": report_format}
+
+        @app.get("/ambiguous")
+        async def ambiguous(state: Annotated[Any, LifespanResource(reports)]) -> Any:
+            return state
+
+        for _ in range(2):
+            with TestClient(app) as client:
+                assert client.get("/").json() == {"pool": True, "format": "pdf"}
+
+                with pytest.raises(FastAPIError, match="a key is required"):
+                    client.get("/ambiguous")
+
+    def test_applications_sharing_a_lifespan(self):
+        pools: List[Pool] = []
+
+        @asynccontextmanager
+        async def database(_: FastAPI):
+            pools.append(Pool())
+            yield {"pool": pools[-1]}
+
+        def create_app() -> FastAPI:
+            app = FastAPI()
+            app.add_lifespan(database)
+
+            @app.get("/")
+            async def endpoint(pool: Annotated[Pool, LifespanResource(database)]) -> Any:
+                return pools.index(pool)
+
+            return app
+
+        with TestClient(create_app()) as first, TestClient(create_app()) as second:
+            assert first.get("/").json() == 0
+            assert second.get("/").json() == 1
+
+    def test_resolved_once_per_run(self, monkeypatch):
+        app = FastAPI()
+        resolved: List[Any] = []
+        monkeypatch.setattr(
+            "fastapi_backports._lifespans.lifespan_cell",
+            lambda *args: resolved.append(args) or lifespan_cell(*args),
+        )
+
+        @app.add_lifespan(request_state=False)
+        @asynccontextmanager
+        async def database(_: FastAPI):
+            yield {"pool": Pool()}
+
+        @app.get("/")
+        async def endpoint(request: Request, pool: Annotated[Pool, LifespanResource(database)]) -> Any:
+            return {"pool": id(pool), "state": "pool" in request.state._state}
+
+        pools = []
+        for _ in range(2):
+            with TestClient(app) as client:
+                responses = [client.get("/").json() for _ in range(3)]
+
+            assert not any(response["state"] for response in responses)
+            assert len({response["pool"] for response in responses}) == 1
+            pools.append(responses[0]["pool"])
+
+        # resolved again when the application is started again
+        assert len(resolved) == 2  # noqa: PLR2004
+        assert pools[0] != pools[1]
+
+    def test_not_added(self):
+        app = FastAPI()
+
+        @asynccontextmanager
+        async def database(_: FastAPI):
+            yield {"pool": Pool()}
+
+        @app.get("/")
+        async def endpoint(pool: Annotated[Pool, LifespanResource(database)]) -> None:
+            pass
+
+        with pytest.raises(FastAPIError, match="was not added"), TestClient(app) as client:
+            client.get("/")
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from typing import AsyncIterator
 
 from fastapi import Depends, status
 from fastapi.testclient import TestClient
@@ -22,6 +23,11 @@ async def read_root(potato: Annotated[Potato, Depends(get_potato)]) -> Potato:
     return potato
 
 
+@app.get("/stream")
+async def stream_potatoes() -> AsyncIterator[Potato]:
+    yield {"color": "red", "size": "10"}  # type: ignore[ty:invalid-yield]
+
+
 @dataclass
 class Potato:
     color: str
@@ -36,3 +42,10 @@ class TestPostponedAnnotations:
 
             assert response.status_code == status.HTTP_200_OK
             assert response.json() == {"color": "red", "size": 10}
+
+    def test_postponed_stream_item_type(self) -> None:
+        with TestClient(app) as client:
+            response = client.get("/stream")
+
+            assert response.status_code == status.HTTP_200_OK
+            assert response.content == b'{"color":"red","size":10}\n'
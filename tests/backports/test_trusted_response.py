@@ -0,0 +1,131 @@
+import gc
+from typing import Any, List
+
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+
+from fastapi_backports import APIRouter, FastAPI
+from fastapi_backports._backports._trusted_response import _TRUSTED
+from fastapi_backports._backports.route_middleware import RouteMiddlewareBackporter
+from tests.backports.utils import create_tracked_item, skip_if_backport_not_needed
+
+validated: List[str] = []
+
+
+Item = create_tracked_item(validated)
+
+
+class SubItem(Item):
+    extra: str = "extra"
+
+
+@skip_if_backport_not_needed(RouteMiddlewareBackporter)
+class TestTrustedResponse:
+    @pytest.fixture(autouse=True)
+    def _reset(self):
+        validated.clear()
+
+    @pytest.fixture
+    def app(self):
+        return FastAPI()
+
+    @pytest.fixture
+    def client(self, app):
+        return TestClient(app)
+
+    def test_trusted_instance_not_revalidated(self, app, client):
+        item = Item(name="potato")
+
+        @app.get("/item", trust_response=True, response_model_exclude={"color"})
+        async def get_item() -> Item:
+            return item
+
+        validated.clear()
+        response = client.get("/item")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {"name": "potato"}
+        assert validated == []
+
+    def test_trusted_list(self, app, client):
+        items = [Item(name="potato"), Item(name="tomato")]
+
+        @app.get("/items", trust_response=True)
+        def get_items() -> List[Item]:
+            return items
+
+        validated.clear()
+        response = client.get("/items")
+
+        assert response.json() == [{"name": "potato", "color": "red"}, {"name": "tomato", "color": "red"}]
+        assert validated == []
+
+    @pytest.mark.parametrize(
+        ("content", "expected"),
+        [
+            ({"name": "potato"}, {"name": "potato", "color": "red"}),
+            (lambda: SubItem(name="potato"), {"name": "potato", "color": "red"}),
+        ],
+    )
+    def test_other_values_validated(self, app, client, content, expected):
+        content = content() if callable(content) else content
+
+        @app.get("/validated", trust_response=True, response_model=Item)
+        async def get_validated() -> Any:
+            return content
+
+        validated.clear()
+        response = client.get("/validated")
+
+        assert response.json() == expected
+        assert validated == ["potato"]
+
+    def test_untrusted_by_default(self, app, client):
+        item = Item(name="potato")
+
+        @app.get("/item")
+        async def get_item() -> Item:
+            return item
+
+        validated.clear()
+        client.get("/item")
+
+        assert validated == ["potato"]
+
+    @pytest.mark.parametrize(("router_trust", "include_trust"), [(True, False), (False, True)])
+    def test_inherited_through_include_router(self, app, client, router_trust, include_trust):
+        item = Item(name="potato")
+        router = APIRouter(trust_response=router_trust)
+
+        @router.get("/item")
+        async def get_item() -> Item:
+            return item
+
+        app.include_router(router, prefix="/api", trust_response=include_trust)
+
+        validated.clear()
+        response = client.get("/api/item")
+
+        assert response.json() == {"name": "potato", "color": "red"}
+        assert validated == []
+
+    def test_fields_released_with_routes(self):
+        gc.collect()
+        trusted = len(_TRUSTED)
+
+        app = FastAPI()
+
+        @app.get("/item", trust_response=True)
+        async def get_item() -> Item:
+            return Item(name="potato")
+
+        @app.get("/untrusted")
+        async def get_untrusted() -> Item:
+            return Item(name="potato")
+
+        assert len(_TRUSTED) > trusted
+
+        del app
+        gc.collect()
+        assert len(_TRUSTED) == trusted
@@ -1,9 +1,19 @@
+import subprocess
+import sys
+from textwrap import dedent
+from typing import List, Optional, TypeVar
+
 import pytest
 from fastapi import Depends, FastAPI, status
 from starlette.testclient import TestClient
-from typing_extensions import Annotated
+from typing_extensions import Annotated, TypeAliasType
 
-from fastapi_backports._backports.type_alias_type import TypeAliasTypeBackporter
+from fastapi_backports._backports.type_alias_type import (
+    _UNWRAPPED_ALIASES_SIZE,
+    TypeAliasTypeBackporter,
+    _resolve_type_alias_cached,
+    unwrap_type_alias,
+)
 from tests.backports.utils import require_python_3_12, skip_if_backport_not_needed
 
 pytestmark = pytest.mark.skipif(
@@ -37,3 +47,120 @@ class TestTypeAliasType:
 
         assert response.status_code == status.HTTP_200_OK
         assert response.json() == {"value": 42}
+
+
+async def get_user() -> str:
+    return "user"
+
+
+T = TypeVar("T")
+
+UserDependency = Depends(get_user)
+
+User = TypeAliasType("User", Annotated[str, UserDependency])
+CurrentUser = TypeAliasType("CurrentUser", User)
+Limit = TypeAliasType("Limit", int)
+Dependency = TypeAliasType("Dependency", Annotated[T, UserDependency], type_params=(T,))
+
+
+@skip_if_backport_not_needed(TypeAliasTypeBackporter)
+class TestNestedTypeAliasType:
+    def test_unwrap(self) -> None:
+        assert unwrap_type_alias(CurrentUser) == Annotated[str, UserDependency]
+        assert unwrap_type_alias(CurrentUser) is unwrap_type_alias(User)
+        assert unwrap_type_alias(Optional[Limit]) == Optional[int]
+        assert unwrap_type_alias(Annotated[Limit, "meta"]) == Annotated[int, "meta"]
+        assert unwrap_type_alias(Dependency[str]) == Annotated[str, UserDependency]
+        assert unwrap_type_alias(List[Limit]) == List[Limit]
+
+    def test_unwrapped_aliases_are_bounded(self) -> None:
+        for i in range(_UNWRAPPED_ALIASES_SIZE + 1):
+            assert unwrap_type_alias(TypeAliasType(f"Alias{i}", int)) is int
+
+        assert _resolve_type_alias_cached.cache_info().currsize <= _UNWRAPPED_ALIASES_SIZE
+
+    def test_wraps_analyze_param_patched_before_backport(self) -> None:
+        code = """
+            from fastapi import FastAPI
+            from fastapi.dependencies import utils
+            from typing_extensions import TypeAliasType
+
+            import fastapi_backports
+            from fastapi_backports._backports import type_alias_type  # noqa: F401
+
+            calls = []
+            original_analyze_param = utils.analyze_param
+
+
+            def analyze_param(**kwargs):
+                calls.append(kwargs["param_name"])
+                return original_analyze_param(**kwargs)
+
+
+            utils.analyze_param = analyze_param
+            fastapi_backports.backport(["type_alias_type"])
+
+            Limit = TypeAliasType("Limit", int)
+            app = FastAPI()
+
+            @app.get("/")
+            async def read_root(limit: Limit) -> None:
+                pass
+
+            assert calls == ["limit"], calls
+            """
+
+        result = subprocess.run(  # noqa: S603
+            [sys.executable, "-c", dedent(code)],
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+
+        assert result.returncode == 0, result.stderr
+
+    def test_nested_aliases(self) -> None:
+        app = FastAPI()
+        client = TestClient(app)
+
+        @app.get("/")
+        async def read_root(
+            user: CurrentUser,
+            generic_user: Dependency[str],
+            limit: Optional[Limit] = None,
+        ) -> dict:
+            return {"user": user, "generic_user": generic_user, "limit": limit}
+
+        response = client.get("/", params={"limit": 5})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {"user": "user", "generic_user": "user", "limit": 5}
+
+
+@skip_if_backport_not_needed(TypeAliasTypeBackporter)
+class TestAliasedDependencies:
+    def test_dependency_runs_once_per_request(self) -> None:
+        calls = []
+
+        async def get_current_user() -> str:
+            calls.append(1)
+            return "user"
+
+        current_user = TypeAliasType("CurrentUser", Annotated[str, Depends(get_current_user)])
+        authenticated = TypeAliasType("Authenticated", current_user)
+
+        app = FastAPI()
+        client = TestClient(app)
+
+        @app.get("/")
+        async def read_root(
+            user: current_user,
+            other: authenticated,
+            plain: Annotated[str, Depends(get_current_user)],
+        ) -> dict:
+            return {"users": [user, other, plain]}
+
+        response = client.get("/")
+
+        assert response.json() == {"users": ["user"] * 3}
+        assert len(calls) == 1
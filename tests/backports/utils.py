@@ -1,7 +1,9 @@
 import sys
-from typing import Callable, Type, TypeVar
+from typing import Any, Callable, List, Type, TypeVar
 
 import pytest
+from pydantic import VERSION as PYDANTIC_VERSION
+from pydantic import BaseModel
 
 from fastapi_backports._backports import BaseBackporter
 
@@ -20,7 +22,48 @@ require_python_3_12 = pytest.mark.skipif(
     reason="Requires Python 3.12+",
 )
 
+PYDANTIC_V1 = PYDANTIC_VERSION.startswith("1.")
+
+require_pydantic_v2 = pytest.mark.skipif(
+    PYDANTIC_V1,
+    reason="Requires Pydantic v2",
+)
+
+
+def create_tracked_item(validated: List[str]) -> Any:
+    # records the names it validates, instances are only revalidated on pydantic v2
+    def track(cls: Any, value: str) -> str:
+        validated.append(value)
+        return value
+
+    if PYDANTIC_V1:
+        from pydantic import validator
+
+        class ItemV1(BaseModel):
+            name: str
+            color: str = "red"
+
+            _track = validator("name", allow_reuse=True)(track)
+
+        return ItemV1
+
+    from pydantic import ConfigDict, field_validator
+
+    class Item(BaseModel):
+        model_config = ConfigDict(revalidate_instances="always")
+
+        name: str
+        color: str = "red"
+
+        _track = field_validator("name")(classmethod(track))
+
+    return Item
+
+
 __all__ = [
+    "PYDANTIC_V1",
+    "create_tracked_item",
+    "require_pydantic_v2",
     "require_python_3_12",
     "skip_if_backport_not_needed",
 ]
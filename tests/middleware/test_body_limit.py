@@ -0,0 +1,128 @@
+import json
+from http import HTTPStatus
+from typing import Any, Iterator, List
+
+import pytest
+from fastapi import Body, status
+from fastapi.testclient import TestClient
+from starlette.middleware import Middleware
+from starlette.responses import PlainTextResponse
+from starlette.types import Message, Receive, Scope, Send
+from typing_extensions import Annotated
+
+from fastapi_backports import FastAPI
+from fastapi_backports._backports.query_method import QueryMethodBackporter
+from fastapi_backports.middleware import BodyLimitMiddleware
+from fastapi_backports.middleware._body_limit import _InvalidBodyError, _JSONStructureScanner
+from tests.backports.utils import skip_if_backport_not_needed
+
+
+def _chunks(data: bytes, size: int = 3) -> Iterator[bytes]:
+    for i in range(0, len(data), size):
+        yield data[i : i + size]
+
+
+@skip_if_backport_not_needed(QueryMethodBackporter)
+class TestBodyLimitMiddleware:
+    @pytest.fixture
+    def client(self) -> TestClient:
+        app = FastAPI()
+
+        @app.query("/search", middleware=[Middleware(BodyLimitMiddleware, max_body_size=64, max_depth=3)])
+        async def search(filters: Annotated[Any, Body()]) -> Any:
+            return filters
+
+        return TestClient(app)
+
+    @pytest.mark.parametrize(
+        "body",
+        [
+            {"a": [1, {"b": "[[[{{{"}]},
+            {"escaped": 'quote " and backslash \\ [[['},
+            [],
+        ],
+    )
+    def test_valid_body(self, client, body):
+        response = client.request(
+            "QUERY",
+            "/search",
+            content=_chunks(json.dumps(body).encode()),
+            headers={"content-type": "application/json"},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == body
+
+    def test_content_length_too_large(self, client):
+        response = client.request("QUERY", "/search", json={"a": "x" * 100})
+
+        assert response.status_code == HTTPStatus.REQUEST_ENTITY_TOO_LARGE
+        assert response.json() == {"detail": "Request body exceeds 64 bytes"}
+
+    def test_streamed_body_too_large(self, client):
+        response = client.request(
+            "QUERY",
+            "/search",
+            content=_chunks(json.dumps({"a": "x" * 100}).encode()),
+            headers={"content-type": "application/json"},
+        )
+
+        assert response.status_code == HTTPStatus.REQUEST_ENTITY_TOO_LARGE
+        assert response.json() == {"detail": "Request body exceeds 64 bytes"}
+
+    @pytest.mark.parametrize(
+        ("content", "detail"),
+        [
+            (b"  <xml/>", "Request body is not valid JSON"),
+            (b'{"a": ]', "Request body is not valid JSON"),
+            (b"[[[[1]]]]", "Request body JSON is nested too deeply"),
+        ],
+    )
+    def test_invalid_json(self, client, content, detail):
+        response = client.request(
+            "QUERY",
+            "/search",
+            content=content,
+            headers={"content-type": "application/json"},
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json() == {"detail": detail}
+
+    @pytest.mark.asyncio
+    async def test_body_streamed_to_app(self):
+        received: List[bytes] = []
+        sent: List[Message] = []
+        chunks = iter([b"xxx", b"xxx", b"xxx", b"xxx"])
+
+        async def app(scope: Scope, receive: Receive, send: Send) -> None:
+            while True:
+                message = await receive()
+                received.append(message["body"])
+                if not message.get("more_body", False):
+                    break
+
+            await PlainTextResponse("ok")(scope, receive, send)
+
+        async def receive() -> Message:
+            return {"type": "http.request", "body": next(chunks), "more_body": True}
+
+        async def send(message: Message) -> None:
+            sent.append(message)
+
+        await BodyLimitMiddleware(app, max_body_size=8)(
+            {"type": "http", "method": "POST", "headers": []}, receive, send
+        )
+
+        assert received == [b"xxx", b"xxx"]
+        assert sent[0]["status"] == HTTPStatus.REQUEST_ENTITY_TOO_LARGE
+
+    def test_escape_split_between_chunks(self):
+        scanner = _JSONStructureScanner(max_depth=1)
+
+        scanner.feed(b'["\\')
+        scanner.feed(b'"[[[", "\\')
+        scanner.feed(b'""]')
+
+        with pytest.raises(_InvalidBodyError):
+            scanner.feed(b"]")
@@ -0,0 +1,91 @@
+import gzip
+from typing import Any, Tuple
+
+import pytest
+from fastapi import status
+from fastapi.responses import PlainTextResponse, Response
+from fastapi.testclient import TestClient
+from starlette.middleware import Middleware
+
+from fastapi_backports import APIRouter, FastAPI
+from fastapi_backports.middleware import CompressionMiddleware
+from fastapi_backports.middleware._compression import _accepted_encodings
+
+_LARGE = ["item"] * 500
+
+
+class TestCompressionMiddleware:
+    @pytest.fixture
+    def middleware(self) -> Tuple[Any, TestClient]:
+        app = FastAPI()
+        router = APIRouter(
+            middleware=[Middleware(CompressionMiddleware, encodings=["gzip"], minimum_size=100, cache_size=2)],
+        )
+
+        @router.get("/large")
+        async def large() -> Any:
+            return _LARGE
+
+        @router.get("/small")
+        async def small() -> Any:
+            return ["item"]
+
+        @router.get("/binary")
+        async def binary() -> Any:
+            return Response(b"\x00" * 1000, media_type="application/octet-stream")
+
+        @app.get("/text", middleware=[Middleware(CompressionMiddleware, minimum_size=10_000)])
+        async def text() -> Any:
+            return PlainTextResponse("text" * 1000)
+
+        app.include_router(router)
+
+        [route] = [route for route in app.router.routes if getattr(route, "path", None) == "/large"]
+        return route.app, TestClient(app)
+
+    def test_compresses_large_responses(self, middleware):
+        _, client = middleware
+        response = client.get("/large", headers={"accept-encoding": "br;q=1, gzip;q=0.5"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert response.json() == _LARGE
+        assert int(response.headers["content-length"]) < len(response.content)
+
+    @pytest.mark.parametrize(
+        ("path", "accept_encoding", "vary"),
+        [
+            ("/large", "identity", True),
+            ("/large", "gzip;q=0", True),
+            ("/large", "", True),
+            ("/small", "gzip", False),
+            ("/binary", "gzip", False),
+            ("/text", "gzip", False),
+        ],
+    )
+    def test_not_compressed(self, middleware, path, accept_encoding, vary):
+        _, client = middleware
+        response = client.get(path, headers={"accept-encoding": accept_encoding})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert "content-encoding" not in response.headers
+        assert response.headers.get("vary") == ("Accept-Encoding" if vary else None)
+
+    def test_cache(self, middleware):
+        route_app, client = middleware
+
+        for _ in range(3):
+            response = client.get("/large", headers={"accept-encoding": "gzip"})
+            assert response.json() == _LARGE
+
+        [(key, compressed)] = route_app._cache.items()
+        assert key[0] == "gzip"
+        assert gzip.decompress(compressed) == key[1]
+
+    def test_accepted_encodings(self):
+        assert _accepted_encodings("gzip, br;q=0.5, zstd;q=invalid, ") == {"gzip": 1.0, "br": 0.5, "zstd": 0.0}
+
+    def test_unavailable_encodings(self):
+        with pytest.raises(ValueError, match="None of requested encodings are available"):
+            CompressionMiddleware(FastAPI(), encodings=["unknown"])
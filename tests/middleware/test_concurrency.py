@@ -0,0 +1,144 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, List
+
+import anyio
+import anyio.lowlevel
+import anyio.to_thread
+import pytest
+from fastapi import status
+from httpx import ASGITransport, AsyncClient
+from starlette.middleware import Middleware
+
+from fastapi_backports import APIRouter, FastAPI
+from fastapi_backports.middleware import ConcurrencyLimiter, ConcurrencyLimitMiddleware
+
+
+def _create_app(release: asyncio.Event, **kwargs: Any) -> FastAPI:
+    app = FastAPI()
+    router = APIRouter(middleware=[Middleware(ConcurrencyLimitMiddleware, **kwargs)])
+
+    @router.get("/slow")
+    async def slow() -> Any:
+        await release.wait()
+        return {"ok": True}
+
+    @router.get("/fast")
+    async def fast() -> Any:
+        return {"ok": True}
+
+    app.include_router(router)
+    return app
+
+
+async def _wait_for(condition: Any) -> None:
+    while not condition():  # noqa: ASYNC110
+        await asyncio.sleep(0)
+
+
+class TestConcurrencyLimitMiddleware:
+    @pytest.mark.asyncio
+    async def test_sheds_excess_load(self):
+        release = asyncio.Event()
+        limiter = ConcurrencyLimiter(1, queue_size=1)
+        app = _create_app(release, limiter=limiter, status_code=429, retry_after=5)
+
+        async with AsyncClient(transport=ASGITransport(app), base_url="http://test") as client:
+            first = asyncio.ensure_future(client.get("/slow"))
+            await _wait_for(lambda: limiter.active == 1)
+
+            queued = asyncio.ensure_future(client.get("/slow"))
+            await _wait_for(lambda: limiter.waiting == 1)
+
+            shed = await client.get("/fast")
+            assert shed.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+            assert shed.headers["retry-after"] == "5"
+            assert shed.json() == {"detail": "Too Many Requests"}
+
+            release.set()
+            assert (await first).status_code == status.HTTP_200_OK
+            assert (await queued).status_code == status.HTTP_200_OK
+
+        assert limiter.active == 0
+        assert limiter.waiting == 0
+
+    @pytest.mark.asyncio
+    async def test_queue_timeout(self):
+        release = asyncio.Event()
+        app = _create_app(release, max_concurrency=1, queue_size=1, queue_timeout=0.01)
+
+        async with AsyncClient(transport=ASGITransport(app), base_url="http://test") as client:
+            first = asyncio.ensure_future(client.get("/slow"))
+            await asyncio.sleep(0.01)
+
+            timed_out = await client.get("/slow")
+            assert timed_out.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+
+            release.set()
+            assert (await first).status_code == status.HTTP_200_OK
+
+    @pytest.mark.asyncio
+    async def test_max_concurrency_applies_per_route(self):
+        release = asyncio.Event()
+        app = _create_app(release, max_concurrency=1)
+
+        async with AsyncClient(transport=ASGITransport(app), base_url="http://test") as client:
+            first = asyncio.ensure_future(client.get("/slow"))
+            await asyncio.sleep(0.01)
+
+            # each route of the router gets its own limiter
+            assert (await client.get("/fast")).status_code == status.HTTP_200_OK
+            assert (await client.get("/slow")).status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+
+            release.set()
+            assert (await first).status_code == status.HTTP_200_OK
+
+    def test_limit_shared_by_event_loops(self):
+        limiter = ConcurrencyLimiter(1, queue_size=1)
+        acquired, release = threading.Event(), threading.Event()
+
+        async def hold() -> None:
+            assert await limiter.acquire()
+            acquired.set()
+            await anyio.to_thread.run_sync(release.wait)
+            limiter.release()
+
+        thread = threading.Thread(target=anyio.run, args=(hold,))
+        thread.start()
+        try:
+            assert acquired.wait(5)
+
+            async def acquire_from_other_loop() -> List[bool]:
+                results: List[bool] = []
+
+                async def queued() -> None:
+                    results.append(await limiter.acquire())
+
+                async with anyio.create_task_group() as task_group:
+                    task_group.start_soon(queued)
+                    while not limiter.waiting:
+                        await anyio.lowlevel.checkpoint()
+
+                    # the queue is full, the slot held by the other loop is handed over once released
+                    results.append(await limiter.acquire())
+                    release.set()
+
+                limiter.release()
+                return results
+
+            with ThreadPoolExecutor(1) as executor:
+                assert executor.submit(anyio.run, acquire_from_other_loop).result() == [False, True]
+        finally:
+            release.set()
+            thread.join()
+
+        assert limiter.active == 0
+        assert limiter.waiting == 0
+
+    def test_invalid_arguments(self):
+        with pytest.raises(ValueError, match="Exactly one of"):
+            ConcurrencyLimitMiddleware(_create_app(asyncio.Event()))
+
+        with pytest.raises(ValueError, match="greater than 0"):
+            ConcurrencyLimiter(0)
@@ -0,0 +1,59 @@
+from typing import Any, AsyncIterator, List, Optional
+
+import anyio
+import pytest
+from fastapi import Depends, status
+from fastapi.testclient import TestClient
+from starlette.middleware import Middleware
+from typing_extensions import Annotated
+
+from fastapi_backports import APIRouter, FastAPI
+from fastapi_backports.middleware import DeadlineMiddleware, deadline_remaining
+
+
+class TestDeadlineMiddleware:
+    @pytest.fixture
+    def events(self) -> List[str]:
+        return []
+
+    @pytest.fixture
+    def client(self, events) -> TestClient:
+        async def resource() -> AsyncIterator[None]:
+            events.append("enter")
+            try:
+                yield
+            finally:
+                events.append("exit")
+
+        app = FastAPI()
+        router = APIRouter(middleware=[Middleware(DeadlineMiddleware, timeout=10)])
+
+        @router.get("/slow", middleware=[Middleware(DeadlineMiddleware, timeout=0.05)])
+        async def slow(_: Annotated[None, Depends(resource)]) -> Any:
+            await anyio.sleep(10)
+            events.append("finished")
+
+        @router.get("/budget")
+        async def budget(remaining: Annotated[Optional[float], Depends(deadline_remaining)]) -> Any:
+            return {"remaining": remaining}
+
+        @app.get("/unbounded")
+        async def unbounded(remaining: Annotated[Optional[float], Depends(deadline_remaining)]) -> Any:
+            return {"remaining": remaining}
+
+        app.include_router(router)
+
+        return TestClient(app)
+
+    def test_deadline_exceeded(self, client, events):
+        response = client.get("/slow")
+
+        assert response.status_code == status.HTTP_504_GATEWAY_TIMEOUT
+        assert response.json() == {"detail": "Gateway Timeout"}
+        assert events == ["enter", "exit"]
+
+    def test_remaining_budget(self, client):
+        remaining = client.get("/budget").json()["remaining"]
+        assert 0 < remaining <= 10  # noqa: PLR2004
+
+        assert client.get("/unbounded").json() == {"remaining": None}
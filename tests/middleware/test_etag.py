@@ -0,0 +1,139 @@
+from typing import Any, AsyncIterator, Dict, List
+
+import pytest
+from fastapi import Body, Request, Response, status
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+from starlette.middleware import Middleware
+from starlette.types import Message, Receive, Scope, Send
+from typing_extensions import Annotated
+
+from fastapi_backports import FastAPI
+from fastapi_backports._backports.query_method import QueryMethodBackporter
+from fastapi_backports.middleware import ETagMiddleware, make_etag
+from fastapi_backports.middleware._utils import body_digest
+from tests.backports.utils import skip_if_backport_not_needed
+
+
+@skip_if_backport_not_needed(QueryMethodBackporter)
+class TestETagMiddleware:
+    @pytest.fixture
+    def calls(self) -> List[str]:
+        return []
+
+    @pytest.fixture
+    def client(self, calls) -> TestClient:
+        app = FastAPI()
+
+        async def version(request: Request) -> str:
+            calls.append("version")
+            body = await request.json()
+            return f"v{body['version']}"
+
+        @app.query("/computed", middleware=[Middleware(ETagMiddleware)])
+        async def computed(filters: Annotated[Dict[str, Any], Body()]) -> Any:
+            calls.append("computed")
+            return filters
+
+        @app.query("/versioned", middleware=[Middleware(ETagMiddleware, version=version)])
+        async def versioned(filters: Annotated[Dict[str, Any], Body()], response: Response) -> Any:
+            calls.append("versioned")
+            response.headers["cache-control"] = "max-age=60"
+            response.headers["vary"] = "accept-language"
+            return filters
+
+        @app.query("/streamed", middleware=[Middleware(ETagMiddleware)])
+        async def streamed() -> Any:
+            async def content() -> AsyncIterator[bytes]:
+                yield b"potato"
+                yield b"tomato"
+
+            return StreamingResponse(content())
+
+        return TestClient(app)
+
+    def test_computed_etag(self, client, calls):
+        response = client.request("QUERY", "/computed", json={"a": 1})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {"a": 1}
+
+        etag = response.headers["etag"]
+
+        not_modified = client.request("QUERY", "/computed", json={"a": 1}, headers={"if-none-match": f"W/{etag}"})
+        assert not_modified.status_code == status.HTTP_304_NOT_MODIFIED
+        assert not_modified.headers["etag"] == etag
+        assert not_modified.content == b""
+
+        modified = client.request("QUERY", "/computed", json={"a": 2}, headers={"if-none-match": etag})
+        assert modified.status_code == status.HTTP_200_OK
+        assert modified.headers["etag"] != etag
+
+        assert calls == ["computed"] * 3
+
+    def test_versioned_etag_skips_handler(self, client, calls):
+        response = client.request("QUERY", "/versioned", json={"version": 1})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {"version": 1}
+
+        etag = response.headers["etag"]
+
+        not_modified = client.request("QUERY", "/versioned", json={"version": 1}, headers={"if-none-match": etag})
+        assert not_modified.status_code == status.HTTP_304_NOT_MODIFIED
+
+        modified = client.request("QUERY", "/versioned", json={"version": 2}, headers={"if-none-match": etag})
+        assert modified.status_code == status.HTTP_200_OK
+
+        assert calls == ["version", "versioned", "version", "version", "versioned"]
+
+    def test_versioned_not_modified_headers(self, client, calls):
+        etag = make_etag(b"v1" + body_digest(b'{"version": 1}', "application/json"))
+
+        # the headers of the route are not known before its first response, the handler runs once
+        for expected_calls in (["version", "versioned"], ["version", "versioned", "version"]):
+            not_modified = client.request("QUERY", "/versioned", json={"version": 1}, headers={"if-none-match": etag})
+            assert not_modified.status_code == status.HTTP_304_NOT_MODIFIED
+            assert not_modified.headers["etag"] == etag
+            assert not_modified.headers["cache-control"] == "max-age=60"
+            assert not_modified.headers["vary"] == "accept-language"
+            assert not_modified.content == b""
+            assert calls == expected_calls
+
+    def test_streamed_response_passed_through(self, client, calls):
+        response = client.request("QUERY", "/streamed")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.content == b"potatotomato"
+        assert "etag" not in response.headers
+
+    @pytest.mark.asyncio
+    async def test_streamed_response_not_buffered(self):
+        sent: List[Message] = []
+
+        async def app(scope: Scope, receive: Receive, send: Send) -> None:
+            await send({"type": "http.response.start", "status": 200, "headers": []})
+            await send({"type": "http.response.body", "body": b"potato", "more_body": True})
+            assert [message["type"] for message in sent] == ["http.response.start", "http.response.body"]
+            await send({"type": "http.response.body", "body": b""})
+
+        async def receive() -> Message:
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(message: Message) -> None:
+            sent.append(message)
+
+        await ETagMiddleware(app)({"type": "http", "method": "GET", "headers": []}, receive, send)
+        assert len(sent) == 3  # noqa: PLR2004
+
+    @pytest.mark.asyncio
+    async def test_incomplete_response(self):
+        async def app(scope: Scope, receive: Receive, send: Send) -> None:
+            await send({"type": "http.response.start", "status": 200, "headers": [(b"content-length", b"6")]})
+
+        async def receive() -> Message:
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(message: Message) -> None:
+            pass
+
+        with pytest.raises(RuntimeError, match="not completed"):
+            await ETagMiddleware(app)({"type": "http", "method": "GET", "headers": []}, receive, send)
@@ -0,0 +1,80 @@
+from typing import Any
+
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+from starlette.middleware import Middleware
+from starlette.responses import PlainTextResponse
+
+from fastapi_backports import APIRouter, FastAPI
+from fastapi_backports.middleware import UNMATCHED_PATH, RouteMetrics, RouteMetricsMiddleware
+
+
+class TestRouteMetricsMiddleware:
+    @pytest.fixture
+    def metrics(self) -> RouteMetrics:
+        return RouteMetrics(buckets=[1.0, 0.5])
+
+    @pytest.fixture
+    def client(self, metrics) -> TestClient:
+        app = FastAPI()
+        router = APIRouter(middleware=[Middleware(RouteMetricsMiddleware, metrics=metrics)])
+
+        @router.get("/items/{item_id}")
+        async def read_item(item_id: int) -> Any:
+            [snapshot] = metrics.snapshot()
+            return {"item_id": item_id, "in_flight": snapshot.in_flight}
+
+        @router.post("/items")
+        async def create_item() -> Any:
+            return {}
+
+        app.include_router(router, prefix="/api")
+
+        return TestClient(app)
+
+    def test_histograms_keyed_by_route_template(self, client, metrics):
+        for item_id in range(3):
+            response = client.get(f"/api/items/{item_id}")
+
+            assert response.status_code == status.HTTP_200_OK
+            assert response.json() == {"item_id": item_id, "in_flight": 1}
+
+        client.post("/api/items")
+
+        snapshots = {snapshot.path: snapshot for snapshot in metrics.snapshot()}
+        assert snapshots.keys() == {"/api/items/{item_id}", "/api/items"}
+
+        snapshot = snapshots["/api/items/{item_id}"]
+        assert snapshot.methods == ("GET",)
+        assert snapshot.buckets == (0.5, 1.0)
+        assert snapshot.counts == (3, 0, 0)
+        assert snapshot.count == 3  # noqa: PLR2004
+        assert snapshot.in_flight == 0
+        assert snapshot.total > 0
+
+        assert snapshots["/api/items"].count == 1
+
+    def test_reset(self, client, metrics):
+        client.post("/api/items")
+        assert metrics.snapshot()
+
+        metrics.reset()
+        assert metrics.snapshot() == []
+
+        assert client.get("/api/items/1").json() == {"item_id": 1, "in_flight": 1}
+        client.post("/api/items")
+
+        snapshots = {snapshot.path: snapshot for snapshot in metrics.snapshot()}
+        assert snapshots.keys() == {"/api/items/{item_id}", "/api/items"}
+        assert snapshots["/api/items"].count == 1
+
+    def test_unmatched_requests_share_a_histogram(self, metrics):
+        client = TestClient(RouteMetricsMiddleware(PlainTextResponse("not found", status_code=404), metrics=metrics))
+
+        for path in ("/missing", "/other", "/missing/1"):
+            client.get(path)
+
+        [snapshot] = metrics.snapshot()
+        assert snapshot.path == UNMATCHED_PATH
+        assert snapshot.count == 3  # noqa: PLR2004
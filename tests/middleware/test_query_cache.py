@@ -0,0 +1,110 @@
+from typing import Any, Dict, List
+
+import pytest
+from fastapi import Body, Response, status
+from fastapi.testclient import TestClient
+from starlette.middleware import Middleware
+from typing_extensions import Annotated
+
+from fastapi_backports import FastAPI
+from fastapi_backports._backports.query_method import QueryMethodBackporter
+from fastapi_backports.middleware import QueryCache, QueryCacheMiddleware
+from tests.backports.utils import skip_if_backport_not_needed
+
+
+@skip_if_backport_not_needed(QueryMethodBackporter)
+class TestQueryCacheMiddleware:
+    @pytest.fixture
+    def calls(self) -> List[Dict[str, Any]]:
+        return []
+
+    @pytest.fixture
+    def cache(self) -> QueryCache:
+        return QueryCache(maxsize=2)
+
+    @pytest.fixture
+    def client(self, calls, cache) -> TestClient:
+        app = FastAPI()
+
+        @app.query("/search", middleware=[Middleware(QueryCacheMiddleware, cache, vary=["x-tenant"])])
+        async def search(filters: Annotated[Dict[str, Any], Body()], response: Response) -> Any:
+            calls.append(filters)
+            if filters.get("private"):
+                response.headers["cache-control"] = "private"
+            if filters.get("vary"):
+                response.headers["vary"] = filters["vary"]
+            if filters.get("cookie"):
+                response.set_cookie("session", "potato")
+
+            return {"calls": len(calls)}
+
+        return TestClient(app)
+
+    def test_cached_by_normalized_body(self, client, calls):
+        first = client.request("QUERY", "/search", json={"a": 1, "b": 2})
+        second = client.request(
+            "QUERY",
+            "/search",
+            content=b'{"b": 2,   "a": 1}',
+            headers={"content-type": "application/json"},
+        )
+
+        assert first.status_code == second.status_code == status.HTTP_200_OK
+        assert first.json() == second.json() == {"calls": 1}
+        assert "age" not in first.headers
+        assert second.headers["age"] == "0"
+        assert len(calls) == 1
+
+    def test_keyed_by_body_and_vary_headers(self, client, calls):
+        client.request("QUERY", "/search", json={"a": 1})
+        client.request("QUERY", "/search", json={"a": 2})
+        client.request("QUERY", "/search", json={"a": 1}, headers={"x-tenant": "other"})
+
+        assert len(calls) == 3  # noqa: PLR2004
+
+    def test_keyed_by_credentials(self, client, calls):
+        for user in ("alice", "bob", "alice"):
+            client.request("QUERY", "/search", json={"a": 1}, headers={"authorization": user})
+
+        assert len(calls) == 2  # noqa: PLR2004
+
+    def test_keyed_by_response_vary(self, client, calls):
+        query = {"vary": "Accept-Encoding"}
+        first = client.request("QUERY", "/search", json=query, headers={"accept-encoding": "gzip"})
+        second = client.request("QUERY", "/search", json=query, headers={"accept-encoding": "gzip"})
+        other = client.request("QUERY", "/search", json=query, headers={"accept-encoding": "br"})
+
+        assert first.json() == second.json() == {"calls": 1}
+        assert other.json() == {"calls": 2}
+
+    @pytest.mark.parametrize("query", [{"cookie": True}, {"vary": "*"}])
+    def test_responses_for_a_single_client_not_cached(self, client, calls, query):
+        client.request("QUERY", "/search", json=query)
+        client.request("QUERY", "/search", json=query)
+
+        assert len(calls) == 2  # noqa: PLR2004
+
+    def test_cache_control(self, client, calls):
+        client.request("QUERY", "/search", json={"a": 1})
+        client.request("QUERY", "/search", json={"a": 1}, headers={"cache-control": "no-cache"})
+        client.request("QUERY", "/search", json={"a": 1}, headers={"cache-control": "no-store"})
+        assert len(calls) == 3  # noqa: PLR2004
+
+        client.request("QUERY", "/search", json={"private": True})
+        client.request("QUERY", "/search", json={"private": True})
+        assert len(calls) == 5  # noqa: PLR2004
+
+    def test_lru_eviction(self, client, calls, cache):
+        for value in (1, 2, 1, 3, 1, 2):
+            client.request("QUERY", "/search", json={"a": value})
+
+        assert [call["a"] for call in calls] == [1, 2, 3, 2]
+        assert len(cache) == 2  # noqa: PLR2004
+
+    def test_ttl(self, client, calls, cache):
+        cache.ttl = 0
+
+        client.request("QUERY", "/search", json={"a": 1})
+        client.request("QUERY", "/search", json={"a": 1})
+
+        assert len(calls) == 2  # noqa: PLR2004
@@ -0,0 +1,132 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
+
+import anyio
+import pytest
+from fastapi import Body, Header, Response, status
+from httpx import ASGITransport, AsyncClient
+from starlette.middleware import Middleware
+from typing_extensions import Annotated
+
+from fastapi_backports import FastAPI
+from fastapi_backports._backports.query_method import QueryMethodBackporter
+from fastapi_backports.middleware import SingleFlightMiddleware
+from tests.backports.utils import skip_if_backport_not_needed
+
+
+@skip_if_backport_not_needed(QueryMethodBackporter)
+class TestSingleFlightMiddleware:
+    @pytest.fixture
+    def calls(self) -> List[Any]:
+        return []
+
+    @pytest.fixture
+    def release(self) -> anyio.Event:
+        # bound to the test's event loop on first use, asyncio.Event binds to the fixture's loop on Python 3.8
+        return anyio.Event()
+
+    @pytest.fixture
+    def app(self, calls, release) -> FastAPI:
+        app = FastAPI()
+
+        @app.query("/search", middleware=[Middleware(SingleFlightMiddleware)])
+        async def search(filters: Annotated[Dict[str, Any], Body()]) -> Any:
+            calls.append(filters)
+            await release.wait()
+
+            if filters.get("fail") and len(calls) == 1:
+                raise RuntimeError("first execution fails")
+
+            return {"calls": len(calls)}
+
+        @app.get("/items", middleware=[Middleware(SingleFlightMiddleware)])
+        async def items(q: str) -> Any:
+            calls.append(q)
+            await release.wait()
+            return {"q": q}
+
+        @app.get("/me", middleware=[Middleware(SingleFlightMiddleware)])
+        async def me(response: Response, authorization: Annotated[str, Header()] = "") -> Any:
+            calls.append(authorization)
+            await release.wait()
+            response.set_cookie("session", authorization)
+            return {"user": authorization}
+
+        return app
+
+    @pytest.mark.asyncio
+    async def test_coalesce_identical_requests(self, app, calls, release):
+        async with AsyncClient(transport=ASGITransport(app), base_url="http://test") as client:
+            requests = [
+                *(asyncio.ensure_future(client.request("QUERY", "/search", json={"a": 1})) for _ in range(5)),
+                asyncio.ensure_future(client.request("QUERY", "/search", json={"a": 2})),
+                *(asyncio.ensure_future(client.get("/items", params={"q": "x"})) for _ in range(3)),
+            ]
+
+            while len(calls) < 3:  # noqa: ASYNC110, PLR2004
+                await asyncio.sleep(0)
+
+            release.set()
+            responses = await asyncio.gather(*requests)
+
+        assert all(response.status_code == status.HTTP_200_OK for response in responses)
+        assert len({response.json()["calls"] for response in responses[:5]}) == 1
+        assert [response.json() for response in responses[6:]] == [{"q": "x"}] * 3
+        assert len(calls) == 3  # noqa: PLR2004
+
+    @pytest.mark.asyncio
+    async def test_credentials_are_not_shared(self, app, calls, release):
+        async with AsyncClient(transport=ASGITransport(app), base_url="http://test") as client:
+            requests = [
+                asyncio.ensure_future(client.get("/me", headers={"authorization": user}))
+                for user in ("alice", "bob", "alice")
+            ]
+
+            while len(calls) < 2:  # noqa: ASYNC110, PLR2004
+                await asyncio.sleep(0)
+            await asyncio.sleep(0.01)
+
+            release.set()
+            responses = await asyncio.gather(*requests)
+
+        assert sorted(calls) == ["alice", "bob"]
+        assert [response.json() for response in responses] == [{"user": "alice"}, {"user": "bob"}, {"user": "alice"}]
+        assert [response.cookies.get("session") for response in responses] == ["alice", "bob", None]
+
+    @pytest.mark.asyncio
+    async def test_follower_retries_after_leader_failure(self, app, calls, release):
+        transport = ASGITransport(app, raise_app_exceptions=False)
+
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            leader = asyncio.ensure_future(client.request("QUERY", "/search", json={"fail": True}))
+            while not calls:  # noqa: ASYNC110
+                await asyncio.sleep(0)
+
+            follower = asyncio.ensure_future(client.request("QUERY", "/search", json={"fail": True}))
+            await asyncio.sleep(0.01)
+
+            release.set()
+
+            assert (await leader).status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
+            assert (await follower).json() == {"calls": 2}
+
+    def test_flights_are_per_event_loop(self):
+        # both requests have to reach the endpoint, requests from another loop are not coalesced
+        barrier = threading.Barrier(2, timeout=5)
+        app = FastAPI()
+
+        @app.get("/items", middleware=[Middleware(SingleFlightMiddleware)])
+        def items() -> Any:
+            barrier.wait()
+            return {}
+
+        async def request() -> int:
+            async with AsyncClient(transport=ASGITransport(app), base_url="http://test") as client:
+                return (await client.get("/items")).status_code
+
+        with ThreadPoolExecutor(2) as executor:
+            statuses = list(executor.map(lambda _: anyio.run(request), range(2)))
+
+        assert statuses == [status.HTTP_200_OK] * 2
@@ -0,0 +1,254 @@
+import asyncio
+import subprocess
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
+from textwrap import dedent
+from typing import Any
+
+import anyio
+import pytest
+from fastapi import BackgroundTasks, Depends, status
+from httpx import ASGITransport, AsyncClient
+from starlette.middleware import Middleware
+from starlette.responses import StreamingResponse
+from starlette.testclient import TestClient
+
+from fastapi_backports import APIRouter, FastAPI
+from fastapi_backports.middleware import ThreadPool, ThreadPoolMiddleware
+
+request_id: ContextVar[str] = ContextVar("request_id", default="")
+
+
+async def _wait_for(condition: Any) -> None:
+    while not condition():  # noqa: ASYNC110
+        await asyncio.sleep(0)
+
+
+class TestThreadPoolMiddleware:
+    def test_sync_endpoints_dependencies_and_background_tasks(self):
+        pool = ThreadPool(2)
+        done = threading.Event()
+
+        def dependency() -> str:
+            return "potato"
+
+        app = FastAPI()
+
+        @app.get("/items", middleware=[Middleware(ThreadPoolMiddleware, pool=pool)])
+        def get_items(background_tasks: BackgroundTasks, value: str = Depends(dependency)):
+            background_tasks.add_task(done.set)
+            return {"value": value}
+
+        @app.get("/other")
+        def get_other():
+            return {}
+
+        client = TestClient(app)
+
+        assert client.get("/items").json() == {"value": "potato"}
+        assert done.is_set()
+        assert pool.snapshot().count == 3  # noqa: PLR2004
+
+        client.get("/other")
+        assert pool.snapshot().count == 3  # noqa: PLR2004
+
+    def test_route_pool_takes_precedence(self):
+        router_pool, route_pool = ThreadPool(1, name="router"), ThreadPool(1, name="route")
+        router = APIRouter(prefix="/router", middleware=[Middleware(ThreadPoolMiddleware, pool=router_pool)])
+
+        @router.get("/default")
+        def get_default():
+            return {}
+
+        @router.get("/custom", middleware=[Middleware(ThreadPoolMiddleware, pool=route_pool)])
+        def get_custom():
+            return {}
+
+        app = FastAPI()
+        app.include_router(router)
+        client = TestClient(app)
+
+        client.get("/router/default")
+        client.get("/router/custom")
+        client.get("/router/custom")
+
+        assert router_pool.snapshot().count == 1
+        assert route_pool.snapshot().count == 2  # noqa: PLR2004
+
+    @pytest.mark.asyncio
+    async def test_slow_routes_do_not_starve_others(self):
+        release = threading.Event()
+        reports = ThreadPool(1)
+
+        app = FastAPI()
+
+        @app.get("/report", middleware=[Middleware(ThreadPoolMiddleware, pool=reports)])
+        def report():
+            release.wait()
+            return {}
+
+        @app.get("/fast", middleware=[Middleware(ThreadPoolMiddleware, total_tokens=1)])
+        def fast():
+            return {"ok": True}
+
+        async with AsyncClient(transport=ASGITransport(app), base_url="http://test") as client:
+            first = asyncio.ensure_future(client.get("/report"))
+            await _wait_for(lambda: reports.active == 1)
+
+            queued = asyncio.ensure_future(client.get("/report"))
+            await _wait_for(lambda: reports.waiting == 1)
+
+            assert (await client.get("/fast")).json() == {"ok": True}
+
+            release.set()
+            assert (await first).status_code == status.HTTP_200_OK
+            assert (await queued).status_code == status.HTTP_200_OK
+
+        snapshot = reports.snapshot()
+        assert snapshot.capacity == 1
+        assert snapshot.count == 2  # noqa: PLR2004
+        assert snapshot.active == 0
+        assert snapshot.waiting == 0
+        assert sum(snapshot.counts) == snapshot.count
+        assert snapshot.wait_max > 0
+        assert snapshot.wait_total >= snapshot.wait_max
+
+    def test_executor(self):
+        app = FastAPI()
+
+        async def set_request_id() -> None:
+            request_id.set("abc")
+
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="reports") as executor:
+
+            @app.get(
+                "/report",
+                dependencies=[Depends(set_request_id)],
+                middleware=[Middleware(ThreadPoolMiddleware, executor=executor)],
+            )
+            def report():
+                return {"thread": threading.current_thread().name, "request_id": request_id.get()}
+
+            response = TestClient(app).get("/report").json()
+
+        assert response["thread"].startswith("reports")
+        assert response["request_id"] == "abc"
+
+    @pytest.mark.asyncio
+    async def test_cancelled_while_waiting(self):
+        release = threading.Event()
+        pool = ThreadPool(1)
+
+        running = asyncio.ensure_future(pool.run_sync(release.wait))
+        await _wait_for(lambda: pool.active == 1)
+
+        queued = asyncio.ensure_future(pool.run_sync(release.wait))
+        await _wait_for(lambda: pool.waiting == 1)
+
+        queued.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await queued
+
+        assert pool.waiting == 0
+
+        release.set()
+        assert await running
+        assert pool.snapshot().count == 1
+
+    def test_pool_shared_by_event_loops(self):
+        pool = ThreadPool(1)
+        started, release = threading.Event(), threading.Event()
+
+        def hold() -> None:
+            started.set()
+            release.wait()
+
+        thread = threading.Thread(target=anyio.run, args=(pool.run_sync, hold))
+        thread.start()
+        try:
+            assert started.wait(5)
+
+            async def run_from_other_loop() -> int:
+                running = asyncio.ensure_future(pool.run_sync(threading.get_ident))
+                with anyio.fail_after(5):
+                    await _wait_for(lambda: pool.waiting == 1)
+
+                    # the only thread of the pool is taken by the other loop, which wakes this one once released
+                    assert pool.active == 1
+                    release.set()
+                    return await running
+
+            with ThreadPoolExecutor(1) as executor:
+                assert executor.submit(asyncio.run, run_from_other_loop()).result(5)
+        finally:
+            release.set()
+            thread.join()
+
+        assert pool.snapshot().count == 2  # noqa: PLR2004
+        assert pool.active == 0
+
+    @pytest.mark.parametrize(
+        "kwargs",
+        [
+            pytest.param({}, id="none"),
+            pytest.param({"total_tokens": 1, "pool": ThreadPool(1)}, id="both"),
+        ],
+    )
+    def test_invalid_arguments(self, kwargs):
+        with pytest.raises(ValueError, match="Exactly one of"):
+            ThreadPoolMiddleware(FastAPI(), **kwargs)
+
+    def test_streamed_iterators(self):
+        pool = ThreadPool(1)
+        app = FastAPI()
+
+        @app.get("/stream", middleware=[Middleware(ThreadPoolMiddleware, pool=pool)])
+        def stream() -> StreamingResponse:
+            return StreamingResponse(iter([b"potato", b"tomato"]))
+
+        assert TestClient(app).get("/stream").content == b"potatotomato"
+
+        # the endpoint, both items and the end of the iterator
+        assert pool.snapshot().count == 4  # noqa: PLR2004
+
+    def test_hook_installed_with_route_middleware(self):
+        code = """
+            import fastapi.routing
+            import starlette.concurrency
+            import starlette.responses
+            from fastapi import FastAPI
+
+            import fastapi_backports
+            from fastapi_backports.middleware import ThreadPoolMiddleware
+
+            try:
+                ThreadPoolMiddleware(FastAPI(), total_tokens=1)
+            except RuntimeError:
+                pass
+            else:
+                raise AssertionError("created without its hook")
+
+            fastapi_backports.backport(["route_middleware"])
+            assert fastapi.routing.run_in_threadpool is not starlette.concurrency.run_in_threadpool
+            assert starlette.responses.iterate_in_threadpool is not starlette.concurrency.iterate_in_threadpool
+            ThreadPoolMiddleware(FastAPI(), total_tokens=1)
+
+            fastapi_backports.revert()
+            assert fastapi.routing.run_in_threadpool is starlette.concurrency.run_in_threadpool
+            assert starlette.responses.iterate_in_threadpool is starlette.concurrency.iterate_in_threadpool
+            """
+
+        result = subprocess.run(  # noqa: S603
+            [sys.executable, "-c", dedent(code)],
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+
+        assert result.returncode == 0, result.stderr
+
+    def test_invalid_pool(self):
+        with pytest.raises(ValueError, match="total_tokens must be greater than 0"):
+            ThreadPool(0)
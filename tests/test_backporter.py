@@ -0,0 +1,78 @@
+import os
+import subprocess
+import sys
+from textwrap import dedent
+
+import pytest
+
+from fastapi_backports import BACKPORTS_ENV_VAR, QueryMethodBackporter, backport, load_backporter
+
+
+def _run(code: str, selection: str) -> subprocess.CompletedProcess:
+    return subprocess.run(  # noqa: S603
+        [sys.executable, "-c", dedent(code)],
+        env={**os.environ, BACKPORTS_ENV_VAR: selection},
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+
+
+def test_selected_backports_are_imported_lazily():
+    result = _run(
+        """
+        import sys
+
+        import fastapi_backports
+
+        backports = {name for name in sys.modules if name.startswith("fastapi_backports._backports.")}
+        assert backports == {"fastapi_backports._backports._base"}
+
+        import fastapi_backports.apply
+        from fastapi_backports._backporter import _BACKPORTED
+
+        assert "fastapi_backports._backports.query_method" in sys.modules
+        assert "fastapi_backports._backports.route_middleware" not in sys.modules
+        assert "fastapi_backports._backports.postponed_annotations" not in sys.modules
+        assert _BACKPORTED <= {fastapi_backports.QueryMethodBackporter.label()}
+        """,
+        "query_method",
+    )
+
+    assert result.returncode == 0, result.stderr
+
+
+def test_trust_response_requires_route_middleware():
+    # trust_response comes with route_middleware, without it the argument is rejected rather than ignored
+    result = _run(
+        """
+        import fastapi_backports.apply
+        from fastapi import APIRouter
+
+        try:
+            APIRouter(trust_response=True)
+        except TypeError:
+            pass
+        else:
+            raise AssertionError("trust_response accepted")
+        """,
+        "json_stream,json_response",
+    )
+
+    assert result.returncode == 0, result.stderr
+
+
+def test_unknown_backport():
+    result = _run("import fastapi_backports.apply", "query_method, unknown")
+
+    assert result.returncode != 0
+    assert "Unknown backports unknown" in result.stderr
+
+
+def test_backport_by_name():
+    assert load_backporter("query_method") is QueryMethodBackporter
+
+    backport(["query_method"])
+
+    with pytest.raises(ValueError, match="Unknown backports unknown"):
+        backport(["unknown"])
@@ -0,0 +1,97 @@
+from typing import List
+
+import pytest
+from fastapi import Query
+from pydantic import BaseModel
+from typing_extensions import Annotated
+
+from fastapi_backports import FastAPI, diagnose_backports
+from fastapi_backports.__main__ import main
+from fastapi_backports._diagnostics import load_app, rebuilt_routes
+
+
+class Filters(BaseModel):
+    category: str
+
+
+class Page(BaseModel):
+    page: int = 1
+
+
+def create_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/items")
+    async def get_items(filters: Annotated[Filters, Query()], page: Annotated[Page, Query()]) -> Filters:
+        return filters
+
+    @app.query("/search")
+    async def search() -> None:
+        pass
+
+    @app.get("/later")
+    async def later(item: "Later") -> None:
+        pass
+
+    return app
+
+
+app = create_app()
+
+
+class Later(BaseModel):
+    value: int
+
+
+def test_diagnose_backports():
+    diagnostics = {diagnostic.name: diagnostic for diagnostic in diagnose_backports(app)}
+
+    assert list(diagnostics) == [
+        "route_middleware",
+        "multiple_query_models",
+        "type_alias_type",
+        "json_stream",
+        "postponed_annotations",
+        "query_method",
+        "lifespan_decorator",
+        "json_response",
+    ]
+    assert diagnostics["route_middleware"].routes == []
+    assert diagnostics["multiple_query_models"].routes == ["GET /items"]
+    assert diagnostics["json_stream"].routes == []
+    assert diagnostics["postponed_annotations"].routes == ["GET /later"]
+    assert diagnostics["query_method"].routes == ["QUERY /search"]
+    assert diagnostics["lifespan_decorator"].routes is None
+    assert diagnostics["json_response"].routes == ["GET /items"]
+    assert all(diagnostic.applied for diagnostic in diagnostics.values() if diagnostic.needed)
+
+
+def test_rebuilt_routes():
+    assert rebuilt_routes(app) == ["GET /later"]
+
+
+def test_load_app():
+    assert load_app("tests.test_diagnostics:app") is app
+    assert isinstance(load_app("tests.test_diagnostics:create_app", factory=True), FastAPI)
+
+    with pytest.raises(ValueError, match="must be in format"):
+        load_app("tests.test_diagnostics")
+
+
+def test_cli():
+    output: List[str] = []
+    assert main(["tests.test_diagnostics:app", "--no-measure", "-v"], write=output.append) == 0
+
+    lines = output[0].splitlines()
+    assert any(line.split()[:5] == ["query_method", "issues/12965", "yes", "yes", "1"] for line in lines)
+    assert lines[lines.index("Routes using multiple_query_models:") + 1] == "  GET /items"
+    assert lines[lines.index("Routes rebuilt at startup:") + 1] == "  GET /later"
+
+
+def test_cli_measure():
+    output: List[str] = []
+    assert main(["tests.test_diagnostics:create_app", "--factory"], write=output.append) == 0
+
+    rows = {line.split()[0]: line.split() for line in output[0].splitlines() if line.startswith("query_method")}
+    assert rows["query_method"][5].endswith("ms")
+    assert rows["query_method"][6] == "required"
@@ -0,0 +1,146 @@
+from typing import Any, List, Tuple
+
+import pytest
+from fastapi import Request, WebSocket, status
+from fastapi.routing import APIRoute
+from fastapi.testclient import TestClient
+from starlette.routing import Match
+from starlette.types import Scope
+
+from fastapi_backports import APIRouter, FastAPI, freeze_routes, frozen_routes_lifespan, unfreeze_routes
+
+_STATIC_ROUTES = 100
+
+_MATCHED: List[str] = []
+
+
+class _TrackingRoute(APIRoute):
+    def matches(self, scope: Scope) -> Tuple[Match, Scope]:
+        _MATCHED.append(self.path)
+        return super().matches(scope)
+
+
+@pytest.fixture
+def app() -> FastAPI:
+    app = FastAPI()
+    app.add_lifespan(frozen_routes_lifespan)
+
+    router = APIRouter(prefix="/items", route_class=_TrackingRoute)
+
+    @router.get("/me")
+    async def read_me() -> Any:
+        return {"item": "me"}
+
+    @router.get("/{item_id}", name="read_item")
+    async def read_item(item_id: int, request: Request) -> Any:
+        return {"item": item_id, "url": str(request.url_for("read_item", item_id=item_id))}
+
+    @router.put("/{item_id}")
+    async def update_item(item_id: int) -> Any:
+        return {"updated": item_id}
+
+    app.include_router(router)
+
+    for i in range(_STATIC_ROUTES):
+        app.add_api_route(
+            f"/static/{i}", lambda i=i: {"static": i}, methods=["GET"], route_class_override=_TrackingRoute
+        )
+
+    @app.get("/users/{user_id}/", route_class_override=_TrackingRoute)
+    async def read_user(user_id: str) -> Any:
+        return {"user": user_id}
+
+    @app.get("/{anything}/wildcard", route_class_override=_TrackingRoute)
+    async def read_wildcard(anything: str) -> Any:
+        return {"wildcard": anything}
+
+    @app.websocket("/ws")
+    async def websocket_endpoint(websocket: WebSocket) -> None:
+        await websocket.accept()
+        await websocket.send_json({"message": "ws"})
+        await websocket.close()
+
+    return app
+
+
+class TestFrozenRoutes:
+    @pytest.mark.parametrize(
+        ("method", "path", "status_code", "body"),
+        [
+            ("GET", "/items/me", status.HTTP_200_OK, {"item": "me"}),
+            ("GET", "/items/1", status.HTTP_200_OK, {"item": 1, "url": "http://testserver/items/1"}),
+            ("PUT", "/items/1", status.HTTP_200_OK, {"updated": 1}),
+            ("DELETE", "/items/1", status.HTTP_405_METHOD_NOT_ALLOWED, {"detail": "Method Not Allowed"}),
+            ("GET", "/static/99", status.HTTP_200_OK, {"static": 99}),
+            ("GET", "/static/99/", status.HTTP_200_OK, {"static": 99}),
+            ("PUT", "/static/99", status.HTTP_405_METHOD_NOT_ALLOWED, {"detail": "Method Not Allowed"}),
+            ("GET", "/users/john", status.HTTP_200_OK, {"user": "john"}),
+            ("GET", "/other/wildcard", status.HTTP_200_OK, {"wildcard": "other"}),
+            ("GET", "/missing", status.HTTP_404_NOT_FOUND, {"detail": "Not Found"}),
+        ],
+    )
+    def test_same_behaviour(self, app, method, path, status_code, body):
+        with TestClient(app) as client:
+            frozen = client.request(method, path)
+
+        client = TestClient(app)
+        unfrozen = client.request(method, path)
+
+        assert frozen.status_code == unfrozen.status_code == status_code
+        assert frozen.json() == unfrozen.json() == body
+
+    def test_websocket(self, app):
+        with TestClient(app) as client, client.websocket_connect("/ws") as websocket:
+            assert websocket.receive_json() == {"message": "ws"}
+
+    def test_skips_unrelated_routes(self, app):
+        with TestClient(app) as client:
+            _MATCHED.clear()
+            response = client.get("/static/99")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert _MATCHED == ["/static/99"]
+
+    def test_miss_skips_original_router(self, app):
+        with TestClient(app) as client:
+            _MATCHED.clear()
+            response = client.get("/missing/route")
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        # once for the path and once for its redirect_slashes variant
+        assert _MATCHED == ["/{anything}/wildcard", "/{anything}/wildcard"]
+
+    def test_redirect_slashes_indexed(self, app):
+        with TestClient(app, follow_redirects=False) as client:
+            _MATCHED.clear()
+            response = client.get("/static/99/")
+
+        assert response.status_code == status.HTTP_307_TEMPORARY_REDIRECT
+        assert response.headers["location"] == "http://testserver/static/99"
+        assert _MATCHED == ["/static/99", "/{anything}/wildcard", "/static/99"]
+
+    def test_method_not_allowed_indexed(self, app):
+        with TestClient(app) as client:
+            _MATCHED.clear()
+            response = client.put("/static/99")
+
+        assert response.status_code == status.HTTP_405_METHOD_NOT_ALLOWED
+        assert response.headers["allow"] == "GET"
+        assert len(_MATCHED) < _STATIC_ROUTES
+
+    def test_freeze_unfreeze(self, app):
+        client = TestClient(app)
+
+        freeze_routes(app)
+        freeze_routes(app)
+
+        _MATCHED.clear()
+        assert client.get("/items/me").json() == {"item": "me"}
+        assert _MATCHED == ["/items/me"]
+
+        unfreeze_routes(app)
+        unfreeze_routes(app)
+
+        _MATCHED.clear()
+        assert client.get("/users/john").json() == {"user": "john"}
+        assert len(_MATCHED) > _STATIC_ROUTES
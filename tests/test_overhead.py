@@ -0,0 +1,146 @@
+import subprocess
+import sys
+from contextlib import asynccontextmanager
+from textwrap import dedent
+from typing import Any, AsyncIterator, Dict, List
+
+import pytest
+from fastapi import Query, Request
+from fastapi.openapi import utils as openapi_utils
+from pydantic import BaseModel
+from starlette.types import ASGIApp, Receive, Scope, Send
+from typing_extensions import Annotated
+
+from fastapi_backports import (
+    FastAPI,
+    QueryMethodBackporter,
+    backport,
+    backported,
+    load_backporter,
+    measure_backport_overhead,
+    revert,
+)
+
+
+class Filters(BaseModel):
+    category: str
+
+
+def create_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/items")
+    async def get_items(filters: Annotated[Filters, Query()]) -> Filters:
+        return filters
+
+    return app
+
+
+def test_revert():
+    applied = backported()
+
+    try:
+        revert(["query_method"])
+
+        assert QueryMethodBackporter not in backported()
+        assert not hasattr(FastAPI, "query")
+        assert "QUERY" not in openapi_utils.METHODS_WITH_BODY
+    finally:
+        backport(applied)
+
+    assert set(backported()) == set(applied)
+    assert hasattr(FastAPI, "query")
+    assert "QUERY" in openapi_utils.METHODS_WITH_BODY
+
+
+def test_revert_patched_again():
+    with pytest.raises(RuntimeError, match="revert that backport first"):
+        revert(["route_middleware"])
+
+    assert load_backporter("route_middleware") in backported()
+
+
+def test_reapplied_backports_resolve_originals():
+    # route_middleware is imported after postponed_annotations patched APIRoute.__init__
+    code = """
+        from fastapi.routing import APIRoute
+
+        import fastapi_backports
+
+        fastapi_backports.backport(["postponed_annotations"])
+        fastapi_backports.backport(["route_middleware"])
+
+        fastapi_backports.revert()
+        fastapi_backports.backport(["route_middleware"])
+
+        route = APIRoute("/", lambda: None)
+        assert not hasattr(route, "_custom_response_model")
+        """
+
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", dedent(code)],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+
+    assert result.returncode == 0, result.stderr
+
+
+def test_measure_backport_overhead():
+    applied = backported()
+
+    results = measure_backport_overhead(
+        create_app,
+        [("GET", "/items?category=books", b"")],
+        backports=["multiple_query_models", "query_method"],
+        iterations=5,
+    )
+
+    assert [result.label for result in results] == ["discussions/12212", "issues/12965"]
+    for result in results:
+        assert result.baseline.error is None
+        assert result.backported.error is None
+        assert result.baseline.request_latency > 0
+        assert isinstance(result.startup_delta, float)
+        assert isinstance(result.memory_delta, int)
+
+    assert set(backported()) == set(applied)
+
+
+def test_measured_through_lifespan_protocol():
+    scopes: List[str] = []
+    values: List[Any] = []
+
+    class RecordingMiddleware:
+        def __init__(self, app: ASGIApp) -> None:
+            self.app = app
+
+        async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+            scopes.append(scope["type"])
+            await self.app(scope, receive, send)
+
+    def create_stateful_app() -> FastAPI:
+        @asynccontextmanager
+        async def lifespan(_: FastAPI) -> AsyncIterator[Dict[str, Any]]:
+            yield {"value": "potato"}
+
+        app = FastAPI(lifespan=lifespan)
+        app.add_middleware(RecordingMiddleware)
+
+        @app.get("/value")
+        async def get_value(request: Request) -> None:
+            values.append(request.state.value)
+
+        return app
+
+    results = measure_backport_overhead(
+        create_stateful_app,
+        [("GET", "/value", b"")],
+        backports=["query_method"],
+        iterations=1,
+    )
+
+    assert results[0].backported.error is None
+    assert scopes == ["lifespan", "http"] * 2
+    assert values == ["potato"] * 2
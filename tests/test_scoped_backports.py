@@ -0,0 +1,109 @@
+import subprocess
+import sys
+from textwrap import dedent
+
+
+def test_scoped_backports():
+    code = """
+        from fastapi import FastAPI, Query
+        from fastapi.testclient import TestClient
+        from pydantic import BaseModel
+        from typing_extensions import Annotated
+
+        import fastapi.routing
+        import starlette.concurrency
+
+        import fastapi_backports
+        from fastapi_backports.middleware import ThreadPool, ThreadPoolMiddleware
+
+        original_init = FastAPI.__init__
+        fastapi_backports.backport(scoped=True)
+
+
+        class Filters(BaseModel):
+            category: str
+
+
+        class Pagination(BaseModel):
+            page: int
+
+
+        def create_app() -> FastAPI:
+            app = FastAPI()
+
+            @app.get("/items")
+            async def get_items(
+                filters: Annotated[Filters, Query()],
+                pagination: Annotated[Pagination, Query()],
+            ) -> dict:
+                return {"category": filters.category, "page": pagination.page}
+
+            return app
+
+
+        with fastapi_backports.backports_enabled():
+            scoped_app = create_app()
+
+        plain_app = create_app()
+
+        assert hasattr(FastAPI, "query")
+        assert FastAPI.get.__name__ == "get"
+
+        response = TestClient(scoped_app).get("/items", params={"category": "books", "page": 2})
+        assert response.json() == {"category": "books", "page": 2}, response.text
+
+        response = TestClient(plain_app).get("/items", params={"category": "books", "page": 2})
+        assert response.status_code == 422, response.text
+
+        try:
+            plain_app.get("/other", middleware=[])
+        except TypeError:
+            pass
+        else:
+            raise AssertionError("route middleware should not be available outside of the scope")
+
+        try:
+            plain_app.query("/search")
+        except AttributeError:
+            pass
+        else:
+            raise AssertionError("query should not be available outside of the scope")
+
+        def create_pooled_app(pool: ThreadPool) -> FastAPI:
+            app = FastAPI()
+            app.add_middleware(ThreadPoolMiddleware, pool=pool)
+
+            @app.get("/sync")
+            def sync() -> dict:
+                return {}
+
+            return app
+
+
+        scoped_pool, plain_pool = ThreadPool(1), ThreadPool(1)
+        with fastapi_backports.backports_enabled():
+            scoped_pooled_app = create_pooled_app(scoped_pool)
+
+        TestClient(scoped_pooled_app).get("/sync")
+        TestClient(create_pooled_app(plain_pool)).get("/sync")
+        assert scoped_pool.snapshot().count > 0
+        assert plain_pool.snapshot().count == 0
+
+        # measuring the overhead re-applies the backports in scoped mode
+        fastapi_backports.measure_backport_overhead(create_app, [], backports=["multiple_query_models"], iterations=1)
+        response = TestClient(create_app()).get("/items", params={"category": "books", "page": 2})
+        assert response.status_code == 422, response.text
+
+        fastapi_backports.revert()
+        assert FastAPI.__init__ is original_init
+        assert fastapi.routing.run_in_threadpool is starlette.concurrency.run_in_threadpool
+        """
+
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", dedent(code)],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+
+    assert result.returncode == 0, result.stderr
@@ -0,0 +1,86 @@
+import threading
+from typing import Any, Callable, List
+
+from fastapi import Query
+from pydantic import BaseModel
+from starlette.middleware import Middleware
+from typing_extensions import Annotated, TypeAliasType, get_args, get_origin
+
+from fastapi_backports import APIRouter, FastAPI, backport, measure_threaded_throughput, revert
+from fastapi_backports._backports.type_alias_type import unwrap_type_alias
+from fastapi_backports._patching import _PATCHES
+from fastapi_backports.middleware import QueryCache, RouteMetrics, RouteMetricsMiddleware
+
+
+def _run_concurrently(func: Callable[[], Any], count: int = 8) -> List[Any]:
+    barrier = threading.Barrier(count)
+    results: List[Any] = []
+
+    def run() -> None:
+        barrier.wait()
+        results.append(func())
+
+    threads = [threading.Thread(target=run) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    return results
+
+
+class Filters(BaseModel):
+    category: str
+
+
+def test_backport_applied_once():
+    patches = len(_PATCHES["issues/12965"])
+    revert(["query_method"])
+
+    _run_concurrently(lambda: backport(["query_method"]))
+
+    assert len(_PATCHES["issues/12965"]) == patches
+
+
+def test_type_alias_resolved_concurrently():
+    alias = TypeAliasType("alias", Annotated[Filters, Query()])
+
+    [unwrapped, *others] = _run_concurrently(lambda: unwrap_type_alias(alias))
+
+    assert get_origin(unwrapped) is Annotated
+    assert get_args(unwrapped)[0] is Filters
+    assert all(other is unwrapped for other in others)
+
+
+def test_query_cache_concurrently():
+    cache = QueryCache(maxsize=4)
+
+    def fill() -> None:
+        for key in range(100):
+            cache.set(("GET", str(key)), 200, [], b"")
+            cache.get(("GET", str(key - 1)))
+
+    _run_concurrently(fill)
+
+    assert len(cache) == 4  # noqa: PLR2004
+
+
+def test_measure_threaded_throughput():
+    metrics = RouteMetrics()
+    app = FastAPI()
+    router = APIRouter(middleware=[Middleware(RouteMetricsMiddleware, metrics=metrics)])
+
+    @router.get("/items")
+    async def get_items(filters: Annotated[Filters, Query()]) -> Filters:
+        return filters
+
+    app.include_router(router)
+
+    results = measure_threaded_throughput(app, [("GET", "/items?category=books", b"")], threads=[1, 4], iterations=50)
+
+    assert [(result.threads, result.requests) for result in results] == [(1, 50), (4, 200)]
+    assert all(result.requests_per_second > 0 for result in results)
+
+    [snapshot] = metrics.snapshot()
+    assert snapshot.count == 250  # noqa: PLR2004
+    assert snapshot.in_flight == 0
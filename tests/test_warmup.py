@@ -0,0 +1,138 @@
+import enum
+import threading
+from typing import Any, Dict, List, Optional
+
+from fastapi import Query
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+from typing_extensions import Annotated, Literal
+
+from fastapi_backports import WARMUP_ENV_VAR, FastAPI, warmup_routes, warmup_routes_lifespan
+
+
+class Color(enum.Enum):
+    RED = "red"
+
+
+class Item(BaseModel):
+    name: str
+    price: float
+    color: Color
+    kind: Literal["a", "b"]
+    tags: List[str]
+    extra: Optional[Dict[str, Any]] = None
+
+
+def create_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    async def get_item(item_id: int, q: Annotated[Optional[str], Query()] = None) -> Item:
+        return Item(name="", price=0, color=Color.RED, kind="a", tags=[])
+
+    @app.post("/items")
+    async def create_item(item: Item) -> Item:
+        return item
+
+    @app.get("/raw")
+    async def raw(limit: Annotated[int, Query(gt=10)]) -> None:
+        pass
+
+    return app
+
+
+def test_warmup_routes():
+    results = {result.path: result for result in warmup_routes(create_app())}
+
+    assert results["/items/{item_id}"].methods == {"GET"}
+    assert results["/items/{item_id}"].fields == 3  # noqa: PLR2004
+    assert results["/items/{item_id}"].errors == 0
+
+    assert results["/items"].fields == 2  # noqa: PLR2004
+    assert results["/items"].errors == 0
+
+    # the sample input does not satisfy the constraint, the validator is still exercised
+    assert results["/raw"].fields == 1
+    assert results["/raw"].errors == 1
+
+    assert all(result.duration >= 0 for result in results.values())
+
+
+def test_warmup_routes_lifespan(caplog):
+    app = create_app()
+    app.add_lifespan(warmup_routes_lifespan)
+
+    with caplog.at_level("INFO", logger="fastapi_backports"), TestClient(app) as client:
+        assert "Warmed up 3 routes" in caplog.text
+        assert client.get("/items/1").status_code == 200  # noqa: PLR2004
+
+
+def test_warmup_errors_do_not_abort(monkeypatch):
+    def broken_sample(*_: Any, **__: Any) -> Any:
+        msg = "broken"
+        raise RuntimeError(msg)
+
+    monkeypatch.setattr("fastapi_backports._warmup._sample", broken_sample)
+
+    results = warmup_routes(create_app())
+
+    assert len(results) == 3  # noqa: PLR2004
+    assert all(result.errors == result.fields for result in results)
+
+
+def test_warmup_mounted_apps():
+    app = FastAPI()
+    app.mount("/v1", create_app())
+
+    results = {result.path: result for result in warmup_routes(app)}
+
+    assert set(results) == {"/v1/items/{item_id}", "/v1/items", "/v1/raw"}
+    assert results["/v1/items"].errors == 0
+
+
+def test_warmup_serializes_with_route_field(monkeypatch):
+    warmed = []
+
+    def warmup_field(field: Any, *, serialize: bool) -> bool:
+        if serialize:
+            warmed.append(field)
+        return True
+
+    monkeypatch.setattr("fastapi_backports._warmup._warmup_field", warmup_field)
+
+    app = create_app()
+    warmup_routes(app)
+
+    route = next(route for route in app.routes if getattr(route, "path", None) == "/items")
+    assert (getattr(route, "secure_cloned_response_field", None) or route.response_field) in warmed
+
+
+def test_warmup_off_event_loop(monkeypatch):
+    threads = []
+
+    def warmup_routes(_app: Any) -> Any:
+        threads.append(threading.get_ident())
+        return []
+
+    monkeypatch.setattr("fastapi_backports._warmup.warmup_routes", warmup_routes)
+
+    app = create_app()
+    app.add_lifespan(warmup_routes_lifespan)
+
+    with TestClient(app):
+        pass
+
+    assert threads
+    assert threads[0] != threading.get_ident()
+
+
+def test_warmup_on_startup(monkeypatch, caplog):
+    monkeypatch.setenv(WARMUP_ENV_VAR, "1")
+
+    with caplog.at_level("INFO", logger="fastapi_backports"), TestClient(create_app()):
+        assert "Warmed up 3 routes" in caplog.text
+
+
+def test_warmup_on_startup_disabled(caplog):
+    with caplog.at_level("INFO", logger="fastapi_backports"), TestClient(create_app()):
+        assert "Warmed up" not in caplog.text
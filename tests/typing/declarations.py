@@ -15,6 +15,18 @@ async def app_lifespan(_app: FastAPI) -> AsyncIterator[None]:
     yield
 
 
+@app.add_lifespan(depends_on=[])
+@asynccontextmanager
+async def app_independent_lifespan(_app: FastAPI) -> AsyncIterator[Dict[str, Any]]:
+    yield {"key": 1}
+
+
+@app.add_lifespan(depends_on=[app_independent_lifespan])
+@asynccontextmanager
+async def app_dependent_lifespan(_app: FastAPI) -> AsyncIterator[None]:
+    yield
+
+
 @app.get("/", middleware=[Middleware(CORSMiddleware)])
 async def app_get() -> None:
     pass
@@ -163,3 +175,13 @@ router.add_api_websocket_route(
 second_router = APIRouter(middleware=[Middleware(CORSMiddleware)])
 router.include_router(second_router, middleware=[Middleware(CORSMiddleware)])
 app.include_router(router, middleware=[Middleware(CORSMiddleware)])
+
+trusted_router = APIRouter(trust_response=True)
+
+
+@trusted_router.get("/", trust_response=True)
+async def trusted_router_get() -> None:
+    pass
+
+
+app.include_router(trusted_router, trust_response=True)